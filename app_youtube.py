@@ -1,17 +1,27 @@
 import streamlit as st
-import re
-import random
-import datetime
-import requests
-import statistics
+import html
+import time
+import numpy as np
 import pandas as pd
-from googleapiclient.discovery import build
-import json
-from collections import Counter
 import matplotlib.pyplot as plt
 
+from youtube_seo import power_words as power_word_sources
+from youtube_seo.audit import audit_channel, crawl_uploads
+from youtube_seo.cache import get_response_cache
+from youtube_seo.config import BATCH_MAX_KEYWORDS, GEMINI_NICHES, QUOTA_DAILY_LIMIT, REGION_TIMEZONES, RESEARCH_REGIONS, SAMPLE_DEPTH_DEFAULT, SAMPLE_DEPTH_MAX, VIRAL_EMOJIS, set_default_power_words
+from youtube_seo.dedup import get_title_corpus
+from youtube_seo.generate import generate_smart_suggestions, related_tags
+from youtube_seo.metrics import ensure_exporters, get_metrics, timed
+from youtube_seo.quota import get_quota_scheduler
+from youtube_seo.scoring import analyze_title
+from youtube_seo.text import extract_core_theme
+from youtube_seo.trends import ensure_scheduler, get_trend_store, keyword_history, keyword_trend_index, run_due_snapshots, scheduler_running, stop_scheduler, tag_trend_index
+from youtube_seo.youtube import estimate_quota, get_keyword_metrics, iter_keyword_metrics, parse_keyword_list, region_comparison, research_keywords, research_regions
+
 # --- 1. CONFIG ---
 st.set_page_config(page_title="YouTube VidIQ Clone", page_icon="🚀", layout="wide")
+rerun_started = time.perf_counter()
+ensure_exporters()
 
 # --- 2. CUSTOM STYLING ---
 st.markdown("""
@@ -51,551 +61,103 @@ st.markdown("""
         font-weight: 600;
         margin: 0.2rem;
     }
+    .competitor-list {
+        max-height: 720px;
+        overflow-y: auto;
+        padding-right: 0.5rem;
+    }
+    .competitor-row {
+        background: #1e1e1e;
+        padding: 1rem;
+        border-radius: 8px;
+        margin-bottom: 1rem;
+        content-visibility: auto;
+        contain-intrinsic-size: auto 90px;
+    }
+    .competitor-title {color: white; font-weight: bold; font-size: 14px; margin-bottom: 0.5rem;}
+    .competitor-meta {color: #888; font-size: 12px; margin-bottom: 0.5rem;}
+    .competitor-track {background: #333; width: 100%; height: 10px; border-radius: 5px; overflow: hidden;}
 </style>
 """, unsafe_allow_html=True)
 
 # --- 3. DATABASE CONFIG ---
-URL_DATABASE_ONLINE = "https://gist.githubusercontent.com/rhanierex/f2d76f11df8d550376d81b58124d3668/raw/0b58a1eb02a7cffc2261a1c8d353551f3337001c/gistfile1.txt"
-FALLBACK_POWER_WORDS = ["secret", "best", "exposed", "tutorial", "guide", "how to", "tips", "tricks", "hacks", "ultimate", "complete", "full", "master", "proven", "amazing", "incredible", "perfect", "easy", "simple", "advanced"]
-VIRAL_EMOJIS = ["🔥", "😱", "🔴", "✅", "❌", "🎵", "⚠️", "⚡", "🚀", "💰", "💯", "🤯", "😭", "😡", "😴", "🌙", "✨", "💤", "🌧️", "🎹", "👀", "💪", "🎯", "⭐", "🏆"]
-STOP_WORDS = {"the", "and", "or", "for", "to", "in", "on", "at", "by", "with", "a", "an", "is", "it", "of", "that", "this", "video", "i", "you", "me", "we", "my", "your"}
+# Scoring, generation and API logic live in the youtube_seo package (importable without Streamlit)
 
 # --- 4. GEMINI API INTEGRATION ---
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_power_words_from_gemini(api_key, niche="general"):
-    """
-    Get trending power words from Gemini API based on niche
-    """
-    if not api_key or len(api_key) < 30:
-        return None, "Invalid API Key"
-    
-    try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
-        prompt = f"""Generate 30 powerful, high-CTR words for YouTube video titles in the {niche} niche.
-        
-Requirements:
-- Words must be proven to increase click-through rates
-- Include a mix of: urgency words, power words, emotional triggers
-- Format: Return ONLY a JSON array of strings
-- No explanations, just the array
-
-Example format: ["ULTIMATE", "SECRET", "EXPOSED", "PROVEN", "SHOCKING"]
-
-Generate 30 words now:"""
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        # Extract JSON array
-        import json
-        # Remove markdown code blocks if present
-        text = text.replace('```json', '').replace('```', '').strip()
-        
-        words = json.loads(text)
-        
-        if isinstance(words, list) and len(words) > 0:
-            return words, "🟢 Gemini AI"
-        else:
-            return None, "Invalid response"
-            
-    except Exception as e:
-        return None, f"Error: {str(e)}"
-
-@st.cache_data(ttl=600) 
-def load_power_words(url):
-    """Load power words from GitHub Gist"""
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if isinstance(data, list) and len(data) > 0: 
-                return data, "🟢 GitHub Online"
-    except:
-        pass
-    return FALLBACK_POWER_WORDS, "🟠 Offline Fallback"
-
-# Initialize power words database
-POWER_WORDS_DB, db_status = load_power_words(URL_DATABASE_ONLINE)
-
-# --- 5. HELPER FUNCTIONS ---
-def calculate_engagement_rate(stats):
-    """Calculate video engagement rate"""
-    try:
-        views = int(stats.get('viewCount', 0))
-        likes = int(stats.get('likeCount', 0))
-        comments = int(stats.get('commentCount', 0))
-        if views == 0:
-            return 0
-        engagement = ((likes + comments) / views) * 100
-        return round(engagement, 2)
-    except:
-        return 0
+# Words are generated per niche on a background pool and persisted; the sidebar polls for them
+def use_gemini_words(niche, words):
+    st.session_state['power_words'] = words
+    st.session_state['db_source'] = f"🤖 Gemini AI ({niche})"
 
-def extract_core_theme(title, keyword):
-    """
-    Extract the actual theme/context from the title
-    This preserves the original meaning while removing only the keyword
-    """
-    if not title:
-        return ""
-    
-    # Remove keyword but keep the rest intact
-    if keyword:
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        core = pattern.sub("", title).strip()
+@st.fragment(run_every=1)
+def gemini_progress():
+    """Poll the pending Gemini niche without blocking the rest of the page"""
+    niche = st.session_state.get('gemini_pending')
+    if not niche:
+        return
+    store = power_word_sources.get_gemini_word_store()
+    status = store.status(niche)
+    if status == "pending":
+        st.info(f"⏳ Gemini is generating {niche} power words...")
+    elif status == "ready":
+        del st.session_state['gemini_pending']
+        use_gemini_words(niche, store.get(niche))
+        st.rerun()
     else:
-        core = title
-    
-    core = re.sub(r'\s+', ' ', core)
-    core = re.sub(r'^[:\-\|,\.\s]+', '', core)
-    core = re.sub(r'[:\-\|,\.\s]+$', '', core)
-    
-    if not core or len(core) < 3:
-        words = re.findall(r'\b\w+\b', title.lower())
-        meaningful = [w for w in words if w not in STOP_WORDS and (not keyword or w != keyword.lower())]
-        
-        if meaningful:
-            core = ' '.join(meaningful[:5])
-        else:
-            core = "Guide"
-    
-    return core.strip()
-
-def smart_truncate(text, max_length):
-    """Smart text truncation at word boundaries"""
-    if not text or len(text) <= max_length:
-        return text
-    
-    truncated = text[:max_length-3]
-    last_space = truncated.rfind(' ')
-    if last_space > 0:
-        truncated = truncated[:last_space]
-    return truncated + "..."
-
-def extract_keywords_from_title(title, top_n=5):
-    """Extract important keywords from title"""
-    if not title:
-        return []
-    words = re.findall(r'\b[a-z]{3,}\b', title.lower())
-    filtered = [w for w in words if w not in STOP_WORDS]
-    counter = Counter(filtered)
-    return [word for word, _ in counter.most_common(top_n)]
-
-def generate_tags(title, keyword, competitor_tags=None):
-    """Generate SEO-optimized tags"""
-    if not title:
-        return [keyword.lower()] if keyword else []
-    
-    tags = set()
-    year = datetime.datetime.now().year
-    
-    if keyword:
-        tags.add(keyword.lower())
-        tags.add(f"{keyword.lower()} {year}")
-        
-        kw_words = keyword.lower().split()
-        if len(kw_words) > 1:
-            tags.add(kw_words[0])
-            tags.add(' '.join(kw_words[:2]))
-    
-    clean_title = re.sub(r'[^\w\s]', '', title.lower())
-    words = clean_title.split()
-    
-    for word in words:
-        if word not in STOP_WORDS and len(word) > 2:
-            tags.add(word)
-            if len(tags) >= 12:
-                break
-    
-    if competitor_tags:
-        for tag in competitor_tags[:5]:
-            if len(tags) < 18:
-                tags.add(tag.lower())
-    
-    if keyword:
-        tags.add(f"{keyword.lower()} tutorial")
-        tags.add(f"how to {keyword.lower()}")
-    
-    return list(tags)[:20]
-
-def generate_description(title, keyword, tags, video_length="10:00"):
-    """Generate SEO-optimized description"""
-    year = datetime.datetime.now().year
-    month = datetime.datetime.now().strftime("%B")
-    
-    try:
-        duration_mins = int(video_length.split(':')[0])
-    except:
-        duration_mins = 10
-    
-    tag_text = ', '.join(tags[:5]) if tags else keyword
-    hashtags = ' '.join([f"#{tag.replace(' ', '')}" for tag in tags[:5]]) if tags else f"#{keyword.replace(' ', '')}"
-    
-    return f"""🎬 {title}
-
-📌 **About This Video:**
-In this comprehensive {video_length} video, we dive deep into **{keyword}**. Whether you're a beginner or looking to advance your skills, this {year} guide will help you master {keyword}.
-
-⏱️ **Timestamps:**
-0:00 - Introduction
-0:45 - What is {keyword}?
-2:30 - Step-by-step {keyword} tutorial
-{max(duration_mins-3, 5)}:00 - Pro tips and advanced techniques
-{max(duration_mins-2, 7)}:00 - Common mistakes to avoid
-{max(duration_mins-1, 9)}:00 - Conclusion & next steps
+        del st.session_state['gemini_pending']
+        st.error(f"❌ {status}")
 
-🔥 **What You'll Learn:**
-✅ Complete {keyword} fundamentals
-✅ Practical examples and demonstrations
-✅ Expert insights and strategies
-✅ Proven techniques that work in {year}
+# Initialize power words database (local copy; the Gist is re-checked in the background)
+POWER_WORDS_DB, db_status = power_word_sources.ensure_power_word_refresher().current()
+set_default_power_words(POWER_WORDS_DB)
 
-💡 **Related Topics:**
-{tag_text}
-
-🔔 **Don't Forget to:**
-• SUBSCRIBE for more {keyword} content
-• LIKE if this video helped you
-• COMMENT your questions below
-• SHARE with anyone who needs this
-
-📱 **Connect With Us:**
-[Add your social media links here]
-
-{hashtags}
-
----
-© {year} | {keyword.title()} Tutorial | All Rights Reserved
-"""
-
-def generate_smart_suggestions(original_title, keyword, api_key=None, competitor_data=None):
-    """Generate suggestions that preserve the original title's theme"""
-    suggestions = []
-    year = datetime.datetime.now().year
-    
-    if 'power_words' in st.session_state:
-        power_words_list = st.session_state['power_words']
-    else:
-        power_words_list = POWER_WORDS_DB
-    
-    theme = extract_core_theme(original_title, keyword)
-    
-    if not theme or theme.lower() in ['guide', 'tutorial', 'video']:
-        theme_words = extract_keywords_from_title(original_title, top_n=3)
-        if theme_words:
-            theme = ' '.join(theme_words[:3])
-        else:
-            theme = "Complete Guide"
-    
-    power_word = random.choice(power_words_list).upper()
-    number = random.choice(['5', '7', '10'])
-    emoji = random.choice(VIRAL_EMOJIS)
-    
-    if competitor_data and len(competitor_data) > 0:
-        top_title = competitor_data[0].get('title', '')
-        
-        numbers = re.findall(r'\d+', top_title)
-        if numbers:
-            number = numbers[0]
-        
-        for word in power_words_list:
-            if word.lower() in top_title.lower():
-                power_word = word.upper()
-                break
-    
-    extra_1 = len(keyword) + len(power_word) + len(str(year)) + len(emoji) + 10
-    allowed_theme_1 = 100 - extra_1
-    theme_1 = smart_truncate(theme.title(), allowed_theme_1)
-    sug1 = f"{keyword.title()}: {theme_1} - {power_word} {year} {emoji}"
-    suggestions.append(sug1)
-    
-    extra_2 = len(number) + len(keyword) + len(str(year)) + len(emoji) + 15
-    allowed_theme_2 = 100 - extra_2
-    theme_2 = smart_truncate(theme.title(), allowed_theme_2)
-    sug2 = f"{number} {keyword.title()} {theme_2} You Need ({year}) {emoji}"
-    suggestions.append(sug2)
-    
-    extra_3 = len(keyword) + len(power_word) + len(str(year)) + len(emoji) + 18
-    allowed_theme_3 = 100 - extra_3
-    theme_3 = smart_truncate(theme, allowed_theme_3)
-    sug3 = f"How to {keyword.title()}: {theme_3} {emoji} [{year} {power_word}]"
-    suggestions.append(sug3)
-    
-    extra_4 = len(keyword) + len(power_word) + len(str(year)) + len(emoji) + 12
-    allowed_theme_4 = 100 - extra_4
-    theme_4 = smart_truncate(theme.title(), allowed_theme_4)
-    sug4 = f"{theme_4} - {keyword.title()} {power_word} Guide {year} {emoji}"
-    suggestions.append(sug4)
-    
-    extra_5 = len(keyword) + len(power_word) + len(str(year)) + len(emoji) + 15
-    allowed_theme_5 = 100 - extra_5
-    theme_5 = smart_truncate(theme, allowed_theme_5)
-    sug5 = f"{power_word} {keyword.title()} {theme_5} | {year} Tutorial {emoji}"
-    suggestions.append(sug5)
-    
-    return suggestions
-
-def analyze_title(title, keyword=""):
-    """Comprehensive title SEO analysis"""
-    score = 0
-    checks = []
-    
-    if 'power_words' in st.session_state:
-        power_words_list = st.session_state['power_words']
-    else:
-        power_words_list = POWER_WORDS_DB
-    
-    if not title:
-        return 0, [("error", "Title is empty")]
-    
-    title_len = len(title)
-    
-    if 40 <= title_len <= 70:
-        score += 25
-        checks.append(("success", f"✅ Perfect Length ({title_len} chars) - Ideal for SEO"))
-    elif 30 <= title_len <= 90:
-        score += 20
-        checks.append(("warning", f"⚠️ Good Length ({title_len} chars) - Can be optimized"))
-    elif title_len < 30:
-        score += 10
-        checks.append(("error", f"❌ Too Short ({title_len} chars) - Add more details"))
-    else:
-        score += 5
-        checks.append(("error", f"❌ Too Long ({title_len} chars) - Will be truncated"))
-    
-    if keyword:
-        kw_lower = keyword.lower()
-        title_lower = title.lower()
-        
-        if kw_lower in title_lower:
-            position = title_lower.find(kw_lower)
-            title_start = re.sub(r'^[^a-zA-Z0-9]+', '', title_lower).strip()
-            
-            if title_start.startswith(kw_lower):
-                score += 20
-                checks.append(("success", "✅ Keyword at Beginning - Perfect for SEO!"))
-            elif position < 30:
-                score += 15
-                checks.append(("success", "✅ Keyword in First Half - Good placement"))
-            else:
-                score += 10
-                checks.append(("warning", "⚠️ Keyword Present - Move closer to start"))
-        else:
-            checks.append(("error", "❌ Keyword Missing - Critical for ranking!"))
-    else:
-        score += 20
-    
-    found_power = [pw for pw in power_words_list if pw.lower() in title.lower()]
-    if found_power:
-        score += 15
-        checks.append(("success", f"✅ Power Words: {', '.join(found_power[:2])}"))
-    else:
-        checks.append(("warning", "⚠️ No Power Words - Add 'BEST', 'ULTIMATE', etc."))
-    
-    numbers = re.findall(r'\d+', title)
-    if numbers:
-        score += 15
-        checks.append(("success", f"✅ Numbers: {', '.join(numbers)} - Boosts CTR by 36%"))
-    else:
-        checks.append(("info", "💡 Add Numbers - Proven to increase clicks"))
-    
-    emojis = [e for e in VIRAL_EMOJIS if e in title]
-    if emojis:
-        score += 10
-        checks.append(("success", f"✅ Emoji: {' '.join(emojis)} - Eye-catching"))
-    else:
-        checks.append(("info", "💡 Add Emoji - Increases visibility"))
-    
-    engagement_score = 0
-    if '[' in title or '(' in title:
-        engagement_score += 5
-        checks.append(("success", "✅ Brackets Used - Adds context"))
-    
-    if '?' in title:
-        engagement_score += 5
-        checks.append(("success", "✅ Question Format - Creates curiosity"))
-    
-    current_year = str(datetime.datetime.now().year)
-    if current_year in title:
-        engagement_score += 5
-        checks.append(("success", f"✅ Current Year ({current_year}) - Shows freshness"))
-    
-    if title.isupper():
-        engagement_score -= 10
-        checks.append(("error", "❌ ALL CAPS - Looks spammy"))
-    
-    score += min(engagement_score, 15)
-    
-    return min(score, 100), checks
+# --- 5. HELPER FUNCTIONS ---
+COMPETITOR_CHART_MAX_ROWS = 500
 
-def get_keyword_metrics(api_key, keyword):
-    """Get comprehensive keyword metrics from YouTube"""
-    if not api_key or len(api_key) < 30:
-        return None, "❌ Invalid API Key"
-    
-    if not keyword:
-        return None, "❌ Keyword required"
-    
-    try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        
-        search_res = youtube.search().list(
-            q=keyword,
-            type='video',
-            part='id,snippet',
-            maxResults=20,
-            order='relevance',
-            regionCode='ID'
-        ).execute()
-        
-        if not search_res.get('items'):
-            return None, f"❌ No videos found for '{keyword}'"
-        
-        video_ids = [item['id']['videoId'] for item in search_res['items'] if 'videoId' in item.get('id', {})]
-        
-        if not video_ids:
-            return None, "❌ No valid videos found"
-        
-        stats_res = youtube.videos().list(
-            id=','.join(video_ids),
-            part='statistics,snippet,contentDetails'
-        ).execute()
-        
-        metrics = []
-        all_tags = []
-        upload_times = []
-        
-        for item in stats_res.get('items', []):
-            snippet = item.get('snippet', {})
-            stats = item.get('statistics', {})
-            
-            views = int(stats.get('viewCount', 0))
-            likes = int(stats.get('likeCount', 0))
-            comments = int(stats.get('commentCount', 0))
-            engagement = calculate_engagement_rate(stats)
-            
-            tags = snippet.get('tags', [])
-            all_tags.extend(tags)
-            
-            published = snippet.get('publishedAt', '')
-            if published:
-                upload_times.append(published)
-            
-            metrics.append({
-                'title': snippet.get('title', ''),
-                'Views': views,
-                'Likes': likes,
-                'Comments': comments,
-                'Engagement': engagement,
-                'Channel': snippet.get('channelTitle', 'Unknown'),
-                'Date': published[:10] if published else 'N/A',
-                'tags': tags,
-                'publishedAt': published
-            })
-        
-        if not metrics:
-            return None, "❌ No data available"
-        
-        df = pd.DataFrame(metrics)
-        
-        view_counts = [m['Views'] for m in metrics if m['Views'] > 0]
-        engagement_rates = [m['Engagement'] for m in metrics if m['Engagement'] > 0]
-        
-        median_views = statistics.median(view_counts) if view_counts else 0
-        avg_views = statistics.mean(view_counts) if view_counts else 0
-        avg_engagement = statistics.mean(engagement_rates) if engagement_rates else 0
-        
-        trending_tags = []
-        if all_tags:
-            tag_counts = Counter(all_tags)
-            trending_tags = [tag for tag, _ in tag_counts.most_common(15)]
-        
-        best_time = "Unknown"
-        if upload_times:
-            hours = [int(t[11:13]) for t in upload_times if len(t) > 13]
-            if hours:
-                most_common_hour = Counter(hours).most_common(1)[0][0]
-                best_time = f"{most_common_hour:02d}:00 - {(most_common_hour+1):02d}:00 WIB"
-        
-        if median_views > 500000:
-            difficulty = "🔴 High"
-            diff_score = 30
-        elif median_views > 100000:
-            difficulty = "🟡 Medium"
-            diff_score = 60
-        else:
-            difficulty = "🟢 Low"
-            diff_score = 90
-        
-        opportunity_score = diff_score
-        
-        return {
-            'median_views': median_views,
-            'avg_views': avg_views,
-            'avg_engagement': avg_engagement,
-            'score': opportunity_score,
-            'difficulty': difficulty,
-            'difficulty_score': diff_score,
-            'trending_tags': trending_tags,
-            'best_upload_time': best_time,
-            'total_videos': len(metrics),
-            'top_videos': df,
-            'competitor_data': metrics
-        }, None
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "API key not valid" in error_msg:
-            return None, "❌ API Key tidak valid!"
-        elif "quota" in error_msg.lower():
-            return None, "❌ Quota API habis!"
-        else:
-            return None, f"❌ Error: {error_msg}"
+def active_power_words():
+    """Power words for this session: AI-generated list if loaded, else the database"""
+    return st.session_state.get('power_words', POWER_WORDS_DB)
 
 # --- 6. UI COMPONENTS ---
-def draw_competitor_chart(df):
-    """Visualize competitor data"""
+@timed("ui.competitor_chart")
+def draw_competitor_chart(df, max_rows=COMPETITOR_CHART_MAX_ROWS):
+    """
+    Visualize competitor data as a single HTML payload.
+    Rows are built column-wise and sit in a scroll box; off-screen rows are skipped
+    by the browser (content-visibility), so hundreds of competitors stay responsive.
+    """
     if df is None or df.empty:
         st.warning("No data available")
         return
     
     st.markdown("### 📊 Top Competitor Videos")
     
-    max_views = df['Views'].max()
+    rows = df.head(max_rows)
+    title_col = 'title' if 'title' in rows else 'Title'
+    
+    max_views = rows['Views'].max()
     if max_views == 0:
         max_views = 1
     
-    for idx, row in df.head(10).iterrows():
-        title = row['Title']
-        if len(title) > 60:
-            title = title[:60] + "..."
-        
-        views = row['Views']
-        engagement = row.get('Engagement', 0)
-        width_pct = int((views / max_views) * 100)
-        
-        if engagement > 5:
-            color = "#10b981"
-        elif engagement > 2:
-            color = "#f59e0b"
-        else:
-            color = "#ef4444"
-        
-        st.markdown(f"""
-        <div style="background: #1e1e1e; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-            <div style="color: white; font-weight: bold; font-size: 14px; margin-bottom: 0.5rem;">{title}</div>
-            <div style="color: #888; font-size: 12px; margin-bottom: 0.5rem;">
-                {row['Channel']} • {views:,} views • {engagement}% engagement
-            </div>
-            <div style="background: #333; width: 100%; height: 10px; border-radius: 5px; overflow: hidden;">
-                <div style="background: {color}; width: {width_pct}%; height: 10px;"></div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    titles = rows[title_col].fillna('').astype(str)
+    titles = titles.where(titles.str.len() <= 60, titles.str[:60] + "...").map(html.escape)
+    channels = rows['Channel'].fillna('').astype(str).map(html.escape)
+    views = rows['Views'].astype('int64')
+    engagement = rows['Engagement'] if 'Engagement' in rows else pd.Series(0, index=rows.index)
+    width_pct = (views * 100 // max_views).astype(int).astype(str)
+    colors = pd.Series(np.select([engagement > 5, engagement > 2], ["#10b981", "#f59e0b"], default="#ef4444"), index=rows.index)
+    
+    row_html = (
+        '<div class="competitor-row"><div class="competitor-title">' + titles + '</div>'
+        + '<div class="competitor-meta">' + channels + ' • ' + views.map('{:,}'.format) + ' views • '
+        + engagement.astype(str) + '% engagement</div>'
+        + '<div class="competitor-track"><div style="background: ' + colors + '; width: ' + width_pct + '%; height: 10px;"></div></div></div>'
+    )
+    
+    st.markdown(f'<div class="competitor-list">{"".join(row_html)}</div>', unsafe_allow_html=True)
+    
+    if len(df) > max_rows:
+        st.caption(f"Showing top {max_rows} of {len(df)} videos")
 
 # --- 7. SIDEBAR ---
 with st.sidebar:
@@ -617,23 +179,29 @@ with st.sidebar:
     if gemini_key and len(gemini_key) > 30:
         st.success("🟢 Gemini Connected")
         
+        gemini_store = power_word_sources.get_gemini_word_store()
         niche_option = st.selectbox(
             "AI Power Words Niche:",
-            ["general", "gaming", "tech", "cooking", "music", "fitness", "education", "entertainment", "business", "lifestyle"],
+            GEMINI_NICHES,
             help="Generate power words specific to your niche"
         )
+        ready_niches = [n for n in GEMINI_NICHES if gemini_store.get(n) is not None]
+        if ready_niches:
+            st.caption(f"✅ Ready (loads instantly): {', '.join(ready_niches)}")
         
         if st.button("🚀 Generate AI Power Words", use_container_width=True):
-            with st.spinner("🤖 Asking Gemini for trending power words..."):
-                ai_words, ai_status = get_power_words_from_gemini(gemini_key, niche_option)
-                
-                if ai_words:
-                    st.session_state['power_words'] = ai_words
-                    st.session_state['db_source'] = f"🤖 Gemini AI ({niche_option})"
-                    st.success(f"✅ Loaded {len(ai_words)} AI power words!")
-                    st.rerun()
-                else:
-                    st.error(f"❌ {ai_status}")
+            ai_words = gemini_store.get(niche_option)
+            if ai_words is not None:
+                use_gemini_words(niche_option, ai_words)
+                st.rerun()
+            gemini_store.submit(gemini_key, niche_option)
+            st.session_state['gemini_pending'] = niche_option
+        
+        if st.button("📦 Prefetch All Niches", use_container_width=True, help="Generate every niche in the background"):
+            gemini_store.prefetch(gemini_key)
+            st.toast(f"🤖 Generating power words for {len(GEMINI_NICHES)} niches in the background")
+        
+        gemini_progress()
     elif gemini_key:
         st.warning("⚠️ Key too short")
     else:
@@ -657,10 +225,12 @@ with st.sidebar:
     
     # === YOUTUBE API SECTION ===
     st.markdown("### 🔑 YouTube API")
-    api_key = st.text_input("YouTube API Key:", type="password", placeholder="AIzaSy...", key="yt_key")
+    api_key = st.text_input("YouTube API Key:", type="password", placeholder="AIzaSy...", key="yt_key", help="Separate several keys with commas to share one daily budget across them")
     
     if api_key and len(api_key) > 30:
         st.success("🟢 YouTube Connected")
+        for suffix, units, calls in get_quota_scheduler().spend(api_key):
+            st.progress(min(units / QUOTA_DAILY_LIMIT, 1.0), text=f"💳 Key …{suffix}: {units:,} / {QUOTA_DAILY_LIMIT:,} units today ({calls} calls)")
     elif api_key:
         st.warning("⚠️ Key too short")
     
@@ -697,6 +267,10 @@ with st.sidebar:
     else:
         st.markdown('<span class="api-badge" style="background: #f59e0b; color: white;">💾 Offline DB</span>', unsafe_allow_html=True)
     
+    cache_stats = get_response_cache().stats()
+    st.metric("Cached Searches", cache_stats['entries'], help=f"Hits: {cache_stats['hits']} • Misses: {cache_stats['misses']} • Evictions: {cache_stats['evictions']}")
+    st.caption(f"Cache hit rate: {cache_stats['hit_rate']}% (each hit saves {estimate_quota()}+ quota units)")
+    
     st.divider()
     
     # === QUICK ACTIONS ===
@@ -709,6 +283,10 @@ with st.sidebar:
             del st.session_state['db_source']
         st.rerun()
     
+    if st.button("🗑️ Clear API Cache", use_container_width=True):
+        get_response_cache().clear()
+        st.rerun()
+    
     if 'power_words' in st.session_state:
         with st.expander("👁️ View Current Power Words"):
             words_preview = st.session_state['power_words'][:20]
@@ -738,50 +316,175 @@ with tab1:
         st.write("")
         analyze_btn = st.button("🚀 Analyze", type="primary", use_container_width=True)
     
+    col_depth, col_region, col_lang, col_order = st.columns([2, 1, 1, 1])
+    with col_depth:
+        sample_depth = st.slider("Competitors to sample:", 50, SAMPLE_DEPTH_MAX, SAMPLE_DEPTH_DEFAULT, step=50)
+    with col_region:
+        research_region = st.text_input("Region:", value="ID", max_chars=2, key="research_region").upper() or "ID"
+    with col_lang:
+        research_lang = st.text_input("Language:", value="", max_chars=5, placeholder="any", key="research_lang").strip().lower() or None
+    with col_order:
+        research_order = st.selectbox("Order:", ["relevance", "viewCount", "date", "rating"], key="research_order")
+    st.caption(f"💳 Costs up to {estimate_quota(sample_depth)} quota units per keyword (cached searches are free)")
+    
     if analyze_btn:
         if not api_key or len(api_key) < 30:
             st.error("⚠️ Please enter valid API Key in sidebar")
         elif not kw_input:
             st.warning("⚠️ Enter a keyword first")
         else:
-            with st.spinner(f"🔄 Analyzing '{kw_input}'..."):
-                data, err = get_keyword_metrics(api_key, kw_input)
+            status = st.empty()
+            status.info(f"🔄 Searching YouTube for '{kw_input}'...")
+            overview_ready = False
+            served_stale = False
+            
+            for stage, payload in iter_keyword_metrics(api_key, kw_input, research_region, research_order, depth=sample_depth, language=research_lang, stale_ok=True):
+                if stage == 'error':
+                    status.error(payload)
+                    break
                 
-                if err:
-                    st.error(err)
-                elif data:
-                    st.success(f"✅ Analysis complete for '{kw_input}'")
+                if stage == 'stale':
+                    served_stale = True
+                    continue
+                
+                if not overview_ready:
+                    overview_ready = True
                     
                     # Metrics
                     st.markdown("### 📊 Market Overview")
                     m1, m2, m3, m4 = st.columns(4)
-                    
-                    with m1:
-                        st.metric("Opportunity", f"{data['score']}/100")
-                    with m2:
-                        st.metric("Competition", data['difficulty'])
-                    with m3:
-                        st.metric("Avg Views", f"{int(data['avg_views']):,}")
-                    with m4:
-                        st.metric("Videos Analyzed", data['total_videos'])
+                    opportunity_slot, competition_slot = m1.empty(), m2.empty()
+                    avg_views_slot, analyzed_slot = m3.empty(), m4.empty()
                     
                     st.divider()
                     
                     # Visuals
                     col_chart, col_tags = st.columns([2, 1])
+                    chart_slot, tags_slot = col_chart.empty(), col_tags.empty()
+                
+                if stage == 'search':
+                    status.info(f"🔄 Found {len(payload)} videos, loading statistics...")
+                    analyzed_slot.metric("Videos Found", len(payload))
+                    with chart_slot.container():
+                        st.markdown("### 📊 Top Competitor Videos")
+                        for hit in payload[:10]:
+                            snippet = hit.get('snippet', {})
+                            st.caption(f"{snippet.get('title', '')} • {snippet.get('channelTitle', '')}")
+                
+                elif stage == 'stats':
+                    rows = payload
+                    positive_views = rows.loc[rows['Views'] > 0, 'Views']
+                    avg_views_slot.metric("Avg Views", f"{int(positive_views.mean()) if len(positive_views) else 0:,}")
+                    analyzed_slot.metric("Videos Analyzed", len(rows))
+                    with chart_slot.container():
+                        draw_competitor_chart(rows)
+                
+                elif stage == 'aggregates':
+                    data = payload
+                    if served_stale:
+                        status.success(f"✅ Analysis complete for '{kw_input}' (from an expired cache entry, fresh data is loading in the background)")
+                    else:
+                        status.success(f"✅ Analysis complete for '{kw_input}'")
+                    opportunity_slot.metric("Opportunity", f"{data['score']}/100")
+                    competition_slot.metric("Competition", data['difficulty'])
                     
-                    with col_chart:
-                        draw_competitor_chart(data['top_videos'])
-                    
-                    with col_tags:
+                    with tags_slot.container():
                         st.markdown("### 🏷️ Trending Tags")
                         if data['trending_tags']:
                             for tag in data['trending_tags'][:10]:
                                 st.code(tag, language='text')
+                            related = related_tags(data['trending_tags'][0], 8)
+                            if related:
+                                st.caption(f"🔗 Often used with '{data['trending_tags'][0]}': " + ', '.join(related))
                         
                         st.divider()
                         st.markdown("### ⏰ Best Upload Time")
                         st.info(data['best_upload_time'])
+                        
+                        if data['title_patterns']:
+                            st.divider()
+                            st.markdown("### 🧬 Title Patterns")
+                            for pattern in data['title_patterns'][:5]:
+                                st.caption(f"{pattern['title']} • {pattern['videos']} near-duplicates from {pattern['channel']}")
+    
+    st.divider()
+    
+    with st.expander("📦 Batch Research (multiple keywords)"):
+        batch_text = st.text_area("Keywords (one per line):", height=150, placeholder="lullaby sleeping music\nrelaxing piano\nrain sounds")
+        batch_csv = st.file_uploader("...or upload a CSV (uses the 'keyword' column, else the first column)", type=["csv"])
+        
+        batch_keywords = parse_keyword_list(batch_text, batch_csv)
+        if batch_keywords:
+            st.caption(f"{len(batch_keywords)} unique keywords • up to {estimate_quota(sample_depth, len(batch_keywords))} quota units (cached keywords are free)")
+        
+        if st.button("🚀 Analyze Batch", use_container_width=True):
+            if not api_key or len(api_key) < 30:
+                st.error("⚠️ Please enter valid API Key in sidebar")
+            elif not batch_keywords:
+                st.warning("⚠️ Enter at least one keyword")
+            elif len(batch_keywords) > BATCH_MAX_KEYWORDS:
+                st.warning(f"⚠️ Maximum {BATCH_MAX_KEYWORDS} keywords per batch")
+            else:
+                progress = st.progress(0, text="Starting batch...")
+                table = st.empty()
+                rows = []
+                
+                for kw, data, err in research_keywords(api_key, batch_keywords, research_region, research_order, sample_depth, research_lang):
+                    if data:
+                        rows.append({
+                            'Keyword': kw,
+                            'Opportunity': data['score'],
+                            'Competition': data['difficulty'],
+                            'Median Views': int(data['median_views']),
+                            'Avg Views': int(data['avg_views']),
+                            'Avg Engagement': round(data['avg_engagement'], 2),
+                            'Videos': data['total_videos'],
+                            'Distinct': data['distinct_videos'],
+                            'Best Upload Time': data['best_upload_time'],
+                            'Top Tags': ', '.join(data['trending_tags'][:5]),
+                            'Error': ''
+                        })
+                    else:
+                        rows.append({'Keyword': kw, 'Error': err})
+                    
+                    progress.progress(len(rows) / len(batch_keywords), text=f"{len(rows)}/{len(batch_keywords)} keywords analyzed")
+                    table.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                
+                st.download_button(
+                    "⬇️ Download CSV",
+                    pd.DataFrame(rows).to_csv(index=False).encode('utf-8'),
+                    file_name="keyword_research.csv",
+                    mime="text/csv"
+                )
+    
+    with st.expander("🌍 Multi-Region Comparison"):
+        compare_regions = st.multiselect("Markets:", list(dict.fromkeys(list(REGION_TIMEZONES) + RESEARCH_REGIONS)), default=RESEARCH_REGIONS, key="compare_regions")
+        st.caption(f"Researches the keyword above in every market at once, in each market's language unless Language is set • upload hours in local time • up to {estimate_quota(sample_depth, len(compare_regions))} quota units (videos found in several markets are fetched once)")
+        
+        if st.button("🌍 Compare Regions", use_container_width=True):
+            if not api_key or len(api_key) < 30:
+                st.error("⚠️ Please enter valid API Key in sidebar")
+            elif not kw_input:
+                st.warning("⚠️ Enter a keyword first")
+            elif not compare_regions:
+                st.warning("⚠️ Pick at least one market")
+            else:
+                progress = st.progress(0, text="Starting regions...")
+                table = st.empty()
+                results = []
+                
+                for region, data, err in research_regions(api_key, kw_input, compare_regions, research_order, sample_depth, research_lang):
+                    results.append((region, data, err))
+                    results.sort(key=lambda r: compare_regions.index(r[0]))
+                    progress.progress(len(results) / len(compare_regions), text=f"{len(results)}/{len(compare_regions)} regions analyzed")
+                    table.dataframe(region_comparison(results), use_container_width=True, hide_index=True)
+                
+                st.download_button(
+                    "⬇️ Download CSV",
+                    region_comparison(results).to_csv(index=False).encode('utf-8'),
+                    file_name="region_comparison.csv",
+                    mime="text/csv"
+                )
 
 # TAB 2: TITLE OPTIMIZER (FIXED)
 with tab2:
@@ -797,7 +500,7 @@ with tab2:
         if not title:
             st.warning("⚠️ Enter a title to analyze")
         else:
-            score, checks = analyze_title(title, keyword)
+            score, checks = analyze_title(title, keyword, active_power_words())
             
             # Display score
             st.markdown("---")
@@ -842,6 +545,13 @@ with tab2:
                     else:
                         st.error(message, icon="❌")
             
+            # Competitor titles already fetched that near-duplicate this one
+            lookalikes = get_title_corpus().similar(title, 5)
+            if lookalikes:
+                st.warning(f"🪞 {len(lookalikes)} competitor title(s) seen before are near-duplicates of yours - consider a more distinct angle")
+                for match in lookalikes:
+                    st.caption(f"{match['title']} • {match['channel'] or 'Unknown'} • {match['views']:,} views")
+            
             # Generate suggestions if needed
             if score < 85 and keyword:
                 st.markdown("---")
@@ -859,10 +569,10 @@ with tab2:
                         if result:
                             competitor_data = result.get('competitor_data', [])
                 
-                suggestions = generate_smart_suggestions(title, keyword, api_key, competitor_data)
+                suggestions = generate_smart_suggestions(title, keyword, api_key, competitor_data, active_power_words())
                 
                 for i, sug in enumerate(suggestions, 1):
-                    sug_score, _ = analyze_title(sug, keyword)
+                    sug_score, _ = analyze_title(sug, keyword, active_power_words())
                     
                     if sug_score > score:
                         badge_color = "#10b981"
@@ -896,5 +606,191 @@ with tab2:
             st.markdown("### 🎁 Complete Metadata Package")
             
             tab_tags, tab_desc = st.tabs(["🏷️ Tags", "📄 Description"])
+
+# TAB 3: CHANNEL AUDIT
+with tab3:
+    st.markdown("### 📺 Channel Audit")
+    st.caption("Crawls every upload once, then re-audits only new or retitled videos")
+    
+    col_channel, col_audit_btn = st.columns([3, 1])
+    with col_channel:
+        channel_input = st.text_input("Channel ID, @handle or URL:", placeholder="e.g., @mychannel or UCxxxxxxxxxxxxxxxxxxxxxx")
+    with col_audit_btn:
+        st.write("")
+        st.write("")
+        audit_btn = st.button("🔎 Audit Channel", type="primary", use_container_width=True)
+    
+    deep_check = st.checkbox("Deep re-check (walk the whole catalogue to catch edited titles and deleted videos)")
+    
+    if audit_btn:
+        if not api_key or len(api_key) < 30:
+            st.error("⚠️ Please enter valid API Key in sidebar")
+        elif not channel_input:
+            st.warning("⚠️ Enter a channel first")
+        else:
+            progress = st.progress(0, text="🔄 Looking up channel...")
+            channel_id = None
             
-           
+            for event in crawl_uploads(api_key, channel_input, full=deep_check):
+                if event['stage'] == 'error':
+                    st.error(event['message'])
+                elif event['stage'] == 'channel':
+                    progress.progress(0, text=f"📺 {event['title']} • {event['known']} videos already stored")
+                elif event['stage'] == 'crawl':
+                    total = event['total'] or event['scanned'] or 1
+                    progress.progress(min(event['scanned'] / total, 1.0), text=f"📥 Scanned {event['scanned']:,}/{total:,} uploads • {event['fetched']:,} new or changed")
+                elif event['stage'] == 'done':
+                    channel_id = event['channel_id']
+                    progress.progress(1.0, text=f"✅ {event['title']}: {event['fetched']:,} videos updated • {event['removed']:,} removed")
+            
+            if channel_id:
+                report, err = audit_channel(channel_id, power_words_list=active_power_words())
+                
+                if err:
+                    st.error(err)
+                else:
+                    a1, a2, a3, a4 = st.columns(4)
+                    with a1:
+                        st.metric("Videos", f"{report['total_videos']:,}")
+                    with a2:
+                        st.metric("Median Views", f"{int(report['median_views']):,}")
+                    with a3:
+                        st.metric("Avg SEO Score", f"{report['avg_seo_score']:.0f}/100")
+                    with a4:
+                        st.metric("Untagged Videos", report['untagged_videos'])
+                    
+                    st.divider()
+                    
+                    col_worst, col_audit_tags = st.columns([2, 1])
+                    
+                    with col_worst:
+                        st.markdown("### 🛠️ Titles to Fix First")
+                        videos = report['videos']
+                        st.dataframe(
+                            videos.nsmallest(25, 'SEO Score')[['title', 'SEO Score', 'Views', 'Engagement', 'Tag Count', 'Date']],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                    
+                    with col_audit_tags:
+                        st.markdown("### 🏷️ Most Used Tags")
+                        for tag, count in report['top_tags'][:10]:
+                            st.code(f"{tag} ({count})", language='text')
+                        st.caption(f"Average {report['avg_tags']:.1f} tags per video")
+                    
+                    with st.expander("📋 Full Catalogue"):
+                        st.dataframe(
+                            videos[['title', 'SEO Score', 'Views', 'Likes', 'Comments', 'Engagement', 'Tag Count', 'Date']],
+                            use_container_width=True,
+                            hide_index=True
+                        )
+
+# TAB 4: TREND FINDER
+with tab4:
+    st.markdown("### 🎯 Trend Finder")
+    st.caption("Snapshots tracked keywords over time and ranks the ones whose competitors gain views fastest")
+    
+    trend_store = get_trend_store()
+    
+    col_track, col_region, col_track_btn = st.columns([3, 1, 1])
+    with col_track:
+        track_kw = st.text_input("Track Keyword:", placeholder="e.g., lofi study music")
+    with col_region:
+        track_region = st.text_input("Region:", value="ID", max_chars=2)
+    with col_track_btn:
+        st.write("")
+        st.write("")
+        if st.button("➕ Track", use_container_width=True) and track_kw.strip():
+            trend_store.track(track_kw.strip(), track_region.upper() or "ID")
+    
+    tracked = trend_store.tracked()
+    
+    if not tracked:
+        st.info("💡 Track a few keywords to start building history")
+    else:
+        tracked_df = pd.DataFrame(tracked)
+        tracked_df['last_snapshot'] = pd.to_datetime(tracked_df['last_snapshot'], unit='s', utc=True).dt.strftime('%Y-%m-%d %H:%M UTC')
+        st.dataframe(tracked_df.fillna('never'), use_container_width=True, hide_index=True)
+        
+        col_snap, col_auto, col_untrack = st.columns(3)
+        with col_snap:
+            if st.button("📸 Snapshot Due Keywords", use_container_width=True):
+                if not api_key or len(api_key) < 30:
+                    st.error("⚠️ Please enter valid API Key in sidebar")
+                else:
+                    with st.spinner("📸 Snapshotting tracked keywords..."):
+                        snapshot_errors = run_due_snapshots(api_key)
+                    for kw, err in snapshot_errors.items():
+                        st.error(f"{kw}: {err}")
+                    if not snapshot_errors:
+                        st.rerun()
+        with col_auto:
+            key_ok = bool(api_key) and len(api_key) > 30
+            # The scheduler outlives the session, so the checkbox starts from its actual state
+            if st.checkbox("🔁 Auto-snapshot in background", value=key_ok and scheduler_running(api_key), help="Keeps snapshotting due keywords while the app is running. For unattended history, schedule `python -m youtube_seo snapshot` with cron."):
+                if key_ok:
+                    scheduler = ensure_scheduler(api_key)
+                    for kw, err in scheduler.last_errors.items():
+                        st.warning(f"{kw}: {err}")
+                else:
+                    st.warning("⚠️ Needs a YouTube API Key")
+            elif key_ok:
+                stop_scheduler(api_key)
+        with col_untrack:
+            untrack_choice = st.selectbox("Stop tracking:", [""] + [f"{e['keyword']} ({e['region']})" for e in tracked])
+            if untrack_choice and st.button("🗑️ Remove", use_container_width=True):
+                entry = tracked[[f"{e['keyword']} ({e['region']})" for e in tracked].index(untrack_choice)]
+                trend_store.untrack(entry['keyword'], entry['region'])
+                st.rerun()
+        
+        st.divider()
+        
+        ranked = keyword_trend_index(trend_store)
+        col_rising, col_rising_tags = st.columns([2, 1])
+        
+        with col_rising:
+            st.markdown("### 🚀 Rising Keywords")
+            if ranked.empty:
+                st.info("Velocity needs at least two snapshots of a keyword")
+            else:
+                st.dataframe(
+                    ranked.rename(columns={'velocity': 'Views/Day', 'acceleration': 'Acceleration', 'trend_score': 'Trend Score'}),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                chart_kw = st.selectbox("History:", [f"{k} ({r})" for k, r in zip(ranked['keyword'], ranked['region'])])
+                chart_row = ranked.iloc[[f"{k} ({r})" for k, r in zip(ranked['keyword'], ranked['region'])].index(chart_kw)]
+                st.line_chart(keyword_history(chart_row['keyword'], chart_row['region'], trend_store))
+        
+        with col_rising_tags:
+            st.markdown("### 🏷️ Rising Tags")
+            rising_tags = tag_trend_index(trend_store)
+            if rising_tags.empty:
+                st.info("Not enough history yet")
+            else:
+                for _, row in rising_tags.head(10).iterrows():
+                    st.code(f"{row['tag']}  {row['velocity']:+.1f}%/day", language='text')
+
+# --- 9. PERFORMANCE PANEL ---
+perf = get_metrics()
+perf.observe("ui.rerun", time.perf_counter() - rerun_started)
+
+with st.sidebar:
+    with st.expander("⏱️ Performance"):
+        span_stats = perf.span_stats()
+        if span_stats:
+            st.dataframe(
+                pd.DataFrame([{
+                    'Stage': name,
+                    'Calls': row['count'],
+                    'p50 ms': round(row['p50'] * 1000, 2),
+                    'p95 ms': round(row['p95'] * 1000, 2),
+                    'p99 ms': round(row['p99'] * 1000, 2),
+                } for name, row in span_stats.items()]),
+                use_container_width=True,
+                hide_index=True
+            )
+        for (name, labels), value in sorted(perf.counters().items()):
+            label_text = ', '.join(str(v) for _, v in labels)
+            st.caption(f"{name}{f' ({label_text})' if label_text else ''}: {value:,}")
+        st.download_button("⬇️ OpenMetrics", perf.to_openmetrics(), file_name="metrics.txt", mime="text/plain")
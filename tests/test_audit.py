@@ -0,0 +1,86 @@
+import pytest
+
+from youtube_seo import audit
+from youtube_seo.quota import QuotaLedger, QuotaScheduler, TokenBucket, get_quota_scheduler, set_quota_scheduler
+from youtube_seo.replay import ReplayYouTube
+
+CHANNEL_ID = 'UC' + 'x' * 22
+API_KEY = 'k' * 39
+
+def _video(i):
+    vid = f"vid{i:05d}"
+    return {'id': vid, 'snippet': {'title': f"Upload {i}", 'publishedAt': f"2024-01-01T00:{i % 60:02d}:00Z"},
+            'statistics': {'viewCount': str(i * 10)}}
+
+def _fixtures(count):
+    videos = {v['id']: v for v in map(_video, range(count))}
+    return {
+        'channels': {CHANNEL_ID: {'id': CHANNEL_ID, 'snippet': {'title': 'Chan'},
+                                  'contentDetails': {'relatedPlaylists': {'uploads': 'UU1'}}}},
+        'playlistItems': {'UU1': [{'snippet': {'title': v['snippet']['title']}, 'contentDetails': {'videoId': vid}}
+                                  for vid, v in sorted(videos.items(), reverse=True)]},
+        'videos': videos,
+    }
+
+@pytest.fixture
+def youtube(tmp_path, monkeypatch):
+    client = ReplayYouTube(_fixtures(120))
+    monkeypatch.setattr(audit, 'get_youtube_client', lambda api_key: client)
+    previous = get_quota_scheduler()
+    set_quota_scheduler(QuotaScheduler(QuotaLedger(str(tmp_path / "quota.sqlite")), bucket=TokenBucket(1e9, 1e9)))
+    yield client
+    set_quota_scheduler(previous)
+
+def _crawl(store, full=False, stop_after_pages=None):
+    events = []
+    crawl = audit.crawl_uploads(API_KEY, CHANNEL_ID, store=store, full=full)
+    for event in crawl:
+        events.append(event)
+        assert event['stage'] != 'error', event
+        if stop_after_pages and event['stage'] == 'crawl' and event['pages'] == stop_after_pages:
+            crawl.close()
+            break
+    return events
+
+def _add_uploads(client, first, count):
+    fixtures = client.fixtures
+    for i in range(first, first + count):
+        video = _video(i)
+        fixtures['videos'][video['id']] = video
+        fixtures['playlistItems']['UU1'].insert(0, {'snippet': {'title': video['snippet']['title']}, 'contentDetails': {'videoId': video['id']}})
+
+def test_interrupted_crawl_resumes(tmp_path, youtube):
+    store = audit.AuditStore(str(tmp_path / "audit.sqlite"))
+    _crawl(store, stop_after_pages=1)
+    assert store.crawl_state(CHANNEL_ID) == ('50', False)
+
+    done = _crawl(store)[-1]
+    assert done['stage'] == 'done' and done['scanned'] == 70
+    assert len(store.known_titles(CHANNEL_ID)) == 120
+    assert store.crawl_state(CHANNEL_ID) == (None, True)
+
+def test_interrupted_deep_recheck_does_not_block_incremental_runs(tmp_path, youtube):
+    store = audit.AuditStore(str(tmp_path / "audit.sqlite"))
+    _crawl(store)
+    _crawl(store, full=True, stop_after_pages=2)
+    assert store.crawl_state(CHANNEL_ID) == (None, True)
+
+    _add_uploads(youtube, 120, 3)
+    done = _crawl(store)[-1]
+    assert done['fetched'] == 3
+    assert {'vid00120', 'vid00121', 'vid00122'} <= set(store.known_titles(CHANNEL_ID))
+
+def test_incremental_run_refreshes_stats_and_full_run_prunes(tmp_path, youtube):
+    store = audit.AuditStore(str(tmp_path / "audit.sqlite"))
+    _crawl(store)
+
+    youtube.fixtures['videos']['vid00119']['statistics']['viewCount'] = '999999'
+    done = _crawl(store)[-1]
+    assert done['scanned'] == 50 and done['fetched'] == 0
+    assert {v['video_id']: v['Views'] for v in store.load_videos(CHANNEL_ID)}['vid00119'] == 999999
+
+    youtube.fixtures['playlistItems']['UU1'] = [item for item in youtube.fixtures['playlistItems']['UU1']
+                                                if item['contentDetails']['videoId'] != 'vid00010']
+    done = _crawl(store, full=True)[-1]
+    assert done['removed'] == 1
+    assert 'vid00010' not in store.known_titles(CHANNEL_ID)
@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from youtube_seo.config import TITLE_MAX_LENGTH, VIRAL_EMOJIS, get_default_power_words
+from youtube_seo.generate import (
+    SEARCH_EMOJIS,
+    SEARCH_POWER_WORDS,
+    THEME_LENGTHS,
+    TITLE_TEMPLATES,
+    _ordered_unique,
+    search_title_candidates,
+)
+from youtube_seo.scoring import analyze_title
+from youtube_seo.text import extract_core_theme, extract_keywords_from_title, smart_truncate
+
+CASES = [
+    ("how i learned guitar chords fast at home", "guitar"),
+    ("lofi beats for a rainy night", "best lofi"),
+    ("my 10 favourite recipes", "easy pasta"),
+    ("Minecraft survival let's play episode one", "minecraft"),
+    ("Cara membuat kue enak", "kue"),
+    ("why is my cat so weird?", "secret"),
+    ("how to cook rice", "how to"),
+]
+
+def _brute_force(title, keyword, power_words_list, top_k=5):
+    """Best exact score of every template over the whole fill space the search explores"""
+    year = datetime.datetime.now().year
+    theme = extract_core_theme(title, keyword)
+    if not theme or theme.lower() in ['guide', 'tutorial', 'video']:
+        words = extract_keywords_from_title(title, top_n=3)
+        theme = ' '.join(words[:3]) if words else "Complete Guide"
+    themes = _ordered_unique(
+        [(smart_truncate(theme.title(), n), smart_truncate(theme, n)) if n else (theme.title(), theme) for n in THEME_LENGTHS],
+        len(THEME_LENGTHS)
+    )
+    power_words = _ordered_unique([w.upper() for w in power_words_list], SEARCH_POWER_WORDS)
+    emojis = _ordered_unique(VIRAL_EMOJIS, SEARCH_EMOJIS)
+
+    best = {}
+    for t_index, template in enumerate(TITLE_TEMPLATES):
+        for theme_title, theme_raw in themes:
+            for power in power_words:
+                for number in ['5', '7', '10']:
+                    for emoji in emojis:
+                        candidate = ' '.join(template.format(kw=keyword.title(), theme=theme_title, theme_raw=theme_raw, year=year,
+                                                             power=power, number=number, emoji=emoji).split())
+                        if len(candidate) <= TITLE_MAX_LENGTH:
+                            best[t_index] = max(best.get(t_index, 0), analyze_title(candidate, keyword, power_words_list)[0])
+    return sorted(best.values(), reverse=True)[:top_k]
+
+@pytest.mark.parametrize("title,keyword", CASES)
+def test_pruned_search_matches_brute_force(title, keyword):
+    power_words_list = get_default_power_words()
+    found = search_title_candidates(title, keyword, None, power_words_list, top_k=5, time_budget=60)
+    assert [score for _, score in found] == _brute_force(title, keyword, power_words_list)
+
+def test_long_keyword_still_gets_suggestions():
+    keyword = "lofi beats to relax and study to with rain sounds and soft piano for deep focus all night long"
+    found = search_title_candidates("rainy night lofi", keyword, None, get_default_power_words(), top_k=5)
+    assert len(found) == 5
+    assert all(len(title) <= TITLE_MAX_LENGTH for title, _ in found)
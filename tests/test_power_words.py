@@ -0,0 +1,74 @@
+import json
+import threading
+from types import SimpleNamespace
+
+from youtube_seo.power_words import GeminiWordStore
+
+API_KEY = 'g' * 39
+WORDS = ["SECRET", "PROVEN", "SHOCKING"]
+
+class StubModel:
+    def __init__(self, reply=json.dumps(WORDS), release=None):
+        self.reply = reply
+        self.release = release
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return SimpleNamespace(text=self.reply)
+
+def _store(tmp_path, model, ttl=3600):
+    return GeminiWordStore(str(tmp_path / "gemini.json"), ttl=ttl, max_workers=2, model_factory=lambda api_key: model)
+
+def test_pending_niche_is_generated_once(tmp_path):
+    release = threading.Event()
+    model = StubModel(release=release)
+    store = _store(tmp_path, model)
+
+    first = store.submit(API_KEY, "gaming")
+    second = store.submit(API_KEY, "gaming")
+    assert second is first
+    assert store.status("gaming") == "pending"
+
+    release.set()
+    assert first.result(5) == (WORDS, "🟢 Gemini AI")
+    assert store.status("gaming") == "ready"
+    assert store.submit(API_KEY, "gaming").result(5)[0] == WORDS
+    assert model.calls == 1
+
+def test_expired_words_are_generated_again(tmp_path):
+    model = StubModel()
+    store = _store(tmp_path, model)
+    store.submit(API_KEY, "cooking").result(5)
+    assert store.get("cooking") == WORDS
+
+    store.ttl = -1
+    assert store.get("cooking") is None
+    assert store.status("cooking") == "missing"
+    store.submit(API_KEY, "cooking").result(5)
+    assert model.calls == 2
+
+def test_saved_words_survive_a_restart(tmp_path):
+    _store(tmp_path, StubModel()).submit(API_KEY, "fitness").result(5)
+    model = StubModel()
+    store = _store(tmp_path, model)
+    assert store.submit(API_KEY, "fitness").result(5)[0] == WORDS
+    assert model.calls == 0
+
+def test_failures_are_reported_by_status(tmp_path):
+    store = _store(tmp_path, StubModel(reply="not json at all"))
+    words, status = store.submit(API_KEY, "tech").result(5)
+    assert words is None and status.startswith("Error:")
+    assert store.status("tech") == status
+
+    store = _store(tmp_path, StubModel(reply="[]"))
+    assert store.submit(API_KEY, "tech").result(5) == (None, "Invalid response")
+    assert store.status("tech") == "Invalid response"
+
+    store = _store(tmp_path, StubModel(reply=RuntimeError("quota")))
+    store.submit(API_KEY, "tech").result(5)
+    assert store.status("tech") == "Error: quota"
@@ -0,0 +1,41 @@
+import math
+
+from youtube_seo.tag_index import TagIndex
+
+def _item(vid, tags, views):
+    return {'id': vid, 'snippet': {'tags': tags}, 'statistics': {'viewCount': str(views)}}
+
+ITEMS = [
+    _item('a', ['Lofi', 'study', 'chill'], 1000),
+    _item('b', ['lofi', 'chill'], 100),
+    _item('c', ['lofi', 'rain'], 10),
+    _item('d', ['rain', 'sleep'], 5000),
+]
+
+def _cosine(pair, a, b):
+    return pair / math.sqrt(a * b)
+
+def test_related_and_rank_see_writes_at_once(tmp_path):
+    index = TagIndex(str(tmp_path / "tags.sqlite"))
+    index.add_videos("lofi beats", ITEMS[:2])
+
+    w1000, w100 = math.log1p(1000), math.log1p(100)
+    related = dict(index.related("LOFI"))
+    assert related.keys() == {'chill', 'study'}
+    assert abs(related['chill'] - _cosine(w1000 + w100, w1000 + w100, w1000 + w100)) < 1e-6
+
+    index.add_videos("rain sounds", ITEMS[2:])
+    assert [tag for tag, _ in index.related("lofi")] == ['chill', 'study', 'rain']
+    assert index.related("unknown") == []
+
+    assert index.rank(['sleep', 'rain', 'nothing'], keyword="rain sounds") == ['rain', 'sleep', 'nothing']
+    assert index.rank(['sleep', 'study', 'chill'], context=['lofi']) == ['chill', 'study', 'sleep']
+
+def test_pairs_are_capped_keeping_the_heaviest(tmp_path):
+    index = TagIndex(str(tmp_path / "tags.sqlite"), max_pairs=10)
+    index.add_videos("", [_item(f"v{i}", [f"t{i}a", f"t{i}b", f"t{i}c"], 10 ** (i % 6)) for i in range(12)])
+    assert index.stats()['pairs'] == 9
+
+    index.add_videos("", [_item('top', ['x', 'y'], 10 ** 9)])
+    assert index.stats()['pairs'] <= 10
+    assert [tag for tag, _ in index.related('x')] == ['y']
@@ -0,0 +1,59 @@
+import glob
+import os
+
+from youtube_seo.trends import TrendStore, keyword_trend_index
+
+DAY = 86400
+START = 1_767_225_600  # 2026-01-01 UTC: ten days of snapshots land in one month partition
+
+def _items(day):
+    return [{'id': f"v{i}", 'snippet': {'tags': ['lofi', f"t{i}"]},
+             'statistics': {'viewCount': str(1000 * i + 500 * day * i), 'likeCount': '1', 'commentCount': '0'}}
+            for i in range(1, 6)]
+
+def _files(store, kind):
+    return glob.glob(os.path.join(store.root, kind, "month=*", "*.parquet"))
+
+def test_snapshots_are_compacted_without_losing_rows(tmp_path):
+    store = TrendStore(str(tmp_path), compact_files=4)
+    for day in range(10):
+        store.append_snapshot("lofi", "ID", _items(day), ts=START + day * DAY)
+
+    assert len(_files(store, 'videos')) < 4
+    videos = store.load('videos')
+    assert len(videos) == 50
+    assert videos['ts'].nunique() == 10
+    assert set(store.load('tags')['tag']) == {'lofi', 't1', 't2', 't3', 't4', 't5'}
+
+def test_compact_skips_files_replaced_but_not_deleted(tmp_path):
+    store = TrendStore(str(tmp_path), compact_files=1000)
+    for day in range(3):
+        store.append_snapshot("lofi", "ID", _items(day), ts=START + day * DAY)
+    originals = _files(store, 'videos')
+    contents = {f: open(f, 'rb').read() for f in originals}
+    month = os.path.basename(os.path.dirname(originals[0]))[len("month="):]
+
+    assert store.compact('videos', month) == 3
+    for f, data in contents.items():  # as if the merging process died before deleting them
+        with open(f, 'wb') as out:
+            out.write(data)
+    assert len(store.load('videos')) == 15
+
+def test_load_reuses_frame_until_files_change(tmp_path):
+    store = TrendStore(str(tmp_path))
+    store.append_snapshot("lofi", "ID", _items(0), ts=START)
+    first = store.load('videos')
+    cached = store._loaded['videos'][1]
+    store.load('videos')
+    assert store._loaded['videos'][1] is cached
+    store.append_snapshot("lofi", "ID", _items(1), ts=START + DAY)
+    assert len(store.load('videos')) == len(first) + 5
+
+def test_trend_index_over_compacted_store(tmp_path):
+    store = TrendStore(str(tmp_path), compact_files=3)
+    for day in range(5):
+        store.append_snapshot("lofi", "ID", _items(day), ts=START + day * DAY)
+    index = keyword_trend_index(store, days=None)
+    assert list(index['keyword']) == ['lofi']
+    assert index['snapshots'].iloc[0] == 5
+    assert index['velocity'].iloc[0] > 0
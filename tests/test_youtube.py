@@ -0,0 +1,28 @@
+from youtube_seo.generate import generate_tags
+from youtube_seo.youtube import build_keyword_metrics
+
+def _item(vid, title, channel, views, tags, published='2025-03-10T14:05:00Z'):
+    snippet = {'title': title, 'channelTitle': channel, 'tags': tags}
+    if published:
+        snippet['publishedAt'] = published
+    return {'id': vid, 'snippet': snippet,
+            'statistics': {'viewCount': str(views), 'likeCount': '10', 'commentCount': '5'}}
+
+def test_keyword_metrics_keep_row_dicts():
+    items = [
+        _item('a', "Lofi beats to study", "Chan A", 1000, ['lofi', 'study']),
+        _item('b', "Rain sounds for sleep", "Chan B", 0, [], published=None),
+    ]
+    data, err = build_keyword_metrics(items, region="US")
+    assert err is None
+
+    rows = data['competitor_data']
+    assert isinstance(rows, list)
+    assert rows[0] == {'title': "Lofi beats to study", 'Views': 1000, 'Likes': 10, 'Comments': 5, 'Engagement': 1.5,
+                       'Channel': "Chan A", 'Date': '2025-03-10', 'tags': ['lofi', 'study'],
+                       'publishedAt': '2025-03-10T14:05:00Z'}
+    assert rows[1]['Date'] == 'N/A' and rows[1]['publishedAt'] == '' and rows[1]['tags'] == []
+    assert data['top_videos'].to_dict('records') == rows
+    assert len(data['competitor_frame']) == 2
+    assert data['competitor_tag_frame']['tag'].tolist() == ['lofi', 'study']
+    assert 'lofi' in generate_tags("Lofi beats", "lofi", data['trending_tags'])
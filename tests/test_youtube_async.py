@@ -0,0 +1,147 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from youtube_seo.quota import QuotaExceededError, QuotaLedger, QuotaScheduler, TokenBucket
+from youtube_seo import youtube_async
+from youtube_seo.youtube_async import AsyncYouTube, YouTubeApiError
+
+KEYS = ['A' * 39, 'B' * 39, 'C' * 39]
+
+def _video(vid):
+    return {'id': vid, 'snippet': {'title': f"Video {vid}"}, 'statistics': {'viewCount': '100'}}
+
+def _error(status, reason):
+    return httpx.Response(status, json={'error': {'message': reason, 'errors': [{'reason': reason}]}})
+
+def _client(tmp_path, handler, api_key=KEYS[0], max_retries=1):
+    scheduler = QuotaScheduler(QuotaLedger(str(tmp_path / "quota.sqlite")), bucket=TokenBucket(1e9, 1e9),
+                               max_retries=max_retries, backoff=0)
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://youtube.test/v3/")
+    return AsyncYouTube(api_key, client=http, scheduler=scheduler)
+
+def test_video_items_keeps_order_and_skips_missing(tmp_path):
+    calls = []
+
+    def handler(request):
+        ids = request.url.params['id'].split(',')
+        calls.append(ids)
+        return httpx.Response(200, json={'items': [_video(vid) for vid in ids if vid != 'gone']})
+
+    async def run():
+        async with _client(tmp_path, handler) as yt:
+            first = await yt.video_items(['b', 'a', 'gone'])
+            again = await yt.video_items(['a', 'b'])
+            return first, again
+
+    first, again = asyncio.run(run())
+    assert [item['id'] for item in first] == ['b', 'a']
+    assert [item['id'] for item in again] == ['a', 'b']
+    assert calls == [['b', 'a', 'gone']]
+
+def test_failed_batch_is_requested_again(tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params['id'])
+        if len(calls) == 1:
+            return _error(404, 'notFound')
+        return httpx.Response(200, json={'items': [_video('a')]})
+
+    async def run():
+        async with _client(tmp_path, handler) as yt:
+            with pytest.raises(YouTubeApiError):
+                await yt.video_items(['a'])
+            return await yt.video_items(['a'])
+
+    items = asyncio.run(run())
+    assert [item['id'] for item in items] == ['a']
+    assert calls == ['a', 'a']
+
+def test_key_rotation_does_not_use_up_retries(tmp_path):
+    used = []
+
+    def handler(request):
+        used.append(request.url.params['key'])
+        if len(used) < len(KEYS):
+            return _error(403, 'quotaExceeded')
+        return httpx.Response(200, json={'items': []})
+
+    async def run():
+        async with _client(tmp_path, handler, api_key=','.join(KEYS), max_retries=0) as yt:
+            return await yt.get('videos', id='a', part='snippet')
+
+    assert asyncio.run(run()) == {'items': []}
+    assert used == KEYS
+
+def test_every_key_exhausted_raises(tmp_path):
+    def handler(request):
+        return _error(403, 'quotaExceeded')
+
+    async def run():
+        async with _client(tmp_path, handler, api_key=','.join(KEYS)) as yt:
+            await yt.get('videos', id='a', part='snippet')
+
+    with pytest.raises(QuotaExceededError):
+        asyncio.run(run())
+
+def test_transient_errors_are_retried(tmp_path):
+    responses = [_error(503, 'backendError'), httpx.Response(200, json={'items': [_video('a')]})]
+
+    def handler(request):
+        return responses.pop(0)
+
+    async def run():
+        async with _client(tmp_path, handler) as yt:
+            return await yt.get('videos', id='a', part='snippet')
+
+    assert asyncio.run(run()) == {'items': [_video('a')]}
+
+def _search_item(vid):
+    return {'id': {'videoId': vid}, 'snippet': {'title': f"Video {vid}"}}
+
+def test_failed_search_page_waits_for_sent_batches(tmp_path):
+    fetched = []
+
+    async def handler(request):
+        if request.url.path.endswith('/videos'):
+            await asyncio.sleep(0.05)
+            fetched.append(request.url.params['id'])
+            return httpx.Response(200, json={'items': [_video('a')]})
+        if request.url.params.get('pageToken'):
+            return _error(400, 'invalidPageToken')
+        return httpx.Response(200, json={'items': [_search_item('a')], 'nextPageToken': 'p2'})
+
+    async def run():
+        async with _client(tmp_path, handler, max_retries=0) as yt:
+            with pytest.raises(YouTubeApiError):
+                await yt.keyword_items('lofi', depth=100)
+            assert fetched == ['a']
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+
+def test_closing_research_generator_cancels_queries(tmp_path, monkeypatch):
+    started, cancelled = threading.Event(), threading.Event()
+
+    async def handler(request):
+        if request.url.params['q'] == 'slow':
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return httpx.Response(200, json={'items': []})
+
+    monkeypatch.setattr(youtube_async, 'AsyncYouTube', lambda api_key: _client(tmp_path, handler))
+    rows = youtube_async.research_queries_async(KEYS[0], [('fast', 'US', None), ('slow', 'US', None)])
+    (kw, _, _), data, err = next(rows)
+    assert kw == 'fast' and data is None
+    assert started.wait(5)
+    rows.close()
+
+    assert cancelled.is_set()
+    assert not [thread for thread in threading.enumerate() if thread.name == 'youtube-async']
@@ -0,0 +1,63 @@
+"""
+YouTube SEO toolkit: title scoring, metadata generation and keyword research.
+
+Usable without Streamlit. Submodules are imported on first attribute access,
+so `import youtube_seo` stays cheap for cron jobs and workers.
+"""
+
+_EXPORTS = {
+    'analyze_title': 'scoring',
+    'score_titles': 'scoring',
+    'generate_tags': 'generate',
+    'generate_description': 'generate',
+    'generate_smart_suggestions': 'generate',
+    'generate_packages': 'bulk',
+    'extract_core_theme': 'text',
+    'extract_keywords_from_title': 'text',
+    'TitleTokens': 'text',
+    'tokenize_title': 'text',
+    'smart_truncate': 'text',
+    'PowerWordMatcher': 'text',
+    'get_power_matcher': 'text',
+    'calculate_engagement_rate': 'youtube',
+    'get_keyword_metrics': 'youtube',
+    'research_keywords': 'youtube',
+    'research_regions': 'youtube',
+    'region_comparison': 'youtube',
+    'estimate_quota': 'youtube',
+    'QuotaScheduler': 'quota',
+    'AsyncYouTube': 'youtube_async',
+    'get_quota_scheduler': 'quota',
+    'crawl_uploads': 'audit',
+    'audit_channel': 'audit',
+    'keyword_trend_index': 'trends',
+    'tag_trend_index': 'trends',
+    'ResponseCache': 'cache',
+    'get_response_cache': 'cache',
+    'SingleFlight': 'cache',
+    'TagIndex': 'tag_index',
+    'get_tag_index': 'tag_index',
+    'cluster_titles': 'dedup',
+    'TitleCorpus': 'dedup',
+    'get_title_corpus': 'dedup',
+    'get_metrics': 'metrics',
+    'ReplayYouTube': 'replay',
+    'ReplayGemini': 'replay',
+    'load_power_words': 'power_words',
+    'PowerWordStore': 'power_words',
+    'get_power_word_store': 'power_words',
+    'GeminiWordStore': 'power_words',
+    'get_gemini_word_store': 'power_words',
+    'get_power_words_from_gemini': 'power_words',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
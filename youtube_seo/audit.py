@@ -0,0 +1,309 @@
+"""Channel audit: incremental uploads crawler and catalogue-wide SEO report"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .config import AUDIT_DB_PATH, VIDEOS_PER_REQUEST
+from .youtube import calculate_engagement_rate, execute_request, fetch_video_items, format_api_error, get_youtube_client
+
+CHANNEL_ID_RE = re.compile(r'(UC[\w-]{22})')
+HANDLE_RE = re.compile(r'@([\w.\-]+)')
+
+class AuditStore:
+    """
+    Local SQLite store of every upload seen per channel.
+    A re-audit only needs to walk the playlist until it reaches videos stored unchanged, once a
+    first crawl has walked the whole playlist; an interrupted crawl resumes from its last page.
+    """
+    def __init__(self, path=AUDIT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS channels (
+                channel_id TEXT PRIMARY KEY,
+                title TEXT,
+                uploads_playlist TEXT NOT NULL,
+                last_audit REAL,
+                crawl_token TEXT,
+                crawl_complete INTEGER NOT NULL DEFAULT 0
+            )""")
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(channels)")}
+            if 'crawl_token' not in columns:
+                conn.execute("ALTER TABLE channels ADD COLUMN crawl_token TEXT")
+            if 'crawl_complete' not in columns:
+                conn.execute("ALTER TABLE channels ADD COLUMN crawl_complete INTEGER NOT NULL DEFAULT 0")
+            conn.execute("""CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                published_at TEXT,
+                title TEXT,
+                tags TEXT,
+                views INTEGER,
+                likes INTEGER,
+                comments INTEGER,
+                engagement REAL,
+                duration TEXT,
+                fetched_at REAL
+            )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos(channel_id)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_channel(self, channel_id, title, uploads_playlist):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO channels (channel_id, title, uploads_playlist) VALUES (?, ?, ?) "
+                "ON CONFLICT(channel_id) DO UPDATE SET title = excluded.title, uploads_playlist = excluded.uploads_playlist",
+                (channel_id, title, uploads_playlist)
+            )
+
+    def get_channel(self, channel_id):
+        """Return (title, uploads_playlist, last_audit) or None"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT title, uploads_playlist, last_audit FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+
+    def mark_audited(self, channel_id):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE channels SET last_audit = ? WHERE channel_id = ?", (time.time(), channel_id))
+
+    def crawl_state(self, channel_id):
+        """(page token to resume an interrupted crawl from or None, whether a crawl ever reached the end)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT crawl_token, crawl_complete FROM channels WHERE channel_id = ?", (channel_id,)).fetchone()
+        return (row[0], bool(row[1])) if row else (None, False)
+
+    def save_crawl_state(self, channel_id, page_token, complete):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE channels SET crawl_token = ?, crawl_complete = ? WHERE channel_id = ?",
+                         (page_token, int(complete), channel_id))
+
+    def remove_missing(self, channel_id, video_ids):
+        """Delete stored videos of a channel that are not in video_ids. Returns how many were removed"""
+        keep = set(video_ids)
+        with self._lock, self._connect() as conn:
+            stale = [(vid,) for (vid,) in conn.execute("SELECT video_id FROM videos WHERE channel_id = ?", (channel_id,))
+                     if vid not in keep]
+            conn.executemany("DELETE FROM videos WHERE video_id = ?", stale)
+        return len(stale)
+
+    def known_titles(self, channel_id):
+        """Map of stored video ID -> title for a channel"""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT video_id, title FROM videos WHERE channel_id = ?", (channel_id,)).fetchall())
+
+    def upsert_videos(self, channel_id, video_items):
+        """Store videos().list items, replacing older copies"""
+        now = time.time()
+        rows = []
+        for item in video_items:
+            snippet = item.get('snippet', {})
+            stats = item.get('statistics', {})
+            rows.append((
+                item['id'],
+                channel_id,
+                snippet.get('publishedAt', ''),
+                snippet.get('title', ''),
+                json.dumps(snippet.get('tags', [])),
+                int(stats.get('viewCount', 0)),
+                int(stats.get('likeCount', 0)),
+                int(stats.get('commentCount', 0)),
+                calculate_engagement_rate(stats),
+                item.get('contentDetails', {}).get('duration', ''),
+                now
+            ))
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def load_videos(self, channel_id):
+        """All stored videos of a channel, newest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT video_id, published_at, title, tags, views, likes, comments, engagement, duration "
+                "FROM videos WHERE channel_id = ? ORDER BY published_at DESC", (channel_id,)
+            ).fetchall()
+        return [{
+            'video_id': r[0],
+            'publishedAt': r[1],
+            'title': r[2],
+            'tags': json.loads(r[3] or '[]'),
+            'Views': r[4],
+            'Likes': r[5],
+            'Comments': r[6],
+            'Engagement': r[7],
+            'duration': r[8],
+        } for r in rows]
+
+_audit_store = None
+_audit_store_lock = threading.Lock()
+
+def get_audit_store():
+    """One audit store per process, shared by all sessions"""
+    global _audit_store
+    with _audit_store_lock:
+        if _audit_store is None:
+            _audit_store = AuditStore()
+        return _audit_store
+
+def resolve_channel(youtube, channel):
+    """
+    Look up a channel from its ID, @handle or URL.
+    Returns (channel_id, title, uploads_playlist_id) or None.
+    """
+    channel = (channel or "").strip()
+    id_match = CHANNEL_ID_RE.search(channel)
+    if id_match:
+        params = {'id': id_match.group(1)}
+    else:
+        handle_match = HANDLE_RE.search(channel)
+        params = {'forHandle': handle_match.group(1) if handle_match else channel}
+
+    res = execute_request(youtube.channels().list(part='snippet,contentDetails', **params))
+    items = res.get('items', [])
+    if not items:
+        return None
+
+    item = items[0]
+    uploads = item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+    if not uploads:
+        return None
+    return item['id'], item.get('snippet', {}).get('title', ''), uploads
+
+def crawl_uploads(api_key, channel, store=None, full=False):
+    """
+    Walk a channel's uploads playlist 50 items per page, storing new or retitled videos and
+    refreshing the statistics of every video on the pages walked.
+    Yields progress events (dicts with a 'stage' key) so a UI can render as pages arrive.
+
+    The uploads playlist is newest first, so once a crawl has reached the end of the playlist,
+    an incremental run stops at the first page where every video is already stored unchanged.
+    Until then each page token is saved, so an interrupted crawl resumes where it stopped.
+    full=True walks the whole playlist from the top and drops stored videos no longer in it.
+    """
+    store = store or get_audit_store()
+
+    try:
+        youtube = get_youtube_client(api_key)
+        resolved = resolve_channel(youtube, channel)
+        if not resolved:
+            yield {'stage': 'error', 'message': f"❌ Channel '{channel}' not found"}
+            return
+
+        channel_id, channel_title, uploads = resolved
+        store.save_channel(channel_id, channel_title, uploads)
+        known = store.known_titles(channel_id)
+        resume_token, complete = store.crawl_state(channel_id)
+        yield {'stage': 'channel', 'channel_id': channel_id, 'title': channel_title, 'known': len(known)}
+
+        # A resume point only matters until a crawl has reached the end once; after that an
+        # interrupted deep re-check just starts again from the top
+        walk_to_end = full or not complete
+        page_token = resume_token if not complete and not full else None
+        from_top = page_token is None
+        seen = set()
+        scanned = fetched = pages = 0
+        total = None
+
+        while True:
+            res = execute_request(youtube.playlistItems().list(
+                playlistId=uploads,
+                part='snippet,contentDetails',
+                maxResults=VIDEOS_PER_REQUEST,
+                pageToken=page_token
+            ))
+            pages += 1
+            total = res.get('pageInfo', {}).get('totalResults', total)
+
+            page_ids = []
+            changed = 0
+            for item in res.get('items', []):
+                vid = item.get('contentDetails', {}).get('videoId')
+                if not vid:
+                    continue
+                page_ids.append(vid)
+                if known.get(vid) != item.get('snippet', {}).get('title'):
+                    changed += 1
+
+            # Same one-unit videos().list call whether it covers the changed videos or the whole page
+            if page_ids:
+                store.upsert_videos(channel_id, fetch_video_items(youtube, page_ids))
+                fetched += changed
+            seen.update(page_ids)
+
+            scanned += len(page_ids)
+            page_token = res.get('nextPageToken')
+            # Saved before yielding, since a UI may stop iterating at any event
+            if page_token and not complete:
+                store.save_crawl_state(channel_id, page_token, False)
+            yield {'stage': 'crawl', 'pages': pages, 'scanned': scanned, 'fetched': fetched, 'total': total}
+
+            if not page_token or (not walk_to_end and page_ids and not changed):
+                break
+
+        removed = 0
+        if walk_to_end and not page_token:
+            # Only a walk from the top has seen every upload, so only it can tell what was deleted
+            if from_top:
+                removed = store.remove_missing(channel_id, seen)
+            store.save_crawl_state(channel_id, None, True)
+
+        store.mark_audited(channel_id)
+        yield {'stage': 'done', 'channel_id': channel_id, 'title': channel_title, 'scanned': scanned, 'fetched': fetched, 'removed': removed}
+
+    except Exception as e:
+        yield {'stage': 'error', 'message': format_api_error(e)}
+
+def audit_channel(channel_id, store=None, power_words_list=None):
+    """
+    SEO report over every stored upload of a channel.
+    Returns (report, error) like get_keyword_metrics.
+    """
+    import pandas as pd
+    from .scoring import score_titles
+
+    store = store or get_audit_store()
+    videos = store.load_videos(channel_id)
+    if not videos:
+        return None, "❌ No videos stored for this channel yet"
+
+    df = pd.DataFrame(videos)
+    scores = score_titles(df['title'], "", power_words_list)
+    df['SEO Score'] = scores['score'].to_numpy()
+    df['Tag Count'] = df['tags'].str.len()
+    df['Date'] = df['publishedAt'].str[:10]
+
+    tag_counts = Counter(tag.lower() for tags in df['tags'] for tag in tags)
+    untagged = int((df['Tag Count'] == 0).sum())
+    engaged = df.loc[df['Engagement'] > 0, 'Engagement']
+
+    return {
+        'total_videos': len(df),
+        'total_views': int(df['Views'].sum()),
+        'median_views': float(df['Views'].median()),
+        'avg_engagement': float(engaged.mean()) if len(engaged) else 0,
+        'avg_seo_score': float(df['SEO Score'].mean()),
+        'avg_tags': float(df['Tag Count'].mean()),
+        'untagged_videos': untagged,
+        'top_tags': tag_counts.most_common(20),
+        'score_breakdown': scores.mean().round(1).to_dict(),
+        'videos': df,
+    }, None
@@ -0,0 +1,180 @@
+"""
+Offline benchmarks for the scoring, generation and keyword-research pipeline.
+
+    python -m youtube_seo.bench                                         # 1k and 100k titles
+    python -m youtube_seo.bench --sizes 1k 100k 1M --json bench.json
+    python -m youtube_seo.bench --compare bench.json --tolerance 0.25   # exit 1 on a regression (for CI)
+
+Every stage runs on synthetic corpora and the replay YouTube client, so no keys or network are needed.
+Per-call stages time a spread sample of at most --max-calls titles; score_titles times the whole
+corpus in chunks. Results report latency percentiles per call and throughput per second
+(titles, or keywords for get_keyword_metrics).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+STAGES = ["analyze_title", "score_titles", "generate_tags", "generate_description", "generate_smart_suggestions", "get_keyword_metrics"]
+SCORE_CHUNK = 10_000
+REPLAY_KEY = "replay-" + "0" * 32
+
+def parse_size(text):
+    """'1k' -> 1000, '1M' -> 1000000, '250' -> 250"""
+    text = text.strip()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def _summarize(size, stage, latencies, units):
+    import numpy as np
+
+    samples = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    total = sum(latencies)
+    return {
+        'size': size,
+        'stage': stage,
+        'calls': len(latencies),
+        'p50_ms': round(float(p50), 4),
+        'p95_ms': round(float(p95), 4),
+        'p99_ms': round(float(p99), 4),
+        'throughput': round(units / total, 1) if total else 0.0,
+    }
+
+def _time_calls(fn, args_list):
+    """Per-call wall times, after one untimed warm-up call (imports, compiled patterns, caches)"""
+    if args_list:
+        fn(*args_list[0])
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def _install_replay(titles, keywords, depth):
+    """Point get_keyword_metrics at a replay client over the corpus, with an unthrottled scheduler"""
+    from .quota import QuotaLedger, QuotaScheduler, TokenBucket, set_quota_scheduler
+    from .replay import ReplayYouTube, synthetic_fixtures
+    from .youtube import register_youtube_client
+
+    ledger = QuotaLedger(os.path.join(tempfile.mkdtemp(prefix="yt-seo-bench-"), "quota.sqlite"))
+    set_quota_scheduler(QuotaScheduler(ledger=ledger, bucket=TokenBucket(rate=1e9, capacity=1e9)))
+    register_youtube_client(REPLAY_KEY, ReplayYouTube(synthetic_fixtures(keywords, depth, titles=titles)))
+
+def run_size(n, stages=STAGES, max_calls=2000, depth=50, seed=0):
+    """Benchmark every requested stage on an n-title corpus; returns one result dict per stage"""
+    from .config import get_default_power_words
+    from .generate import generate_description, generate_smart_suggestions, generate_tags
+    from .replay import TOPIC_WORDS, synthetic_titles
+    from .scoring import analyze_title, score_titles
+    from .youtube import competitor_frame, competitor_rows, get_keyword_metrics
+
+    random.seed(seed)
+    titles = synthetic_titles(n, seed)
+    rng = random.Random(seed)
+    title_keywords = [rng.choice(TOPIC_WORDS) for _ in range(n)]
+    step = max(1, n // max_calls)
+    sample = list(zip(titles[::step], title_keywords[::step]))[:max_calls]
+    power_words = get_default_power_words()
+    size = f"{n:,}"
+    results = []
+
+    if "analyze_title" in stages:
+        latencies = _time_calls(analyze_title, [(t, kw, power_words) for t, kw in sample])
+        results.append(_summarize(size, "analyze_title", latencies, len(latencies)))
+
+    if "score_titles" in stages:
+        import pandas as pd
+
+        series = pd.Series(titles, dtype=object)
+        kws = pd.Series(title_keywords, dtype=object)
+        chunks = [(series.iloc[i:i + SCORE_CHUNK], kws.iloc[i:i + SCORE_CHUNK], power_words) for i in range(0, n, SCORE_CHUNK)]
+        latencies = _time_calls(score_titles, chunks)
+        results.append(_summarize(size, "score_titles", latencies, n))
+
+    if "generate_tags" in stages:
+        latencies = _time_calls(generate_tags, sample)
+        results.append(_summarize(size, "generate_tags", latencies, len(latencies)))
+
+    if "generate_description" in stages:
+        args = [(t, kw, generate_tags(t, kw)) for t, kw in sample]
+        latencies = _time_calls(generate_description, args)
+        results.append(_summarize(size, "generate_description", latencies, len(latencies)))
+
+    keywords = sorted(set(title_keywords))[:max(1, min(len(sample) // 20, 50))]
+    if "generate_smart_suggestions" in stages or "get_keyword_metrics" in stages:
+        _install_replay(titles, keywords, depth)
+
+    if "generate_smart_suggestions" in stages:
+        from .replay import synthetic_fixtures
+
+        fixtures = synthetic_fixtures(keywords[:1], 10, titles=titles)
+        competitors = competitor_rows(*competitor_frame(fixtures['videos'].values()))
+        latencies = _time_calls(generate_smart_suggestions, [(t, kw, None, competitors, power_words) for t, kw in sample])
+        results.append(_summarize(size, "generate_smart_suggestions", latencies, len(latencies)))
+
+    if "get_keyword_metrics" in stages:
+        args = [(REPLAY_KEY, kw, "ID", "relevance", False, depth) for kw in keywords]
+        latencies = _time_calls(get_keyword_metrics, args)
+        results.append(_summarize(size, "get_keyword_metrics", latencies, len(latencies)))
+
+    return results
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions of results against a baseline run"""
+    base = {(r['size'], r['stage']): r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        b = base.get((r['size'], r['stage']))
+        if not b:
+            continue
+        if b['p50_ms'] and r['p50_ms'] > b['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{r['stage']} @ {r['size']}: p50 {b['p50_ms']:.4f} -> {r['p50_ms']:.4f} ms")
+        if b['throughput'] and r['throughput'] < b['throughput'] * (1 - tolerance):
+            regressions.append(f"{r['stage']} @ {r['size']}: throughput {b['throughput']:,.0f} -> {r['throughput']:,.0f}/s")
+    return regressions
+
+def format_table(results):
+    lines = [f"{'size':>10}  {'stage':<28}{'calls':>7}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'per second':>14}"]
+    for r in results:
+        lines.append(f"{r['size']:>10}  {r['stage']:<28}{r['calls']:>7}{r['p50_ms']:>11.4f}{r['p95_ms']:>11.4f}{r['p99_ms']:>11.4f}{r['throughput']:>14,.0f}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m youtube_seo.bench", description="Offline benchmarks for the youtube_seo pipeline")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help="corpus sizes, e.g. 1k 100k 1M")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--max-calls", type=int, default=2000, help="per-call stages time at most this many titles")
+    parser.add_argument("--depth", type=int, default=50, help="competitors per keyword for get_keyword_metrics")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON (use as a --compare baseline)")
+    parser.add_argument("--compare", metavar="FILE", help="baseline JSON from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a stage counts as regressed")
+    args = parser.parse_args(argv)
+
+    results = []
+    for text in args.sizes:
+        size_results = run_size(parse_size(text), args.stages, args.max_calls, args.depth, args.seed)
+        table = format_table(size_results)
+        print(table if not results else table.split('\n', 1)[1])
+        sys.stdout.flush()
+        results.extend(size_results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.time(), 'python': sys.version.split()[0], 'results': results}, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"❌ regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Bulk metadata packages (tags + description) for whole catalogues.
+
+    python -m youtube_seo bulk catalogue.csv -o packages.jsonl
+    python -m youtube_seo bulk videos.jsonl -o packages.csv --keyword-column topic --workers 4
+
+Rows are streamed from CSV or JSONL and written as they are generated, so memory stays flat
+whatever the catalogue size. The year and each keyword's competitor tags are resolved once in
+the parent; large inputs are spread over a process pool with a bounded window of chunks in flight,
+and output keeps input order.
+"""
+import csv
+import datetime
+import json
+import sys
+from collections import deque
+from contextlib import contextmanager
+
+from .config import BULK_CHUNK_SIZE, BULK_MAX_WORKERS, BULK_POOL_MIN_ROWS, SAMPLE_DEPTH_DEFAULT
+
+def detect_format(path, default="jsonl"):
+    """'csv' or 'jsonl' from a file extension ('-' and unknown extensions use the default)"""
+    lowered = (path or "").lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return default
+
+@contextmanager
+def _open(path, mode):
+    if path in (None, "-"):
+        yield sys.stdin if 'r' in mode else sys.stdout
+    else:
+        with open(path, mode, encoding='utf-8', newline='') as f:
+            yield f
+
+def iter_rows(path, fmt=None):
+    """Stream rows (dicts) from a CSV or JSONL file, or stdin for '-'"""
+    fmt = fmt or detect_format(path)
+    with _open(path, 'r') as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def write_rows(rows, path, fmt=None):
+    """Stream rows to CSV or JSONL (stdout for '-'). CSV columns come from the first row; returns the row count"""
+    fmt = fmt or detect_format(path)
+    count = 0
+    with _open(path, 'w') as f:
+        writer = None
+        for row in rows:
+            if fmt == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row), extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerow({k: ', '.join(v) if isinstance(v, list) else v for k, v in row.items()})
+            else:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+def competitor_tags_for(keyword, api_key=None, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT):
+    """
+    Trending competitor tags for a keyword. Without an API key only the response cache is used
+    (no network, no quota); with one, uncached keywords are researched.
+    """
+    from .cache import ResponseCache, get_response_cache
+    from .youtube import build_keyword_metrics, get_keyword_metrics
+
+    if not keyword:
+        return []
+    if api_key:
+        data, _ = get_keyword_metrics(api_key, keyword, region, order, depth=depth)
+    else:
+        video_items = get_response_cache().get(ResponseCache.make_key(keyword, region, order, depth))
+        data, _ = build_keyword_metrics(video_items, region) if video_items else (None, None)
+    return data['trending_tags'] if data else []
+
+def generate_chunk(rows, competitor_tags, year, title_column="title", keyword_column="keyword", length_column="length"):
+    """Tags and description for each row of a chunk (runs in worker processes)"""
+    from .generate import generate_description, generate_tags
+
+    packages = []
+    for row in rows:
+        title = str(row.get(title_column) or "")
+        keyword = str(row.get(keyword_column) or "")
+        video_length = str(row.get(length_column) or "10:00")
+        tags = generate_tags(title, keyword, competitor_tags.get(keyword.lower()), year=year)
+        packages.append({**row, 'tags': tags, 'description': generate_description(title, keyword, tags, video_length, year=year)})
+    return packages
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def generate_packages(rows, title_column="title", keyword_column="keyword", length_column="length",
+                      api_key=None, region="ID", workers=BULK_MAX_WORKERS, chunk_size=BULK_CHUNK_SIZE,
+                      pool_min_rows=BULK_POOL_MIN_ROWS, year=None):
+    """
+    Stream metadata packages for rows, in input order.
+    The first `pool_min_rows` rows are generated in-process; past that, chunks go to a process pool
+    with at most 2 x workers chunks in flight.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    year = year or datetime.datetime.now().year
+    known_tags = {}
+    pool = None
+    window = deque()
+    done_rows = 0
+
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            chunk_keywords = {str(row.get(keyword_column) or "").lower() for row in chunk}
+            for kw in chunk_keywords - known_tags.keys():
+                known_tags[kw] = competitor_tags_for(kw, api_key, region)
+            chunk_tags = {kw: known_tags[kw] for kw in chunk_keywords}
+            args = (chunk, chunk_tags, year, title_column, keyword_column, length_column)
+
+            if pool is None and workers > 1 and done_rows >= pool_min_rows:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            done_rows += len(chunk)
+
+            if pool is None:
+                yield from generate_chunk(*args)
+                continue
+
+            window.append(pool.submit(generate_chunk, *args))
+            if len(window) >= workers * 2:
+                yield from window.popleft().result()
+
+        while window:
+            yield from window.popleft().result()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
@@ -0,0 +1,164 @@
+"""Persistent SQLite response cache shared by every process on the host"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from concurrent.futures import Future
+
+from .config import CACHE_DB_PATH, CACHE_MAX_ENTRIES, CACHE_STALE_SECONDS, CACHE_TTL_SECONDS
+from .metrics import inc
+
+class ResponseCache:
+    """
+    On-disk LRU cache for YouTube API responses.
+    Backed by SQLite so entries survive restarts and are shared by all sessions on the host.
+    """
+    def __init__(self, path=CACHE_DB_PATH, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, stale_for=CACHE_STALE_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.stale_for = stale_for
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('evictions', 0)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(keyword, region="ID", order="relevance", depth=20, language=None):
+        """Build the cache key for a keyword search"""
+        return json.dumps([keyword.strip().lower(), (region or "").upper(), order, depth, (language or "").lower()])
+
+    def get(self, key):
+        """Return the cached value, or None on a miss or expired entry"""
+        value, stale = self.lookup(key)
+        return None if stale else value
+
+    def lookup(self, key, allow_stale=False):
+        """
+        Return (value, stale). Expired entries still inside the stale window come back with
+        stale=True so a caller can serve them while refreshing; they only count as hits with allow_stale.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] + self.stale_for < now:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'misses'")
+                inc("cache_lookups", result="miss")
+                return None, False
+            stale = row[1] < now
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?", ('misses' if stale and not allow_stale else 'hits',))
+        inc("cache_lookups", result="stale" if stale else "hit")
+        return json.loads(row[0]), stale
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value and evict least recently used entries"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", (now - self.stale_for,))
+            overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                conn.execute("UPDATE counters SET value = value + ? WHERE name = 'evictions'", (overflow,))
+
+    def clear(self):
+        """Drop all cached entries and reset the counters"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("UPDATE counters SET value = 0")
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._connect() as conn:
+            stats = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            stats['entries'] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hit_rate'] = round(stats.get('hits', 0) / lookups * 100, 1) if lookups else 0
+        return stats
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """One cache instance per process, shared by all sessions"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+class SingleFlight:
+    """
+    Collapse concurrent computations of the same key into one.
+    The first caller to claim a key becomes its leader and must resolve the future;
+    everyone else gets the same future to wait on.
+    """
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        """Return (future, is_leader)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def release(self, key, future):
+        """Forget a resolved leader future so the next caller starts a fresh computation"""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._inflight
+
+    def run(self, key, fn):
+        """Compute fn() once for all concurrent callers of key and return its result"""
+        future, leader = self.claim(key)
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self.release(key, future)
+        return future.result()
@@ -0,0 +1,337 @@
+"""
+youtube-seo command line interface.
+
+    python -m youtube_seo score "How to Make Lofi Beats (2026)" --keyword "lofi beats"
+    python -m youtube_seo score --csv titles.csv --output scored.csv
+    python -m youtube_seo tags "Relaxing Piano for Sleep" --keyword "sleep music" --description
+    python -m youtube_seo bulk catalogue.csv -o packages.jsonl      # tags + description for every row, streamed
+    python -m youtube_seo research "lofi beats" "rain sounds" --api-key $YOUTUBE_API_KEY
+    python -m youtube_seo audit @mychannel --api-key $YOUTUBE_API_KEY
+    python -m youtube_seo snapshot --track "lofi beats" --api-key $YOUTUBE_API_KEY   # e.g. daily from cron
+    python -m youtube_seo quota --api-key "$KEY1,$KEY2"
+    python -m youtube_seo record "lofi beats" -o fixtures.json --api-key $YOUTUBE_API_KEY   # then YT_SEO_REPLAY_FIXTURES=fixtures.json
+
+Only `research`, `audit`, `snapshot` (and `bulk --api-key`) need network access; everything else runs offline.
+"""
+import argparse
+import json
+import os
+import sys
+
+def _load_power_words(path):
+    """Read a power-word list from a JSON array or a one-word-per-line text file"""
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    try:
+        words = json.loads(text)
+    except ValueError:
+        words = [line.strip() for line in text.splitlines() if line.strip()]
+    return words if isinstance(words, list) else None
+
+def cmd_score(args):
+    from .power_words import get_power_word_store
+
+    power_words = _load_power_words(args.power_words) or get_power_word_store().current()[0]
+
+    if args.csv:
+        import pandas as pd
+        from .scoring import score_titles
+
+        df = pd.read_csv(args.csv)
+        if args.title_column not in df:
+            print(f"❌ Column '{args.title_column}' not found in {args.csv}", file=sys.stderr)
+            return 1
+        keywords = df[args.keyword_column] if args.keyword_column in df else (args.keyword or "")
+        scored = score_titles(df[args.title_column], keywords, power_words)
+        out = pd.concat([df, scored], axis=1)
+        out.to_csv(args.output or sys.stdout, index=False)
+        return 0
+
+    if not args.titles:
+        print("❌ Pass one or more titles or --csv FILE", file=sys.stderr)
+        return 1
+
+    from .scoring import analyze_title
+
+    for title in args.titles:
+        score, checks = analyze_title(title, args.keyword or "", power_words)
+        if args.json:
+            print(json.dumps({'title': title, 'score': score, 'checks': checks}, ensure_ascii=False))
+        else:
+            print(f"{score:3d}/100  {title}")
+            for _, message in checks:
+                print(f"        {message}")
+    return 0
+
+def cmd_tags(args):
+    from .generate import generate_description, generate_tags
+
+    tags = generate_tags(args.title, args.keyword)
+    if args.json:
+        payload = {'title': args.title, 'tags': tags}
+        if args.description:
+            payload['description'] = generate_description(args.title, args.keyword, tags, args.length)
+        print(json.dumps(payload, ensure_ascii=False))
+        return 0
+
+    print(', '.join(tags))
+    if args.description:
+        print()
+        print(generate_description(args.title, args.keyword, tags, args.length))
+    return 0
+
+def cmd_bulk(args):
+    from .bulk import detect_format, generate_packages, iter_rows, write_rows
+
+    rows = iter_rows(args.input, args.input_format or detect_format(args.input))
+    packages = generate_packages(
+        rows, args.title_column, args.keyword_column, args.length_column,
+        api_key=args.api_key, region=args.region, workers=args.workers
+    )
+    try:
+        count = write_rows(packages, args.output, args.format or detect_format(args.output))
+    except (KeyError, ValueError) as e:
+        print(f"❌ Could not read {args.input}: {e}", file=sys.stderr)
+        return 1
+    print(f"generated {count} metadata packages", file=sys.stderr)
+    return 0
+
+def cmd_research(args):
+    from .youtube import estimate_quota, research_keywords
+
+    api_key = args.api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not api_key or len(api_key) < 30:
+        print("❌ Invalid API Key (use --api-key or YOUTUBE_API_KEY)", file=sys.stderr)
+        return 1
+
+    if args.regions:
+        return _research_regions(api_key, args)
+
+    print(f"up to {estimate_quota(args.depth, len(args.keywords))} quota units for {len(args.keywords)} keywords at depth {args.depth} (cached keywords are free)", file=sys.stderr)
+
+    failures = 0
+    for kw, data, err in research_keywords(api_key, args.keywords, args.region, args.order, args.depth, args.language):
+        if err:
+            failures += 1
+            print(json.dumps({'keyword': kw, 'error': err}, ensure_ascii=False) if args.json else f"{kw}: {err}")
+            continue
+
+        summary = {
+            'keyword': kw,
+            'score': data['score'],
+            'difficulty': data['difficulty'],
+            'median_views': data['median_views'],
+            'avg_views': data['avg_views'],
+            'avg_engagement': data['avg_engagement'],
+            'total_videos': data['total_videos'],
+            'distinct_videos': data['distinct_videos'],
+            'best_upload_time': data['best_upload_time'],
+            'trending_tags': data['trending_tags'],
+            'title_patterns': data['title_patterns'],
+        }
+        if args.json:
+            print(json.dumps(summary, ensure_ascii=False, default=float))
+        else:
+            print(f"{kw}: {data['difficulty']} • opportunity {data['score']}/100 • median {int(data['median_views']):,} views • {data['total_videos']} videos")
+            if data['trending_tags']:
+                print(f"    tags: {', '.join(data['trending_tags'][:10])}")
+    return 1 if failures == len(args.keywords) else 0
+
+def _research_regions(api_key, args):
+    from .config import RESEARCH_REGIONS
+    from .youtube import estimate_quota, region_comparison, research_regions
+
+    regions = RESEARCH_REGIONS if args.regions.lower() == "all" else [r.strip().upper() for r in args.regions.split(",") if r.strip()]
+    print(f"up to {estimate_quota(args.depth, len(args.keywords) * len(regions))} quota units for {len(args.keywords)} keywords in {len(regions)} regions at depth {args.depth} (cached searches are free)", file=sys.stderr)
+
+    failures = 0
+    for kw in args.keywords:
+        results = sorted(research_regions(api_key, kw, regions, args.order, args.depth, args.language), key=lambda r: regions.index(r[0]))
+        failures += all(err for _, _, err in results)
+        table = region_comparison(results)
+        if args.json:
+            for row in table.to_dict('records'):
+                print(json.dumps({'keyword': kw, **row}, ensure_ascii=False, default=float))
+        else:
+            print(f"{kw}:")
+            print(table.drop(columns=['Top Tags'], errors='ignore').to_string(index=False))
+    return 1 if failures == len(args.keywords) else 0
+
+def cmd_audit(args):
+    from .audit import audit_channel, crawl_uploads
+
+    api_key = args.api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not api_key or len(api_key) < 30:
+        print("❌ Invalid API Key (use --api-key or YOUTUBE_API_KEY)", file=sys.stderr)
+        return 1
+
+    channel_id = None
+    for event in crawl_uploads(api_key, args.channel, full=args.full):
+        if event['stage'] == 'error':
+            print(event['message'], file=sys.stderr)
+            return 1
+        if event['stage'] == 'crawl':
+            print(f"scanned {event['scanned']}/{event['total']} • fetched {event['fetched']}", file=sys.stderr)
+        elif event['stage'] == 'done':
+            channel_id = event['channel_id']
+
+    report, err = audit_channel(channel_id)
+    if err:
+        print(err, file=sys.stderr)
+        return 1
+
+    videos = report.pop('videos')
+    if args.output:
+        videos.drop(columns=['tags']).to_csv(args.output, index=False)
+    print(json.dumps(report, ensure_ascii=False, default=float))
+    return 0
+
+def cmd_snapshot(args):
+    from .trends import get_trend_store, run_due_snapshots
+
+    store = get_trend_store()
+    for kw in args.track or []:
+        store.track(kw, args.region)
+
+    api_key = args.api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not api_key or len(api_key) < 30:
+        print("❌ Invalid API Key (use --api-key or YOUTUBE_API_KEY)", file=sys.stderr)
+        return 1
+
+    interval = 0 if args.force else args.interval
+    errors = run_due_snapshots(api_key, store, interval)
+    for kw, err in errors.items():
+        print(f"{kw}: {err}", file=sys.stderr)
+    return 1 if errors else 0
+
+def cmd_quota(args):
+    from .config import QUOTA_DAILY_LIMIT
+    from .quota import get_quota_scheduler
+
+    api_key = args.api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not api_key:
+        print("❌ Pass --api-key or set YOUTUBE_API_KEY", file=sys.stderr)
+        return 1
+
+    for suffix, units, calls in get_quota_scheduler().spend(api_key):
+        print(f"…{suffix}: {units:,}/{QUOTA_DAILY_LIMIT:,} units today ({calls} calls)")
+    return 0
+
+def cmd_record(args):
+    from .power_words import get_power_words_from_gemini
+    from .replay import RecordingYouTube, load_fixtures, save_fixtures
+    from .youtube import get_keyword_metrics, get_youtube_client, register_youtube_client
+
+    api_key = args.api_key or os.environ.get("YOUTUBE_API_KEY", "")
+    if not api_key or len(api_key) < 30:
+        print("❌ Invalid API Key (use --api-key or YOUTUBE_API_KEY)", file=sys.stderr)
+        return 1
+
+    fixtures = load_fixtures(args.output) if args.append and os.path.exists(args.output) else None
+    recorder = RecordingYouTube(get_youtube_client(api_key), fixtures)
+    register_youtube_client(api_key, recorder)
+
+    failures = 0
+    for kw in args.keywords:
+        _, err = get_keyword_metrics(api_key, kw, args.region, use_cache=False, depth=args.depth)
+        if err:
+            failures += 1
+            print(f"{kw}: {err}", file=sys.stderr)
+
+    for niche in args.niche or []:
+        words, status = get_power_words_from_gemini(args.gemini_key, niche)
+        if words:
+            recorder.fixtures['gemini'][niche] = words
+        else:
+            print(f"gemini {niche}: {status}", file=sys.stderr)
+
+    save_fixtures(recorder.fixtures, args.output)
+    print(f"recorded {len(recorder.fixtures['search'])} searches and {len(recorder.fixtures['videos'])} videos to {args.output}", file=sys.stderr)
+    return 1 if failures == len(args.keywords) else 0
+
+def build_parser():
+    from .config import BULK_MAX_WORKERS, SAMPLE_DEPTH_DEFAULT, SAMPLE_DEPTH_MAX
+
+    parser = argparse.ArgumentParser(prog="youtube-seo", description="YouTube SEO scoring, metadata and keyword research")
+    parser.add_argument("--power-words", metavar="FILE", help="power-word list (JSON array or one word per line)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="score titles for SEO")
+    score.add_argument("titles", nargs="*", help="titles to score")
+    score.add_argument("-k", "--keyword", default="", help="target keyword")
+    score.add_argument("--csv", help="score every row of a CSV file in bulk")
+    score.add_argument("--title-column", default="title")
+    score.add_argument("--keyword-column", default="keyword")
+    score.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    score.add_argument("--json", action="store_true", help="print one JSON object per title")
+    score.set_defaults(func=cmd_score)
+
+    tags = sub.add_parser("tags", help="generate tags (and optionally a description)")
+    tags.add_argument("title")
+    tags.add_argument("-k", "--keyword", default="")
+    tags.add_argument("-d", "--description", action="store_true", help="also generate a description")
+    tags.add_argument("--length", default="10:00", help="video length for description timestamps")
+    tags.add_argument("--json", action="store_true")
+    tags.set_defaults(func=cmd_tags)
+
+    bulk = sub.add_parser("bulk", help="generate tags and descriptions for every row of a CSV/JSONL catalogue")
+    bulk.add_argument("input", help="CSV or JSONL file ('-' for stdin)")
+    bulk.add_argument("-o", "--output", default="-", help="output .jsonl or .csv (default: JSONL on stdout)")
+    bulk.add_argument("--input-format", choices=["csv", "jsonl"], help="default: from the input file extension")
+    bulk.add_argument("--format", choices=["csv", "jsonl"], help="default: from the output file extension")
+    bulk.add_argument("--title-column", default="title")
+    bulk.add_argument("--keyword-column", default="keyword")
+    bulk.add_argument("--length-column", default="length", help="video length column for description timestamps")
+    bulk.add_argument("--workers", type=int, default=BULK_MAX_WORKERS, help="worker processes for large inputs (1 = in-process)")
+    bulk.add_argument("--api-key", help="research uncached keywords for competitor tags (default: cached keywords only)")
+    bulk.add_argument("--region", default="ID")
+    bulk.set_defaults(func=cmd_bulk)
+
+    research = sub.add_parser("research", help="keyword research via the YouTube Data API")
+    research.add_argument("keywords", nargs="+")
+    research.add_argument("--api-key", help="YouTube API key (default: $YOUTUBE_API_KEY)")
+    research.add_argument("--region", default="ID")
+    research.add_argument("--order", default="relevance", choices=["relevance", "date", "viewCount", "rating"])
+    research.add_argument("--language", help="relevanceLanguage, e.g. en or id")
+    research.add_argument("--regions", help="compare several markets per keyword: comma-separated region codes, or 'all' (each searched in its own language unless --language is given)")
+    research.add_argument("--depth", type=int, default=SAMPLE_DEPTH_DEFAULT, help=f"search results to sample per keyword (max {SAMPLE_DEPTH_MAX})")
+    research.add_argument("--json", action="store_true")
+    research.set_defaults(func=cmd_research)
+
+    audit = sub.add_parser("audit", help="crawl a channel's uploads and report SEO scores")
+    audit.add_argument("channel", help="channel ID, @handle or URL")
+    audit.add_argument("--api-key", help="YouTube API key (default: $YOUTUBE_API_KEY)")
+    audit.add_argument("--full", action="store_true", help="walk the whole uploads playlist, not just new pages")
+    audit.add_argument("-o", "--output", help="write the per-video table to this CSV")
+    audit.set_defaults(func=cmd_audit)
+
+    snapshot = sub.add_parser("snapshot", help="snapshot tracked keywords for the Trend Finder")
+    snapshot.add_argument("--track", action="append", metavar="KEYWORD", help="start tracking a keyword (repeatable)")
+    snapshot.add_argument("--region", default="ID")
+    snapshot.add_argument("--api-key", help="YouTube API key (default: $YOUTUBE_API_KEY)")
+    snapshot.add_argument("--interval", type=float, default=24, help="skip keywords snapshotted within this many hours")
+    snapshot.add_argument("--force", action="store_true", help="snapshot every tracked keyword now")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    record = sub.add_parser("record", help="record live API responses into a replay fixture file")
+    record.add_argument("keywords", nargs="+")
+    record.add_argument("-o", "--output", required=True, help="fixture JSON file")
+    record.add_argument("--append", action="store_true", help="add to an existing fixture file")
+    record.add_argument("--api-key", help="YouTube API key (default: $YOUTUBE_API_KEY)")
+    record.add_argument("--region", default="ID")
+    record.add_argument("--depth", type=int, default=SAMPLE_DEPTH_DEFAULT)
+    record.add_argument("--gemini-key", help="also record Gemini power words with this key")
+    record.add_argument("--niche", action="append", help="Gemini niche to record (repeatable)")
+    record.set_defaults(func=cmd_record)
+
+    quota = sub.add_parser("quota", help="show today's quota spend per API key")
+    quota.add_argument("--api-key", help="YouTube API key(s), comma-separated (default: $YOUTUBE_API_KEY)")
+    quota.set_defaults(func=cmd_quota)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,118 @@
+"""Shared constants for the app, the CLI and the library"""
+import os
+
+# --- POWER WORDS & TITLE VOCABULARY ---
+URL_DATABASE_ONLINE = "https://gist.githubusercontent.com/rhanierex/f2d76f11df8d550376d81b58124d3668/raw/0b58a1eb02a7cffc2261a1c8d353551f3337001c/gistfile1.txt"
+FALLBACK_POWER_WORDS = ["secret", "best", "exposed", "tutorial", "guide", "how to", "tips", "tricks", "hacks", "ultimate", "complete", "full", "master", "proven", "amazing", "incredible", "perfect", "easy", "simple", "advanced"]
+VIRAL_EMOJIS = ["🔥", "😱", "🔴", "✅", "❌", "🎵", "⚠️", "⚡", "🚀", "💰", "💯", "🤯", "😭", "😡", "😴", "🌙", "✨", "💤", "🌧️", "🎹", "👀", "💪", "🎯", "⭐", "🏆"]
+TITLE_MAX_LENGTH = 100  # YouTube rejects longer titles
+TITLE_SEARCH_BUDGET_SECONDS = 0.05
+STOP_WORDS = {"the", "and", "or", "for", "to", "in", "on", "at", "by", "with", "a", "an", "is", "it", "of", "that", "this", "video", "i", "you", "me", "we", "my", "your"}
+
+# --- LOCAL STORAGE ---
+DATA_DIR = os.environ.get("YT_SEO_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"))
+
+# Power-word database: local versioned copy of the Gist, refreshed in the background
+POWER_WORDS_PATH = os.environ.get("YT_SEO_POWER_WORDS_PATH", os.path.join(DATA_DIR, "power_words.json"))
+POWER_WORDS_REFRESH_SECONDS = int(os.environ.get("YT_SEO_POWER_WORDS_REFRESH", 600))
+
+# Gemini power words, generated per niche and shared by every user and key
+GEMINI_NICHES = ["general", "gaming", "tech", "cooking", "music", "fitness", "education", "entertainment", "business", "lifestyle"]
+GEMINI_MODEL = os.environ.get("YT_SEO_GEMINI_MODEL", "gemini-pro")
+GEMINI_WORDS_PATH = os.environ.get("YT_SEO_GEMINI_WORDS_PATH", os.path.join(DATA_DIR, "gemini_power_words.json"))
+GEMINI_WORDS_TTL_SECONDS = int(os.environ.get("YT_SEO_GEMINI_WORDS_TTL", 7 * 24 * 3600))
+GEMINI_MAX_WORKERS = 4
+
+# Keyword metrics cache (shared by every session on this host, survives restarts)
+CACHE_DB_PATH = os.environ.get("YT_SEO_CACHE_PATH", os.path.join(DATA_DIR, "keyword_metrics.sqlite"))
+CACHE_TTL_SECONDS = int(os.environ.get("YT_SEO_CACHE_TTL", 6 * 3600))
+CACHE_TTL_BY_ORDER = {"date": 3600, "viewCount": 12 * 3600}  # fresher uploads go stale faster
+CACHE_MAX_ENTRIES = int(os.environ.get("YT_SEO_CACHE_MAX_ENTRIES", 1000))
+CACHE_STALE_SECONDS = int(os.environ.get("YT_SEO_CACHE_STALE", 24 * 3600))  # expired entries can still be served while refreshing
+
+# Channel audit store (uploads seen per channel, for incremental re-audits)
+AUDIT_DB_PATH = os.environ.get("YT_SEO_AUDIT_PATH", os.path.join(DATA_DIR, "channel_audit.sqlite"))
+
+# Tag co-occurrence index, fed by every video the app fetches
+TAG_INDEX_PATH = os.environ.get("YT_SEO_TAG_INDEX_PATH", os.path.join(DATA_DIR, "tag_index.sqlite"))
+TAG_INDEX_MAX_TAGS_PER_VIDEO = 20  # pairs grow quadratically with tags per video
+TAG_INDEX_MAX_PAIRS = int(os.environ.get("YT_SEO_TAG_INDEX_MAX_PAIRS", 2000000))  # lightest pairs are dropped past this
+
+# Near-duplicate competitor titles (MinHash over character shingles, LSH banding)
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16  # 16 bands x 4 rows: titles sharing about half their shingles become candidates
+DEDUP_SHINGLE_SIZE = 4
+DEDUP_THRESHOLD = 0.6  # estimated Jaccard similarity for two titles to count as near-duplicates
+TITLE_CORPUS_PATH = os.environ.get("YT_SEO_TITLE_CORPUS_PATH", os.path.join(DATA_DIR, "title_corpus.sqlite"))
+TITLE_CORPUS_MAX_TITLES = int(os.environ.get("YT_SEO_TITLE_CORPUS_MAX_TITLES", 200000))  # oldest titles are dropped past this
+
+# Trend Finder snapshots (append-only Parquet, partitioned by month)
+TRENDS_DIR = os.environ.get("YT_SEO_TRENDS_DIR", os.path.join(DATA_DIR, "trends"))
+TRENDS_SNAPSHOT_INTERVAL_HOURS = int(os.environ.get("YT_SEO_TRENDS_INTERVAL_HOURS", 24))
+TRENDS_COMPACT_FILES = 32  # a month's snapshot files are merged into one once there are this many
+
+# Offline replay: answer YouTube and Gemini calls from a recorded fixture file instead of the network
+REPLAY_FIXTURES = os.environ.get("YT_SEO_REPLAY_FIXTURES")
+
+# Performance metrics (OpenMetrics text, written to a file and/or served over HTTP)
+METRICS_FILE = os.environ.get("YT_SEO_METRICS_FILE")
+METRICS_FILE_INTERVAL_SECONDS = 15
+METRICS_PORT = int(os.environ.get("YT_SEO_METRICS_PORT", 0)) or None
+METRICS_WINDOW = 1024  # recent durations kept per span for percentiles
+
+# --- YOUTUBE API ---
+YOUTUBE_HTTP_POOL_SIZE = 10
+YOUTUBE_HTTP_TIMEOUT = 30
+
+# Asyncio REST client over HTTP/2 (youtube_seo.youtube_async); YT_SEO_ASYNC=1 uses it for batch research
+YOUTUBE_API_BASE_URL = os.environ.get("YT_SEO_YOUTUBE_BASE_URL", "https://www.googleapis.com/youtube/v3/")
+YOUTUBE_ASYNC = os.environ.get("YT_SEO_ASYNC", "") not in ("", "0")
+YOUTUBE_ASYNC_MAX_CONNECTIONS = 20
+YOUTUBE_ASYNC_CONCURRENCY = 16  # keywords researched at once
+
+# Batch keyword research
+BATCH_MAX_WORKERS = 8
+BATCH_MAX_KEYWORDS = 500
+VIDEOS_PER_REQUEST = 50  # videos().list accepts at most 50 IDs per call
+
+# Multi-region research: each market's timezone (for upload hours) and default search language
+REGION_TIMEZONES = {
+    "ID": "Asia/Jakarta", "US": "America/New_York", "IN": "Asia/Kolkata", "BR": "America/Sao_Paulo",
+    "MX": "America/Mexico_City", "PH": "Asia/Manila", "JP": "Asia/Tokyo", "KR": "Asia/Seoul",
+    "GB": "Europe/London", "DE": "Europe/Berlin", "FR": "Europe/Paris", "VN": "Asia/Ho_Chi_Minh",
+}
+REGION_LANGUAGES = {
+    "ID": "id", "US": "en", "IN": "hi", "BR": "pt", "MX": "es", "PH": "tl",
+    "JP": "ja", "KR": "ko", "GB": "en", "DE": "de", "FR": "fr", "VN": "vi",
+}
+RESEARCH_REGIONS = [r.strip().upper() for r in os.environ.get("YT_SEO_REGIONS", ",".join(REGION_TIMEZONES)).split(",") if r.strip()]
+
+# Bulk metadata generation (python -m youtube_seo bulk)
+BULK_CHUNK_SIZE = 500  # rows per worker task
+BULK_POOL_MIN_ROWS = 5000  # smaller inputs are generated in-process
+BULK_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Competitor sampling depth (search results analyzed per keyword)
+SAMPLE_DEPTH_DEFAULT = 50
+SAMPLE_DEPTH_MAX = 500
+SEARCH_RESULTS_PER_PAGE = 50  # search().list returns at most 50 results per page
+QUOTA_COST = {"search": 100, "videos": 1, "channels": 1, "playlistItems": 1}  # units per call
+
+# Quota budgeting: per-key daily ledger, rate limiting and retries for every API call
+QUOTA_DB_PATH = os.environ.get("YT_SEO_QUOTA_PATH", os.path.join(DATA_DIR, "quota.sqlite"))
+QUOTA_DAILY_LIMIT = int(os.environ.get("YT_SEO_QUOTA_DAILY_LIMIT", 10000))
+QUOTA_RATE_PER_SECOND = float(os.environ.get("YT_SEO_QUOTA_RATE", 10))
+QUOTA_BURST = 20
+QUOTA_MAX_RETRIES = 4
+QUOTA_BACKOFF_SECONDS = 1.0
+
+_default_power_words = FALLBACK_POWER_WORDS
+
+def get_default_power_words():
+    """Power words used when a caller does not pass its own list"""
+    return _default_power_words
+
+def set_default_power_words(words):
+    """Replace the process-wide default power-word list (e.g. after loading the Gist)"""
+    global _default_power_words
+    _default_power_words = list(words) if words else FALLBACK_POWER_WORDS
@@ -0,0 +1,294 @@
+"""
+Near-duplicate title detection: MinHash signatures with LSH banding.
+
+    labels = cluster_titles(["Lofi Beats to Study #12", "lofi beats to study #13", "Rain Sounds 10 Hours"],
+                            channels=["Lofi Girl", "Lofi Girl", "Rain"])
+    # -> [0, 0, 2]: each title is labelled with the row of the first title in its cluster
+    get_title_corpus().similar("lofi beats to study #14")
+
+A title is reduced to the byte 4-grams of its lowercased words, with digits folded to 0, so
+re-uploads and numbered template titles ("... #12", "... Part 3") land together. Signatures are
+split into bands; titles sharing any band (and channel, when channels are given) become candidates,
+and candidates whose signatures agree on at least DEDUP_THRESHOLD of their positions are merged.
+Finding candidates only touches equal bands, never every pair, so it stays sub-linear per query -
+in memory for one keyword's competitors, and through an indexed SQLite table for the corpus of the
+most recent TITLE_CORPUS_MAX_TITLES titles the app has fetched.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .config import DEDUP_BANDS, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD, TITLE_CORPUS_MAX_TITLES, TITLE_CORPUS_PATH
+from .metrics import span
+from .text import NUMBER_RE, tokenize_title
+
+_MAX_HASH = 0xFFFFFFFF
+_permutations = {}
+
+def _permutation(num_perm):
+    """
+    Fixed multiply-shift hash family ((a * x + b) mod 2^64) >> 32 for a signature size,
+    seeded so signatures are comparable across processes and runs
+    """
+    import numpy as np
+
+    if num_perm not in _permutations:
+        rng = np.random.default_rng(20240501)
+        a = rng.integers(0, 1 << 64, num_perm, dtype='uint64', endpoint=False) | np.uint64(1)
+        b = rng.integers(0, 1 << 64, num_perm, dtype='uint64', endpoint=False)
+        _permutations[num_perm] = (a, b)
+    return _permutations[num_perm]
+
+def _normalized(title):
+    return NUMBER_RE.sub('0', ' '.join(tokenize_title(title or "").words)).encode('utf-8')
+
+def title_signatures(titles, num_perm=DEDUP_NUM_PERM, shingle_size=DEDUP_SHINGLE_SIZE):
+    """
+    (n, num_perm) uint32 MinHash signatures of titles.
+    Titles shorter than one shingle are shingled whole; titles without any word get all-max rows.
+    """
+    import numpy as np
+
+    texts = [_normalized(t) for t in titles]
+    n = len(texts)
+    signatures = np.full((n, num_perm), _MAX_HASH, dtype='uint32')
+    if not n:
+        return signatures
+
+    # Every text padded to at least one full shingle, then all shingles of all texts at once
+    texts = [t.ljust(shingle_size, b' ') if t else t for t in texts]
+    lengths = np.fromiter((len(t) for t in texts), dtype='int64', count=n)
+    data = np.frombuffer(b''.join(texts), dtype='uint8').astype('uint64')
+    counts = np.maximum(lengths - shingle_size + 1, 0)
+    rows = np.flatnonzero(counts)
+    if not len(rows):
+        return signatures
+
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    offsets = np.repeat(starts[rows] - np.concatenate([[0], np.cumsum(counts[rows])[:-1]]), counts[rows])
+    positions = np.arange(len(offsets)) + offsets
+    grams = np.zeros(len(positions), dtype='uint64')
+    for i in range(shingle_size):
+        grams = (grams << np.uint64(8)) | data[positions + i]
+
+    # Titles share most of their shingles, so each distinct shingle is hashed once
+    unique, inverse = np.unique(grams, return_inverse=True)
+    a, b = _permutation(num_perm)
+    with np.errstate(over='ignore'):
+        hashed = ((a[:, None] * unique + b[:, None]) >> np.uint64(32)).astype('uint32')
+    bounds = np.concatenate([[0], np.cumsum(counts[rows])[:-1]])
+    signatures[rows] = np.minimum.reduceat(np.take(hashed, inverse, axis=1), bounds, axis=1).T
+    return signatures
+
+def band_keys(signatures, bands=DEDUP_BANDS):
+    """(n, bands) int64 hash of each band of each signature"""
+    import numpy as np
+
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    banded = signatures[:, :rows * bands].reshape(n, bands, rows).astype('uint64')
+    with np.errstate(over='ignore'):
+        weights = np.uint64(0x9E3779B97F4A7C15) ** np.arange(1, rows + 1, dtype='uint64')
+        keys = (banded * weights).sum(axis=2, dtype='uint64')
+    return keys.view('int64')
+
+def similarity(signature, others):
+    """Estimated Jaccard similarity of a signature to each row of others"""
+    return (others == signature).mean(axis=-1)
+
+def cluster_signatures(signatures, bands=DEDUP_BANDS, threshold=DEDUP_THRESHOLD, groups=None):
+    """
+    Cluster label per signature: the row of the first member of its near-duplicate cluster.
+    Candidates are every pair sharing an LSH band (and group, e.g. channel code, if groups is given).
+    """
+    import numpy as np
+
+    n = len(signatures)
+    labels = np.arange(n)
+    if n < 2:
+        return labels
+
+    groups = np.zeros(n, dtype='int64') if groups is None else np.asarray(groups, dtype='int64')
+    usable = ~(signatures == _MAX_HASH).all(axis=1)
+
+    # Identical signatures (re-uploads, numbered templates) share every bucket, so one row of each
+    # is clustered in their place; this keeps the all-pairs bucket scan small on repetitive lists.
+    # Titles without words never cluster, so each keeps a key of its own.
+    own_key = np.where(usable, groups, -1 - np.arange(n))
+    _, first, inverse = np.unique(np.column_stack([own_key, signatures.astype('int64')]), axis=0, return_index=True, return_inverse=True)
+    if len(first) < n:
+        representatives = np.sort(first)
+        rank = np.empty(n, dtype='int64')
+        rank[representatives] = np.arange(len(representatives))
+        sub = cluster_signatures(signatures[representatives], bands, threshold, groups[representatives])
+        return representatives[sub][rank[first[inverse.ravel()]]]
+
+    keys = band_keys(signatures, bands)
+    rows = np.flatnonzero(usable)
+    pairs = []
+    for band in range(keys.shape[1]):
+        order = rows[np.lexsort((keys[rows, band], groups[rows]))]
+        sorted_keys, sorted_groups = keys[order, band], groups[order]
+        bucket = np.cumsum(np.concatenate([[True], (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_groups[1:] != sorted_groups[:-1])]))
+        # Pair each member with every later member of its bucket, one offset at a time
+        for offset in range(1, len(order)):
+            same = bucket[offset:] == bucket[:-offset]
+            if not same.any():
+                break
+            pairs.append(np.stack([order[:-offset][same], order[offset:][same]], axis=1))
+    if not pairs:
+        return labels
+
+    pairs = np.unique(np.sort(np.concatenate(pairs), axis=1), axis=0)
+    similar = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1) >= threshold
+
+    parent = list(range(n))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs[similar].tolist():
+        ri, rj = root(i), root(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)  # the root is always the cluster's first row
+    return np.array([root(i) for i in range(n)])
+
+def cluster_titles(titles, channels=None, num_perm=DEDUP_NUM_PERM, bands=DEDUP_BANDS, threshold=DEDUP_THRESHOLD):
+    """
+    Near-duplicate cluster label per title (the row of the cluster's first title).
+    With channels, only titles of the same channel can cluster: two channels sharing a title
+    template are still two competitors.
+    """
+    groups = None
+    if channels is not None:
+        codes = {}
+        groups = [codes.setdefault(channel, len(codes)) for channel in channels]
+    with span("dedup.cluster"):
+        return cluster_signatures(title_signatures(titles, num_perm), bands, threshold, groups)
+
+class TitleCorpus:
+    """
+    The most recent max_titles competitor titles the app has fetched, with their MinHash signatures
+    and LSH band buckets in SQLite. similar() only reads the rows sharing a band with the query.
+    """
+    def __init__(self, path=TITLE_CORPUS_PATH, num_perm=DEDUP_NUM_PERM, bands=DEDUP_BANDS, threshold=DEDUP_THRESHOLD,
+                 max_titles=TITLE_CORPUS_MAX_TITLES):
+        self.path = path
+        self.max_titles = max_titles
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS titles (
+                id INTEGER PRIMARY KEY,
+                video_id TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                channel TEXT,
+                views INTEGER NOT NULL DEFAULT 0,
+                signature BLOB NOT NULL
+            )""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                title INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, title)
+            ) WITHOUT ROWID""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_title ON bands(title)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_videos(self, video_items):
+        """Add videos().list items not seen before (views of known ones are updated). Returns how many were new"""
+        entries = {}
+        for item in video_items:
+            snippet = item.get('snippet', {})
+            if item.get('id') and snippet.get('title'):
+                views = int(item.get('statistics', {}).get('viewCount', 0) or 0)
+                entries[item['id']] = (snippet['title'], snippet.get('channelTitle'), views)
+        if not entries:
+            return 0
+
+        with span("dedup.add"), self._connect() as conn:
+            conn.executemany("UPDATE titles SET views = ? WHERE video_id = ?", [(e[2], vid) for vid, e in entries.items()])
+            known = set()
+            ids = list(entries)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                known.update(r[0] for r in conn.execute(f"SELECT video_id FROM titles WHERE video_id IN ({','.join('?' * len(chunk))})", chunk))
+            new = [vid for vid in ids if vid not in known]
+            if not new:
+                return 0
+
+            signatures = title_signatures([entries[vid][0] for vid in new], self.num_perm)
+            keys = band_keys(signatures, self.bands)
+            for vid, signature, row_keys in zip(new, signatures, keys.tolist()):
+                title, channel, views = entries[vid]
+                title_id = conn.execute("INSERT INTO titles (video_id, title, channel, views, signature) VALUES (?, ?, ?, ?, ?)",
+                                        (vid, title, channel, views, signature.tobytes())).lastrowid
+                conn.executemany("INSERT OR IGNORE INTO bands VALUES (?, ?, ?)", [(band, key, title_id) for band, key in enumerate(row_keys)])
+
+            # Ids only grow and only the oldest are ever deleted, so the id range is the row count
+            oldest, newest = conn.execute("SELECT MIN(id), MAX(id) FROM titles").fetchone()
+            if newest - oldest + 1 > self.max_titles:
+                cutoff = newest - self.max_titles + 1
+                conn.execute("DELETE FROM bands WHERE title < ?", (cutoff,))
+                conn.execute("DELETE FROM titles WHERE id < ?", (cutoff,))
+        return len(new)
+
+    def similar(self, title, limit=10):
+        """Stored titles near-duplicating a title, most similar first, as dicts with a 'similarity' field"""
+        import numpy as np
+
+        signature = title_signatures([title], self.num_perm)
+        if (signature == _MAX_HASH).all():
+            return []
+        keys = band_keys(signature, self.bands)[0].tolist()
+
+        with span("dedup.similar"), self._connect() as conn:
+            rows = conn.execute(
+                f"""SELECT video_id, title, channel, views, signature FROM titles WHERE id IN (
+                    SELECT title FROM bands WHERE {' OR '.join(['(band = ? AND bucket = ?)'] * len(keys))})""",
+                [value for band, key in enumerate(keys) for value in (band, key)]
+            ).fetchall()
+        if not rows:
+            return []
+
+        others = np.frombuffer(b''.join(r[4] for r in rows), dtype='uint32').reshape(len(rows), -1)
+        scores = similarity(signature[0], others)
+        matches = [
+            {'video_id': vid, 'title': text, 'channel': channel, 'views': views, 'similarity': float(score)}
+            for (vid, text, channel, views, _), score in zip(rows, scores) if score >= self.threshold
+        ]
+        return sorted(matches, key=lambda m: (-m['similarity'], -m['views']))[:limit]
+
+    def stats(self):
+        with self._connect() as conn:
+            return {'titles': conn.execute("SELECT COUNT(*) FROM titles").fetchone()[0]}
+
+_title_corpus = None
+_title_corpus_lock = threading.Lock()
+
+def get_title_corpus():
+    """One corpus per process, shared by all sessions"""
+    global _title_corpus
+    with _title_corpus_lock:
+        if _title_corpus is None:
+            _title_corpus = TitleCorpus()
+        return _title_corpus
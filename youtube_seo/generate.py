@@ -0,0 +1,304 @@
+"""Tag, description and title suggestion generators"""
+import datetime
+import heapq
+import re
+import sqlite3
+import time
+from functools import lru_cache
+
+from .config import STOP_WORDS, TITLE_MAX_LENGTH, TITLE_SEARCH_BUDGET_SECONDS, VIRAL_EMOJIS, get_default_power_words
+from .metrics import timed
+from .scoring import analyze_title, keyword_score, length_score
+from .tag_index import get_tag_index
+from .text import extract_core_theme, extract_keywords_from_title, get_power_matcher, smart_truncate, tokenize_title
+
+def rank_competitor_tags(competitor_tags, keyword, context):
+    """Competitor tags by relevance; their given order if the index has nothing on them"""
+    candidates = [t for t in competitor_tags if t.lower() not in context]
+    try:
+        return get_tag_index().rank(candidates, keyword, context)
+    except sqlite3.Error:
+        return candidates
+
+def related_tags(tag, k=10):
+    """Tags most used together with a tag across every fetched video; [] if the index has nothing on it"""
+    try:
+        return [related for related, _ in get_tag_index().related(tag, k)]
+    except sqlite3.Error:
+        return []
+
+@timed("generate.tags")
+def generate_tags(title, keyword, competitor_tags=None, year=None):
+    """Generate SEO-optimized tags (pass `year` to skip the clock lookup in bulk runs)"""
+    if not title:
+        return [keyword.lower()] if keyword else []
+
+    tags = set()
+    year = year or datetime.datetime.now().year
+
+    if keyword:
+        tags.add(keyword.lower())
+        tags.add(f"{keyword.lower()} {year}")
+
+        kw_words = keyword.lower().split()
+        if len(kw_words) > 1:
+            tags.add(kw_words[0])
+            tags.add(' '.join(kw_words[:2]))
+
+    for word in tokenize_title(title).clean_words:
+        if word not in STOP_WORDS and len(word) > 2:
+            tags.add(word)
+            if len(tags) >= 12:
+                break
+
+    if competitor_tags:
+        # Competitor tags most relevant to this keyword and title first (tag co-occurrence index)
+        for tag in rank_competitor_tags(competitor_tags, keyword, tags)[:5]:
+            if len(tags) < 18:
+                tags.add(tag.lower())
+
+    if keyword:
+        tags.add(f"{keyword.lower()} tutorial")
+        tags.add(f"how to {keyword.lower()}")
+
+    return list(tags)[:20]
+
+@lru_cache(maxsize=1024)
+def _description_parts(keyword, video_length, year):
+    """The parts of a description that depend only on keyword, length and year: (body, footer, closing)"""
+    try:
+        duration_mins = int(video_length.split(':')[0])
+    except:
+        duration_mins = 10
+
+    body = f"""📌 **About This Video:**
+In this comprehensive {video_length} video, we dive deep into **{keyword}**. Whether you're a beginner or looking to advance your skills, this {year} guide will help you master {keyword}.
+
+⏱️ **Timestamps:**
+0:00 - Introduction
+0:45 - What is {keyword}?
+2:30 - Step-by-step {keyword} tutorial
+{max(duration_mins-3, 5)}:00 - Pro tips and advanced techniques
+{max(duration_mins-2, 7)}:00 - Common mistakes to avoid
+{max(duration_mins-1, 9)}:00 - Conclusion & next steps
+
+🔥 **What You'll Learn:**
+✅ Complete {keyword} fundamentals
+✅ Practical examples and demonstrations
+✅ Expert insights and strategies
+✅ Proven techniques that work in {year}
+
+💡 **Related Topics:**
+"""
+    footer = f"""
+
+🔔 **Don't Forget to:**
+• SUBSCRIBE for more {keyword} content
+• LIKE if this video helped you
+• COMMENT your questions below
+• SHARE with anyone who needs this
+
+📱 **Connect With Us:**
+[Add your social media links here]
+
+"""
+    closing = f"""
+
+---
+© {year} | {keyword.title()} Tutorial | All Rights Reserved
+"""
+    return body, footer, closing
+
+@timed("generate.description")
+def generate_description(title, keyword, tags, video_length="10:00", year=None):
+    """Generate SEO-optimized description (pass `year` to skip the clock lookup in bulk runs)"""
+    body, footer, closing = _description_parts(keyword, video_length, year or datetime.datetime.now().year)
+
+    tag_text = ', '.join(tags[:5]) if tags else keyword
+    hashtags = ' '.join([f"#{tag.replace(' ', '')}" for tag in tags[:5]]) if tags else f"#{keyword.replace(' ', '')}"
+
+    return f"🎬 {title}\n\n{body}{tag_text}{footer}{hashtags}{closing}"
+
+# Suggestion templates; {theme} is title-cased, {theme_raw} keeps the original casing
+TITLE_TEMPLATES = [
+    "{kw}: {theme} - {power} {year} {emoji}",
+    "{number} {kw} {theme} You Need ({year}) {emoji}",
+    "How to {kw}: {theme_raw} {emoji} [{year} {power}]",
+    "{theme} - {kw} {power} Guide {year} {emoji}",
+    "{power} {kw} {theme_raw} | {year} Tutorial {emoji}",
+    "{kw} ({year}) - {number} {power} {theme} Tips {emoji}",
+    "{power} {kw}: {theme} [{year}] {emoji}",
+    "{kw} {emoji} {theme} | {power} {year}",
+    "{number} {power} {kw} Ideas - {theme} ({year})",
+    "Is This the {power} {kw}? {theme} {year} {emoji}",
+    "{kw} {year}: {number} {power} Ways to {theme_raw} {emoji}",
+    "{emoji} {kw} - {theme} ({power} {year})",
+]
+THEME_LENGTHS = (None, 45, 30, 20)
+SEARCH_POWER_WORDS = 12
+SEARCH_NUMBERS = 4
+SEARCH_EMOJIS = 6
+CANDIDATES_PER_SHAPE = 2
+
+@lru_cache(maxsize=4096)
+def _exact_score(title, keyword, power_words):
+    return analyze_title(title, keyword, list(power_words))[0]
+
+def _ordered_unique(items, limit):
+    seen = []
+    for item in items:
+        if item and item not in seen:
+            seen.append(item)
+            if len(seen) == limit:
+                break
+    return seen
+
+def _leading_texts(template, theme, keyword, slot_values):
+    """Lowercased texts a fill of a shape can begin with (a leading emoji is stripped by the scorer)"""
+    rest = template[len("{emoji}"):].lstrip() if template.startswith("{emoji}") else template
+    if rest.startswith("{kw}"):
+        return [keyword.lower()]
+    if rest.startswith(("{theme}", "{theme_raw}")):
+        return [theme.lower()]
+    for slot, values in slot_values.items():
+        if rest.startswith("{" + slot + "}"):
+            return [v.lower() for v in values] or [""]
+    return [rest.split("{", 1)[0].lower()]
+
+def _shape_bound(template, theme, keyword, year, matcher, lengths, slot_values):
+    """
+    Best score any fill of a (template, theme) shape can reach; lengths is the (min, max) length of
+    its fills, slot_values the power words, numbers and emojis the slots are filled from
+    """
+    # The title with every slot left empty: keyword, theme and the template's own words
+    fixed = template.format(kw=keyword.title(), theme=theme, theme_raw=theme, year="", power="", number="", emoji="")
+    kw_lower = keyword.lower()
+
+    if not keyword or any(t.startswith(kw_lower) or kw_lower.startswith(t.strip()) for t in _leading_texts(template, theme, keyword, slot_values)):
+        kw_bound = 20
+    else:
+        kw_bound = 15
+
+    power = 15 if "{power}" in template or matcher.search(fixed) else 0
+    number = 15 if "{number}" in template or "{year}" in template or re.search(r'\d', fixed) else 0
+    emoji = 10 if "{emoji}" in template or any(e in fixed for e in VIRAL_EMOJIS) else 0
+    engagement = 5 * (('[' in fixed or '(' in fixed) + ('?' in fixed) + ("{year}" in template or str(year) in fixed))
+    length = max(length_score(n) for n in range(lengths[0], lengths[1] + 1))
+    return kw_bound + power + number + emoji + min(engagement, 15) + length
+
+def search_title_candidates(original_title, keyword, competitor_data=None, power_words_list=None,
+                            top_k=5, time_budget=TITLE_SEARCH_BUDGET_SECONDS):
+    """
+    Branch-and-bound search over templates x theme truncations x power words x numbers x emojis.
+
+    Every (template, theme) shape gets a score bound; each fill's length (and so its length sub-score)
+    is computed arithmetically, and its keyword placement is checked where a slot comes before the
+    keyword. Fills over the 100-character limit are only used, smart-truncated, when no fill of a shape
+    fits, and only the best few fills of each shape are scored exactly. Shapes are visited best-bound first and
+    the search stops early once no remaining shape can beat the current top-k templates, or when the
+    time budget runs out. Returns up to top_k distinct (title, score) pairs, best first, one per
+    template where possible. Results are deterministic whenever the search finishes within its budget.
+    """
+    deadline = time.perf_counter() + time_budget
+    year = datetime.datetime.now().year
+
+    if power_words_list is None:
+        power_words_list = get_default_power_words()
+    matcher = get_power_matcher(power_words_list)
+    power_key = tuple(power_words_list)
+
+    theme = extract_core_theme(original_title, keyword)
+    if not theme or theme.lower() in ['guide', 'tutorial', 'video']:
+        theme_words = extract_keywords_from_title(original_title, top_n=3)
+        theme = ' '.join(theme_words[:3]) if theme_words else "Complete Guide"
+
+    # Components seen in the strongest competitors come first, then the defaults
+    competitor_titles = [c.get('title', '') for c in (competitor_data or [])[:3]]
+    power_words = _ordered_unique(
+        [w.upper() for t in competitor_titles for w in matcher.find_all(t)] + [w.upper() for w in power_words_list],
+        SEARCH_POWER_WORDS
+    )
+    numbers = _ordered_unique(
+        [n for t in competitor_titles for n in tokenize_title(t).numbers if n != str(year)] + ['5', '7', '10'],
+        SEARCH_NUMBERS
+    )
+    emojis = _ordered_unique([e for t in competitor_titles for e in tokenize_title(t).emojis] + VIRAL_EMOJIS, SEARCH_EMOJIS)
+
+    themes = _ordered_unique(
+        [(smart_truncate(theme.title(), n), smart_truncate(theme, n)) if n else (theme.title(), theme) for n in THEME_LENGTHS],
+        len(THEME_LENGTHS)
+    )
+
+    slot_values = {'power': power_words, 'number': numbers, 'emoji': emojis}
+    longest = {slot: max(map(len, values), default=0) for slot, values in slot_values.items()}
+    shapes = []
+    for t_index, template in enumerate(TITLE_TEMPLATES):
+        for v_index, (theme_title, theme_raw) in enumerate(themes):
+            fixed = template.format(kw=keyword.title(), theme=theme_title, theme_raw=theme_raw, year=year, power="", number="", emoji="")
+            # Filling a slot never makes the whitespace-collapsed title shorter than the collapsed empty shape
+            lengths = (len(' '.join(fixed.split())), len(fixed) + sum(n for slot, n in longest.items() if "{" + slot + "}" in template))
+            bound = _shape_bound(template, theme_title if "{theme}" in template else theme_raw, keyword, year, matcher, lengths, slot_values)
+            shapes.append((-bound, t_index, v_index, len(fixed)))
+    shapes.sort()
+
+    options = [
+        (p_index + n_index + e_index, power, number, emoji)
+        for p_index, power in enumerate(power_words or [""])
+        for n_index, number in enumerate(numbers)
+        for e_index, emoji in enumerate(emojis)
+    ]
+
+    found = {}
+    best_by_template = {}
+    for neg_bound, t_index, v_index, fixed_len in shapes:
+        bound = -neg_bound
+        leaders = sorted((entry[0] for entry in best_by_template.values()), reverse=True)
+        if len(leaders) >= top_k and bound < leaders[top_k - 1]:
+            break
+        if t_index in best_by_template and best_by_template[t_index][0] >= bound:
+            continue
+        if time.perf_counter() > deadline:
+            break
+
+        template = TITLE_TEMPLATES[t_index]
+        slots = [s for s in ("power", "number", "emoji") if "{" + s + "}" in template]
+        theme_title, theme_raw = themes[v_index]
+        # A slot before the keyword moves it (or can even start it, e.g. power word "BEST" for "best lofi")
+        placement_varies = keyword and any(template.index("{" + s + "}") < template.index("{kw}") for s in slots)
+        fills = []
+        for order, power, number, emoji in options:
+            parts = {'power': power, 'number': number, 'emoji': emoji}
+            title_len = fixed_len + sum(len(parts[s]) for s in slots)
+            partial = length_score(title_len)
+            if placement_varies:
+                title = template.format(kw=keyword.title(), theme=theme_title, theme_raw=theme_raw, year=year, power=power, number=number, emoji=emoji)
+                partial += keyword_score(' '.join(title.split()), keyword)
+            fills.append((title_len > TITLE_MAX_LENGTH, -partial, abs(title_len - 55), order, power, number, emoji))
+
+        # Over-long fills (e.g. for a very long keyword) only when nothing fits, shortest first
+        picks = heapq.nsmallest(CANDIDATES_PER_SHAPE, fills)
+        if not picks[0][0]:
+            picks = [p for p in picks if not p[0]]
+
+        for too_long, _, _, order, power, number, emoji in picks:
+            title = template.format(kw=keyword.title(), theme=theme_title, theme_raw=theme_raw, year=year, power=power, number=number, emoji=emoji)
+            title = ' '.join(title.split())
+            if too_long:
+                title = smart_truncate(title, TITLE_MAX_LENGTH)
+            if title in found:
+                continue
+            entry = (_exact_score(title, keyword, power_key), -abs(len(title) - 55), -t_index, -v_index, -order, title)
+            found[title] = entry
+            if t_index not in best_by_template or entry > best_by_template[t_index]:
+                best_by_template[t_index] = entry
+
+    # One title per template first, then the best of the rest if top_k asks for more
+    picked = sorted(best_by_template.values(), reverse=True)[:top_k]
+    rest = sorted((entry for entry in found.values() if entry not in picked), reverse=True)
+    picked.extend(rest[:top_k - len(picked)])
+    return [(entry[5], entry[0]) for entry in picked]
+
+@timed("generate.suggestions")
+def generate_smart_suggestions(original_title, keyword, api_key=None, competitor_data=None, power_words_list=None, top_k=5):
+    """Generate the highest-scoring suggestions that preserve the original title's theme"""
+    return [title for title, _ in search_title_candidates(original_title, keyword, competitor_data, power_words_list, top_k)]
@@ -0,0 +1,179 @@
+"""
+In-process timing spans and counters, exported as OpenMetrics text.
+
+    with span("keyword.statistics"):
+        ...
+    inc("api_calls", endpoint="search")
+
+Spans keep their count and total time plus a window of the most recent durations, from which
+p50/p95/p99 are computed. Set YT_SEO_METRICS_FILE to have the text rewritten periodically,
+and/or YT_SEO_METRICS_PORT to serve it at http://<host>:<port>/metrics.
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from .config import METRICS_FILE, METRICS_FILE_INTERVAL_SECONDS, METRICS_PORT, METRICS_WINDOW
+
+PREFIX = "yt_seo"
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Metrics:
+    """Thread-safe registry of spans and labelled counters"""
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._spans = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                entry = self._spans[name] = [0, 0.0, deque(maxlen=self.window)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2].append(seconds)
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def span_stats(self):
+        """{span: {'count', 'total', 'p50', 'p95', 'p99'}} with times in seconds"""
+        with self._lock:
+            spans = {name: (count, total, sorted(recent)) for name, (count, total, recent) in self._spans.items()}
+        stats = {}
+        for name, (count, total, recent) in sorted(spans.items()):
+            row = {'count': count, 'total': total}
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}"] = recent[min(len(recent) - 1, int(q * len(recent)))] if recent else 0.0
+            stats[name] = row
+        return stats
+
+    def counters(self):
+        """{(name, labels tuple): value}"""
+        with self._lock:
+            return dict(self._counters)
+
+    def to_openmetrics(self):
+        """Render every span as a summary and every counter as a counter in OpenMetrics text format"""
+        lines = []
+        spans = self.span_stats()
+        if spans:
+            lines.append(f"# TYPE {PREFIX}_span_seconds summary")
+            lines.append(f"# HELP {PREFIX}_span_seconds Wall time of instrumented stages (quantiles over the last {self.window} runs)")
+            for name, row in spans.items():
+                for q in QUANTILES:
+                    lines.append(f'{PREFIX}_span_seconds{{span="{name}",quantile="{q}"}} {row[f"p{int(q * 100)}"]:.6f}')
+                lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {row["total"]:.6f}')
+                lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {row["count"]}')
+
+        by_name = {}
+        for (name, labels), value in sorted(self.counters().items()):
+            by_name.setdefault(name, []).append((labels, value))
+        for name, series in by_name.items():
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for labels, value in series:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{PREFIX}_{name}_total{{{label_text}}} {value}" if label_text else f"{PREFIX}_{name}_total {value}")
+
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Atomically (re)write the OpenMetrics text to a file, e.g. for node_exporter's textfile collector"""
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.to_openmetrics())
+        os.replace(tmp, path)
+
+_metrics = Metrics()
+
+def get_metrics():
+    """One registry per process, shared by all sessions"""
+    return _metrics
+
+def span(name):
+    return _metrics.span(name)
+
+def inc(name, value=1, **labels):
+    _metrics.inc(name, value, **labels)
+
+def timed(name):
+    """Decorator recording every call of a function as a span"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _metrics.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+def _serve(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = _metrics.to_openmetrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+def _write_periodically(path, interval):
+    while True:
+        try:
+            _metrics.write(path)
+        except OSError:
+            pass
+        time.sleep(interval)
+
+def ensure_exporters(path=METRICS_FILE, port=METRICS_PORT, interval=METRICS_FILE_INTERVAL_SECONDS):
+    """Start (once per process) the configured metrics file writer and/or HTTP endpoint"""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    if path:
+        threading.Thread(target=_write_periodically, args=(path, interval), name="metrics-writer", daemon=True).start()
+    if port:
+        _serve(port)
@@ -0,0 +1,334 @@
+"""Power-word sources: the GitHub Gist database (via a local versioned store) and Gemini"""
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+from .config import (
+    FALLBACK_POWER_WORDS,
+    GEMINI_MAX_WORKERS,
+    GEMINI_MODEL,
+    GEMINI_NICHES,
+    GEMINI_WORDS_PATH,
+    GEMINI_WORDS_TTL_SECONDS,
+    POWER_WORDS_PATH,
+    POWER_WORDS_REFRESH_SECONDS,
+    REPLAY_FIXTURES,
+    URL_DATABASE_ONLINE,
+    set_default_power_words,
+)
+
+_gemini_models = {}
+_gemini_models_lock = threading.Lock()
+
+def _write_json(path, data):
+    """Write JSON through a temp file + rename, so readers never see a partial file"""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+class GeminiModel:
+    """
+    generate_content(prompt) -> response.text over a GenerativeServiceClient bound to one API key.
+    Calls the API client directly rather than through genai.GenerativeModel, whose client comes from
+    the process-wide genai.configure() key and so can bill one user's calls to another's key.
+    """
+    def __init__(self, api_key, model_name=GEMINI_MODEL):
+        from google.ai import generativelanguage as glm
+
+        self._glm = glm
+        self._client = glm.GenerativeServiceClient(client_options={'api_key': api_key})
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+
+    def generate_content(self, prompt):
+        glm = self._glm
+        response = self._client.generate_content(request=glm.GenerateContentRequest(
+            model=self.model_name,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+        ))
+        text = ''.join(part.text for candidate in response.candidates[:1] for part in candidate.content.parts)
+        return SimpleNamespace(text=text)
+
+def get_gemini_model(api_key):
+    """Gemini model for an API key, built once and reused"""
+    with _gemini_models_lock:
+        model = _gemini_models.get(api_key)
+        if model is None:
+            if REPLAY_FIXTURES:
+                from .replay import ReplayGemini
+                model = ReplayGemini.load(REPLAY_FIXTURES)
+            else:
+                model = GeminiModel(api_key)
+            _gemini_models[api_key] = model
+        return model
+
+def get_power_words_from_gemini(api_key, niche="general", model=None):
+    """
+    Get trending power words from Gemini API based on niche.
+    `model` can be any object with generate_content(prompt) -> response.text (e.g. replay.ReplayGemini).
+    """
+    if not api_key or len(api_key) < 30:
+        return None, "Invalid API Key"
+
+    try:
+        if model is None:
+            model = get_gemini_model(api_key)
+
+        prompt = f"""Generate 30 powerful, high-CTR words for YouTube video titles in the {niche} niche.
+        
+Requirements:
+- Words must be proven to increase click-through rates
+- Include a mix of: urgency words, power words, emotional triggers
+- Format: Return ONLY a JSON array of strings
+- No explanations, just the array
+
+Example format: ["ULTIMATE", "SECRET", "EXPOSED", "PROVEN", "SHOCKING"]
+
+Generate 30 words now:"""
+
+        response = model.generate_content(prompt)
+        text = response.text.strip()
+
+        # Extract JSON array
+        # Remove markdown code blocks if present
+        text = text.replace('```json', '').replace('```', '').strip()
+
+        words = json.loads(text)
+
+        if isinstance(words, list) and len(words) > 0:
+            return words, "🟢 Gemini AI"
+        else:
+            return None, "Invalid response"
+
+    except Exception as e:
+        return None, f"Error: {str(e)}"
+
+def load_power_words(url):
+    """Load power words from GitHub Gist"""
+    try:
+        import requests
+        response = requests.get(url, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list) and len(data) > 0:
+                return data, "🟢 GitHub Online"
+    except:
+        pass
+    return FALLBACK_POWER_WORDS, "🟠 Offline Fallback"
+
+class PowerWordStore:
+    """
+    Power words kept in a local JSON file that loads instantly, with no network.
+    refresh() re-checks the Gist with ETag / If-Modified-Since; a changed list bumps the version,
+    is written atomically and replaces the in-memory snapshot in one assignment, so readers
+    never see a half-updated list and never wait on the network.
+    """
+    def __init__(self, path=POWER_WORDS_PATH, url=URL_DATABASE_ONLINE):
+        self.path = path
+        self.url = url
+        self.last_error = None
+        self._refresh_lock = threading.Lock()
+        self._state = self._read()
+        self._fresh = False
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state.get('words'), list) and state['words']:
+                return state
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'version': 0, 'words': list(FALLBACK_POWER_WORDS), 'etag': None, 'last_modified': None, 'fetched_at': None}
+
+    @property
+    def version(self):
+        return self._state['version']
+
+    def current(self):
+        """Return (words, status) from the snapshot in memory"""
+        state = self._state
+        if not state['version']:
+            return state['words'], "🟠 Offline Fallback"
+        if self._fresh:
+            return state['words'], f"🟢 GitHub Online (v{state['version']})"
+        return state['words'], f"🟢 GitHub (local copy v{state['version']})"
+
+    def refresh(self, timeout=5):
+        """Conditionally re-fetch the Gist. Returns True if the word list changed"""
+        with self._refresh_lock:
+            state = self._state
+            headers = {}
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+
+            try:
+                import requests
+                response = requests.get(self.url, headers=headers, timeout=timeout)
+            except Exception as e:
+                self.last_error = str(e)
+                return False
+
+            if response.status_code == 304:
+                self._fresh = True
+                self.last_error = None
+                return False
+            if response.status_code != 200:
+                self.last_error = f"HTTP {response.status_code}"
+                return False
+
+            try:
+                words = response.json()
+            except ValueError:
+                words = None
+            if not isinstance(words, list) or not words:
+                self.last_error = "Invalid word list"
+                return False
+
+            changed = words != state['words'] or not state['version']
+            new_state = {
+                'version': state['version'] + 1 if changed else state['version'],
+                'words': words,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            }
+            _write_json(self.path, new_state)
+            self._state = new_state
+            self._fresh = True
+            self.last_error = None
+            if changed:
+                set_default_power_words(words)
+            return changed
+
+_power_word_store = None
+_power_word_store_lock = threading.Lock()
+_refresher_started = False
+
+def get_power_word_store():
+    """One store per process, shared by all sessions"""
+    global _power_word_store
+    with _power_word_store_lock:
+        if _power_word_store is None:
+            _power_word_store = PowerWordStore()
+        return _power_word_store
+
+def _refresh_forever(store, interval):
+    while True:
+        try:
+            store.refresh()
+        except Exception as e:
+            # e.g. a full disk while saving the new list; keep the thread alive for the next round
+            store.last_error = str(e)
+        time.sleep(interval)
+
+def ensure_power_word_refresher(interval=POWER_WORDS_REFRESH_SECONDS):
+    """Start (once per process) the background thread that keeps the store in sync with the Gist"""
+    global _refresher_started
+    store = get_power_word_store()
+    with _power_word_store_lock:
+        if _refresher_started:
+            return store
+        _refresher_started = True
+    threading.Thread(target=_refresh_forever, args=(store, interval), name="power-word-refresh", daemon=True).start()
+    return store
+
+class GeminiWordStore:
+    """
+    Gemini power words per niche, persisted to disk and shared across users and API keys.
+    Generation runs on a small worker pool; submit() returns at once with a Future, and a niche
+    that is already being generated is not requested twice. `model_factory(api_key)` can supply
+    a stub model for tests.
+    """
+    def __init__(self, path=GEMINI_WORDS_PATH, ttl=GEMINI_WORDS_TTL_SECONDS, max_workers=GEMINI_MAX_WORKERS, model_factory=None):
+        self.path = path
+        self.ttl = ttl
+        self.model_factory = model_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini-words")
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._errors = {}
+        self._niches = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, niche):
+        """Words for a niche, or None if never generated or older than the TTL"""
+        entry = self._niches.get(niche)
+        if not entry or time.time() - entry['generated_at'] > self.ttl:
+            return None
+        return entry['words']
+
+    def status(self, niche):
+        """'ready', 'pending', 'missing' or the last error message"""
+        with self._lock:
+            if niche in self._pending:
+                return "pending"
+            error = self._errors.get(niche)
+        if self.get(niche) is not None:
+            return "ready"
+        return error or "missing"
+
+    def submit(self, api_key, niche, force=False):
+        """Queue generation for a niche (unless fresh words exist). Returns a Future of (words, status)"""
+        with self._lock:
+            pending = self._pending.get(niche)
+            if pending is not None:
+                return pending
+            words = None if force else self.get(niche)
+            if words is not None:
+                done = Future()
+                done.set_result((words, "🟢 Gemini AI"))
+                return done
+            self._errors.pop(niche, None)
+            future = self._pending[niche] = self._executor.submit(self._generate, api_key, niche)
+        return future
+
+    def prefetch(self, api_key, niches=GEMINI_NICHES, force=False):
+        """Queue every niche; returns {niche: Future}"""
+        return {niche: self.submit(api_key, niche, force) for niche in niches}
+
+    def _generate(self, api_key, niche):
+        try:
+            model = self.model_factory(api_key) if self.model_factory else None
+            words, status = get_power_words_from_gemini(api_key, niche, model=model)
+            with self._lock:
+                if words:
+                    niches = dict(self._niches)
+                    niches[niche] = {'words': words, 'generated_at': time.time()}
+                    _write_json(self.path, niches)
+                    self._niches = niches
+                else:
+                    self._errors[niche] = status
+            return words, status
+        except Exception as e:
+            with self._lock:
+                self._errors[niche] = f"Error: {str(e)}"
+            return None, f"Error: {str(e)}"
+        finally:
+            with self._lock:
+                self._pending.pop(niche, None)
+
+_gemini_word_store = None
+
+def get_gemini_word_store():
+    """One store per process, shared by all sessions"""
+    global _gemini_word_store
+    with _power_word_store_lock:
+        if _gemini_word_store is None:
+            _gemini_word_store = GeminiWordStore()
+        return _gemini_word_store
@@ -0,0 +1,280 @@
+"""
+Quota budgeting for the YouTube Data API.
+
+Every API call goes through one QuotaScheduler, which
+  - charges the endpoint's unit cost to a persisted per-key ledger for the current quota day
+    (quotas reset at midnight Pacific time),
+  - rotates to the next key of the same group when one would go over its daily limit,
+  - paces calls with a token bucket and retries rate-limit/server errors with exponential backoff.
+
+Several keys can be given as one comma-separated string ("KEY1,KEY2"); they form a group that
+requests may rotate across. Keys are only ever stored as a short hash.
+"""
+import datetime
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .config import (
+    QUOTA_BACKOFF_SECONDS,
+    QUOTA_BURST,
+    QUOTA_COST,
+    QUOTA_DAILY_LIMIT,
+    QUOTA_DB_PATH,
+    QUOTA_MAX_RETRIES,
+    QUOTA_RATE_PER_SECOND,
+)
+from .metrics import get_metrics
+
+KEY_PARAM_RE = re.compile(r'([?&]key=)([^&]*)')
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError', 'internalError'}
+EXHAUSTED_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+
+class QuotaExceededError(Exception):
+    """Raised when no key of a group has enough quota left today for a call"""
+
+def parse_api_keys(api_key):
+    """Split a comma/whitespace separated key string into unique keys, in order"""
+    keys = []
+    for key in re.split(r'[\s,]+', api_key or ""):
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+def key_id(api_key):
+    """Stable short hash used to store a key in the ledger"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+def quota_day(ts=None):
+    """Current quota day (YouTube resets quotas at midnight Pacific time)"""
+    from zoneinfo import ZoneInfo
+    return datetime.datetime.fromtimestamp(ts or time.time(), ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d")
+
+def endpoint_name(request):
+    """Resource name of a googleapiclient request, from its method ID (e.g. 'youtube.search.list' -> 'search')"""
+    parts = (getattr(request, 'methodId', None) or "").split('.')
+    return parts[1] if len(parts) > 2 else "unknown"
+
+def endpoint_cost(request):
+    """Quota units of a googleapiclient request"""
+    return QUOTA_COST.get(endpoint_name(request), 1)
+
+class QuotaLedger:
+    """Units spent per key and quota day, persisted in SQLite and shared by every process on the host"""
+    def __init__(self, path=QUOTA_DB_PATH):
+        self.path = path
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS spend (
+                key_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                units INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                PRIMARY KEY (key_id, day)
+            )""")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def try_spend(self, kid, units, limit):
+        """Charge units to a key unless that would take it over the limit. Returns True if charged"""
+        day = quota_day()
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO spend VALUES (?, ?, 0, 0)", (kid, day))
+            cur = conn.execute(
+                "UPDATE spend SET units = units + ?, calls = calls + 1 WHERE key_id = ? AND day = ? AND units + ? <= ?",
+                (units, kid, day, units, limit)
+            )
+            return cur.rowcount == 1
+
+    def exhaust(self, kid, limit):
+        """Mark a key as spent for today (the API said so, whatever the ledger thought)"""
+        day = quota_day()
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO spend VALUES (?, ?, 0, 0)", (kid, day))
+            conn.execute("UPDATE spend SET units = MAX(units, ?) WHERE key_id = ? AND day = ?", (limit, kid, day))
+
+    def spent(self, kid, day=None):
+        """Return (units, calls) charged to a key on a quota day"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT units, calls FROM spend WHERE key_id = ? AND day = ?", (kid, day or quota_day())).fetchone()
+        return row or (0, 0)
+
+class TokenBucket:
+    """Blocking token bucket: `rate` calls per second on average, bursts of up to `capacity`"""
+    def __init__(self, rate=QUOTA_RATE_PER_SECOND, capacity=QUOTA_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """Take a token if one is available (returns 0), else return the seconds until the next one"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        wait = self._take()
+        while wait:
+            time.sleep(wait)
+            wait = self._take()
+
+    async def acquire_async(self):
+        import asyncio
+
+        wait = self._take()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._take()
+
+def _error_reason(e):
+    """Status code and first error reason of a googleapiclient HttpError"""
+    status = getattr(getattr(e, 'resp', None), 'status', None)
+    try:
+        content = e.content.decode('utf-8') if isinstance(e.content, bytes) else e.content
+        errors = json.loads(content).get('error', {}).get('errors', [])
+        reason = errors[0].get('reason', '') if errors else ''
+    except (AttributeError, ValueError, TypeError):
+        reason = ''
+    return int(status) if status else None, reason
+
+def _transient_errors():
+    """Network errors worth retrying (httplib2 is only imported when a real call is made)"""
+    try:
+        import httplib2
+        return (OSError, httplib2.HttpLib2Error)
+    except ImportError:
+        return (OSError,)
+
+class QuotaScheduler:
+    """Single gate for YouTube API calls: budget, key rotation, pacing and retries"""
+    def __init__(self, ledger=None, daily_limit=QUOTA_DAILY_LIMIT, bucket=None,
+                 max_retries=QUOTA_MAX_RETRIES, backoff=QUOTA_BACKOFF_SECONDS):
+        self.ledger = ledger or QuotaLedger()
+        self.daily_limit = daily_limit
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def register_keys(self, api_key):
+        """Let calls made with any key of a comma-separated group rotate across the whole group"""
+        keys = parse_api_keys(api_key)
+        with self._lock:
+            for key in keys:
+                self._groups[key] = keys
+        return keys
+
+    def _candidates(self, key):
+        with self._lock:
+            group = self._groups.get(key, [key])
+        start = group.index(key) if key in group else 0
+        return group[start:] + group[:start]
+
+    def _reserve(self, key, cost):
+        """Pick the first key of the group (starting with the request's own) that can afford the call"""
+        for candidate in self._candidates(key):
+            if self.ledger.try_spend(key_id(candidate), cost, self.daily_limit):
+                return candidate
+        return None
+
+    def reserve(self, key, endpoint):
+        """Charge one call to an endpoint for clients that send their own requests. Returns the key to send it with"""
+        chosen = self._reserve(key, QUOTA_COST.get(endpoint, 1))
+        if chosen is None:
+            raise QuotaExceededError(f"Daily quota budget of {self.daily_limit:,} units used up for every key")
+        return chosen
+
+    def exhaust(self, key):
+        """Mark a key as spent for today (the API said so, whatever the ledger thought)"""
+        self.ledger.exhaust(key_id(key), self.daily_limit)
+
+    def execute(self, request, send):
+        """Charge, pace and send a request with `send(request)`, retrying transient failures"""
+        from googleapiclient.errors import HttpError
+
+        endpoint = endpoint_name(request)
+        cost = endpoint_cost(request)
+        metrics = get_metrics()
+        uri = getattr(request, 'uri', None)
+        match = KEY_PARAM_RE.search(uri) if uri else None
+        key = match.group(2) if match else None
+        transient = _transient_errors()
+
+        attempt = 0
+        while True:
+            if key is not None:
+                chosen = self._reserve(key, cost)
+                if chosen is None:
+                    raise QuotaExceededError(f"Daily quota budget of {self.daily_limit:,} units used up for every key")
+                if chosen != key:
+                    request.uri = KEY_PARAM_RE.sub(lambda m: m.group(1) + chosen, request.uri, count=1)
+                    key = chosen
+
+            self.bucket.acquire()
+            metrics.inc("api_calls", endpoint=endpoint)
+            metrics.inc("quota_units", cost, endpoint=endpoint)
+            try:
+                with metrics.span(f"api.{endpoint}"):
+                    return send(request)
+            except HttpError as e:
+                status, reason = _error_reason(e)
+                if reason in EXHAUSTED_REASONS and key is not None:
+                    # Moving on to the next key is not a retry; _reserve ends the loop once none is left
+                    self.ledger.exhaust(key_id(key), self.daily_limit)
+                    continue
+                if attempt == self.max_retries or (status not in RETRY_STATUSES and reason not in RETRY_REASONS):
+                    raise
+            except transient:
+                if attempt == self.max_retries:
+                    raise
+            metrics.inc("api_retries", endpoint=endpoint)
+            time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+            attempt += 1
+
+    def spend(self, api_key):
+        """Today's (key suffix, units, calls) for each key of a comma-separated group"""
+        return [(key[-4:], *self.ledger.spent(key_id(key))) for key in parse_api_keys(api_key)]
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_quota_scheduler():
+    """One scheduler per process, shared by all sessions"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler()
+        return _scheduler
+
+def set_quota_scheduler(scheduler):
+    """Replace the process-wide scheduler (e.g. an unthrottled one for benchmarks)"""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -0,0 +1,256 @@
+"""
+Offline stand-ins for the YouTube Data API and Gemini, driven by recorded fixtures.
+
+A fixture file is one JSON object:
+    {"search": {"<query>": [search hits in result order]},
+     "videos": {"<video id>": videos().list item},
+     "channels": {"<channel id or handle>": channels().list item},
+     "playlistItems": {"<playlist id>": [playlist items, newest first]},
+     "gemini": {"<niche>": ["POWER", "WORDS"]}}
+
+Record one from the live APIs with `python -m youtube_seo record ...`, or build a synthetic one
+with synthetic_fixtures(). Setting YT_SEO_REPLAY_FIXTURES=<file> makes the app and the CLI
+use the replay clients instead of the network.
+"""
+import json
+import random
+import threading
+from collections import Counter
+
+# --- SYNTHETIC DATA ---
+TOPIC_WORDS = [
+    "lofi", "beats", "piano", "rain", "sleep", "study", "music", "jazz", "chill", "relaxing", "meditation",
+    "guitar", "cooking", "recipe", "workout", "gaming", "minecraft", "review", "unboxing", "iphone", "travel",
+    "vlog", "budget", "investing", "crypto", "python", "coding", "tutorial", "makeup", "skincare", "fitness",
+    "yoga", "podcast", "news", "football", "highlights", "anime", "movie", "trailer", "reaction", "lullaby",
+]
+TITLE_POWER_WORDS = ["best", "ultimate", "secret", "proven", "easy", "complete", "amazing", "perfect", "simple", "advanced"]
+TITLE_EMOJIS = ["🔥", "😱", "✅", "🎵", "🚀", "💯", "🌙", "✨", "🎹", "⭐"]
+TITLE_SHAPES = [
+    "{topic} {topic2} {power} {year}",
+    "{n} {power} {topic} Tips You Need {emoji}",
+    "How to {topic} {topic2} ({year}) {emoji}",
+    "{topic} | {topic2} {topic3} for {hours} Hours",
+    "{power} {topic} Guide - {topic2} {topic3} Explained",
+    "I Tried {topic} for {n} Days... {emoji}",
+    "{topic} {topic2}",
+]
+
+def synthetic_titles(n, seed=0):
+    """n deterministic, realistic-looking video titles"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        shape = rng.choice(TITLE_SHAPES)
+        title = shape.format(
+            topic=rng.choice(TOPIC_WORDS).title(),
+            topic2=rng.choice(TOPIC_WORDS),
+            topic3=rng.choice(TOPIC_WORDS),
+            power=rng.choice(TITLE_POWER_WORDS).title() if rng.random() < 0.6 else "",
+            year=rng.choice([2023, 2024, 2025, 2026]),
+            n=rng.choice([3, 5, 7, 10, 21]),
+            hours=rng.choice([1, 3, 8, 10]),
+            emoji=rng.choice(TITLE_EMOJIS) if rng.random() < 0.5 else "",
+        )
+        titles.append(' '.join(title.split()))
+    return titles
+
+def synthetic_fixtures(keywords, videos_per_keyword=200, seed=0, titles=None):
+    """Fixture data for a set of keywords, with search hits, video stats and tags drawn from one RNG"""
+    rng = random.Random(seed)
+    titles = titles or synthetic_titles(len(keywords) * videos_per_keyword, seed)
+    fixtures = {'search': {}, 'videos': {}, 'channels': {}, 'playlistItems': {}, 'gemini': {}}
+
+    for k, keyword in enumerate(keywords):
+        hits = []
+        for i in range(videos_per_keyword):
+            vid = f"v{k:04d}{i:05d}"
+            title = titles[(k * videos_per_keyword + i) % len(titles)]
+            views = int(rng.lognormvariate(10, 2))
+            published = f"{rng.choice([2023, 2024, 2025])}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+            snippet = {
+                'title': title,
+                'channelTitle': f"Channel {rng.randint(1, 500)}",
+                'publishedAt': published,
+                'tags': rng.sample(TOPIC_WORDS, rng.randint(0, 12)) + [keyword.lower()],
+            }
+            fixtures['videos'][vid] = {
+                'id': vid,
+                'snippet': snippet,
+                'statistics': {
+                    'viewCount': str(views),
+                    'likeCount': str(int(views * rng.uniform(0, 0.08))),
+                    'commentCount': str(int(views * rng.uniform(0, 0.01))),
+                },
+                'contentDetails': {'duration': f"PT{rng.randint(1, 59)}M{rng.randint(0, 59)}S"},
+            }
+            hits.append({'id': {'kind': 'youtube#video', 'videoId': vid}, 'snippet': {'title': title, 'channelTitle': snippet['channelTitle']}})
+        fixtures['search'][keyword.strip().lower()] = hits
+
+    for niche in ("general", "gaming", "tech", "cooking", "music", "fitness", "education", "entertainment", "business", "lifestyle"):
+        fixtures['gemini'][niche] = [w.upper() for w in rng.sample(TITLE_POWER_WORDS + TOPIC_WORDS, 30)]
+    return fixtures
+
+def load_fixtures(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_fixtures(fixtures, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, ensure_ascii=False)
+
+# --- YOUTUBE ---
+class _ReplayRequest:
+    """Looks like a googleapiclient HttpRequest; has no uri, so the quota ledger is left untouched"""
+    def __init__(self, handler, resource, params):
+        self._handler = handler
+        self._params = params
+        self.methodId = f"youtube.{resource}.list"
+
+    def execute(self, http=None, num_retries=0):
+        return self._handler(self._params)
+
+class _ReplayResource:
+    def __init__(self, handler, name):
+        self._handler = handler
+        self._name = name
+
+    def list(self, **params):
+        return _ReplayRequest(self._handler, self._name, params)
+
+def _page(items, params):
+    start = int(params.get('pageToken') or 0)
+    size = int(params.get('maxResults') or 5)
+    res = {'items': items[start:start + size], 'pageInfo': {'totalResults': len(items), 'resultsPerPage': size}}
+    if start + size < len(items):
+        res['nextPageToken'] = str(start + size)
+    return res
+
+class ReplayYouTube:
+    """Drop-in for the googleapiclient YouTube resource that answers from fixtures"""
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        return cls(load_fixtures(path))
+
+    def _count(self, resource):
+        with self._lock:
+            self.calls[resource] += 1
+
+    def _search(self, params):
+        self._count('search')
+        return _page(self.fixtures.get('search', {}).get((params.get('q') or "").strip().lower(), []), params)
+
+    def _videos(self, params):
+        self._count('videos')
+        known = self.fixtures.get('videos', {})
+        return {'items': [known[vid] for vid in params.get('id', '').split(',') if vid in known]}
+
+    def _channels(self, params):
+        self._count('channels')
+        item = self.fixtures.get('channels', {}).get(params.get('id') or params.get('forHandle') or "")
+        return {'items': [item] if item else []}
+
+    def _playlist_items(self, params):
+        self._count('playlistItems')
+        return _page(self.fixtures.get('playlistItems', {}).get(params.get('playlistId'), []), params)
+
+    def search(self):
+        return _ReplayResource(self._search, 'search')
+
+    def videos(self):
+        return _ReplayResource(self._videos, 'videos')
+
+    def channels(self):
+        return _ReplayResource(self._channels, 'channels')
+
+    def playlistItems(self):
+        return _ReplayResource(self._playlist_items, 'playlistItems')
+
+class _RecordedRequest:
+    """Wraps a live HttpRequest and stores its response in the recorder's fixtures"""
+    def __init__(self, recorder, resource, params, request):
+        self._recorder = recorder
+        self._resource = resource
+        self._params = params
+        self._request = request
+        self.methodId = getattr(request, 'methodId', f"youtube.{resource}.list")
+
+    @property
+    def uri(self):
+        return self._request.uri
+
+    @uri.setter
+    def uri(self, value):
+        self._request.uri = value
+
+    def execute(self, http=None, num_retries=0):
+        res = self._request.execute(http=http, num_retries=num_retries)
+        self._recorder.record(self._resource, self._params, res)
+        return res
+
+class _RecordedResource:
+    def __init__(self, recorder, name, resource):
+        self._recorder = recorder
+        self._name = name
+        self._resource = resource
+
+    def list(self, **params):
+        return _RecordedRequest(self._recorder, self._name, params, self._resource.list(**params))
+
+class RecordingYouTube:
+    """Wraps a live YouTube client and records every response into fixture form"""
+    def __init__(self, client, fixtures=None):
+        self.client = client
+        self.fixtures = fixtures or {'search': {}, 'videos': {}, 'channels': {}, 'playlistItems': {}, 'gemini': {}}
+        self._lock = threading.Lock()
+
+    def record(self, resource, params, res):
+        items = res.get('items', [])
+        with self._lock:
+            if resource == 'search':
+                hits = self.fixtures['search'].setdefault((params.get('q') or "").strip().lower(), [])
+                known = {hit['id'].get('videoId') for hit in hits}
+                hits.extend(item for item in items if item.get('id', {}).get('videoId') not in known)
+            elif resource == 'videos':
+                self.fixtures['videos'].update((item['id'], item) for item in items)
+            elif resource == 'channels':
+                for item in items:
+                    self.fixtures['channels'][params.get('id') or params.get('forHandle') or item['id']] = item
+            elif resource == 'playlistItems':
+                self.fixtures['playlistItems'].setdefault(params.get('playlistId'), []).extend(items)
+
+    def search(self):
+        return _RecordedResource(self, 'search', self.client.search())
+
+    def videos(self):
+        return _RecordedResource(self, 'videos', self.client.videos())
+
+    def channels(self):
+        return _RecordedResource(self, 'channels', self.client.channels())
+
+    def playlistItems(self):
+        return _RecordedResource(self, 'playlistItems', self.client.playlistItems())
+
+# --- GEMINI ---
+class _ReplayResponse:
+    def __init__(self, text):
+        self.text = text
+
+class ReplayGemini:
+    """Stand-in for google.generativeai.GenerativeModel that answers power-word prompts from fixtures"""
+    def __init__(self, fixtures):
+        self.words = fixtures.get('gemini', {})
+
+    @classmethod
+    def load(cls, path):
+        return cls(load_fixtures(path))
+
+    def generate_content(self, prompt):
+        niche = next((n for n in self.words if f"in the {n} niche" in prompt), None)
+        words = self.words.get(niche) or self.words.get('general') or []
+        return _ReplayResponse(json.dumps(words))
@@ -0,0 +1,260 @@
+"""
+Tag co-occurrence index built from every video the app fetches.
+
+SQLite holds the durable, incrementally updated counts:
+    tags          per tag: videos using it and their summed weight
+    pairs         per tag pair (a < b): videos using both and their summed weight
+    keyword_tags  per (keyword, tag): videos found for the keyword that use the tag
+A video's weight is log1p(views), so popular videos count more without drowning the rest.
+Each video is counted once for the tag pairs, and once per keyword it was found for.
+
+Lookups read only the rows they need: a tag's neighbours come from the pairs primary key (a) and
+its index on b, so they cost the same however large the index grows and always see every process's
+writes. Past TAG_INDEX_MAX_PAIRS pairs, the lightest ones (least view-weighted evidence) are dropped.
+"""
+import math
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .config import TAG_INDEX_MAX_PAIRS, TAG_INDEX_MAX_TAGS_PER_VIDEO, TAG_INDEX_PATH
+from .metrics import span
+
+def normalize_tag(tag):
+    return ' '.join(str(tag).lower().split())
+
+class TagIndex:
+    """Persistent tag-to-tag and tag-to-keyword counts with fast related-tag lookups"""
+    def __init__(self, path=TAG_INDEX_PATH, max_tags_per_video=TAG_INDEX_MAX_TAGS_PER_VIDEO, max_pairs=TAG_INDEX_MAX_PAIRS):
+        self.path = path
+        self.max_tags_per_video = max_tags_per_video
+        self.max_pairs = max_pairs
+        self._lock = threading.Lock()
+        # Counting pairs scans the table, so it is only done after about 5% of the cap has been written
+        self._prune_every = max(max_pairs // 20, 1)
+        self._unchecked_pairs = self._prune_every
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY,
+                tag TEXT UNIQUE NOT NULL,
+                videos INTEGER NOT NULL DEFAULT 0,
+                weight REAL NOT NULL DEFAULT 0
+            )""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS pairs (
+                a INTEGER NOT NULL,
+                b INTEGER NOT NULL,
+                videos INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (a, b)
+            ) WITHOUT ROWID""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pairs_b ON pairs(b)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS keyword_tags (
+                keyword TEXT NOT NULL,
+                tag INTEGER NOT NULL,
+                videos INTEGER NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (keyword, tag)
+            ) WITHOUT ROWID""")
+            conn.execute("CREATE TABLE IF NOT EXISTS videos (video_id TEXT PRIMARY KEY) WITHOUT ROWID")
+            conn.execute("""CREATE TABLE IF NOT EXISTS keyword_videos (
+                keyword TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                PRIMARY KEY (keyword, video_id)
+            ) WITHOUT ROWID""")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_videos(self, keyword, video_items):
+        """Fold videos().list items found for a keyword into the index. Returns how many videos were new"""
+        keyword = normalize_tag(keyword or "")
+        entries = []
+        for item in video_items:
+            vid = item.get('id')
+            tags = list(dict.fromkeys(normalize_tag(t) for t in item.get('snippet', {}).get('tags', []) if str(t).strip()))
+            if vid and tags:
+                views = int(item.get('statistics', {}).get('viewCount', 0) or 0)
+                entries.append((vid, tags[:self.max_tags_per_video], math.log1p(views)))
+        if not entries:
+            return 0
+
+        with span("tag_index.add"), self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO tags (tag) VALUES (?)", [(t,) for _, tags, _ in entries for t in tags])
+            all_tags = list({t for _, tags, _ in entries for t in tags})
+            ids = {}
+            for start in range(0, len(all_tags), 500):
+                chunk = all_tags[start:start + 500]
+                rows = conn.execute(f"SELECT tag, id FROM tags WHERE tag IN ({','.join('?' * len(chunk))})", chunk)
+                ids.update(rows)
+
+            new_videos = 0
+            tag_rows, pair_rows, keyword_rows = [], [], []
+            for vid, tags, weight in entries:
+                tag_ids = sorted(ids[t] for t in tags)
+                if conn.execute("INSERT OR IGNORE INTO videos VALUES (?)", (vid,)).rowcount:
+                    new_videos += 1
+                    tag_rows.extend((weight, tid) for tid in tag_ids)
+                    pair_rows.extend((a, b, weight) for i, a in enumerate(tag_ids) for b in tag_ids[i + 1:])
+                if keyword and conn.execute("INSERT OR IGNORE INTO keyword_videos VALUES (?, ?)", (keyword, vid)).rowcount:
+                    keyword_rows.extend((keyword, tid, weight) for tid in tag_ids)
+
+            conn.executemany("UPDATE tags SET videos = videos + 1, weight = weight + ? WHERE id = ?", tag_rows)
+            conn.executemany("""INSERT INTO pairs VALUES (?, ?, 1, ?)
+                ON CONFLICT (a, b) DO UPDATE SET videos = videos + 1, weight = weight + excluded.weight""", pair_rows)
+            conn.executemany("""INSERT INTO keyword_tags VALUES (?, ?, 1, ?)
+                ON CONFLICT (keyword, tag) DO UPDATE SET videos = videos + 1, weight = weight + excluded.weight""", keyword_rows)
+
+            with self._lock:
+                self._unchecked_pairs += len(pair_rows)
+                check = self._unchecked_pairs >= self._prune_every
+                if check:
+                    self._unchecked_pairs = 0
+            if check:
+                self._prune(conn)
+        return new_videos
+
+    def _prune(self, conn):
+        """Drop the lightest pairs once there are more than max_pairs, down to 90% of it"""
+        count = conn.execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+        if count <= self.max_pairs:
+            return 0
+        with span("tag_index.prune"):
+            cutoff = conn.execute("SELECT weight, a, b FROM pairs ORDER BY weight, a, b LIMIT 1 OFFSET ?",
+                                  (count - int(self.max_pairs * 0.9),)).fetchone()
+            return conn.execute("DELETE FROM pairs WHERE (weight, a, b) < (?, ?, ?)", cutoff).rowcount
+
+    def _tag_ids(self, conn, tags):
+        """{normalized tag: (id, weight)} for the tags the index knows"""
+        tags = list(dict.fromkeys(normalize_tag(t) for t in tags))
+        found = {}
+        for start in range(0, len(tags), 500):
+            chunk = tags[start:start + 500]
+            rows = conn.execute(f"SELECT tag, id, weight FROM tags WHERE tag IN ({','.join('?' * len(chunk))})", chunk)
+            found.update((tag, (tid, weight)) for tag, tid, weight in rows)
+        return found
+
+    def related(self, tag, k=10):
+        """Top-k tags used together with a tag, as (tag, cosine similarity) pairs"""
+        import numpy as np
+
+        with span("tag_index.related"), self._connect() as conn:
+            found = self._tag_ids(conn, [tag]).get(normalize_tag(tag))
+            if found is None:
+                return []
+            tid, tag_weight = found
+            rows = conn.execute("""SELECT t.tag, p.weight, t.weight FROM (
+                    SELECT b AS other, weight FROM pairs WHERE a = ?
+                    UNION ALL SELECT a, weight FROM pairs WHERE b = ?
+                ) p JOIN tags t ON t.id = p.other""", (tid, tid)).fetchall()
+        if not rows:
+            return []
+
+        pair_weight = np.fromiter((r[1] for r in rows), dtype='float64', count=len(rows))
+        other_weight = np.fromiter((r[2] for r in rows), dtype='float64', count=len(rows))
+        scores = pair_weight / ((tag_weight * other_weight) ** 0.5 + 1e-9)
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(rows[i][0], float(scores[i])) for i in top]
+
+    def keyword_tags(self, keyword, k=None):
+        """Tags of the videos found for a keyword with their share of those videos (0..1), best first"""
+        keyword = normalize_tag(keyword or "")
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM keyword_videos WHERE keyword = ?", (keyword,)).fetchone()[0]
+            if not total:
+                return []
+            rows = conn.execute(
+                "SELECT t.tag, k.videos FROM keyword_tags k JOIN tags t ON t.id = k.tag WHERE k.keyword = ? ORDER BY k.videos DESC, k.weight DESC"
+                + (" LIMIT ?" if k else ""),
+                (keyword, k) if k else (keyword,)
+            ).fetchall()
+        return [(tag, videos / total) for tag, videos in rows]
+
+    def rank(self, candidates, keyword=None, context=()):
+        """
+        Order candidate tags by relevance: their share of the keyword's videos plus their mean
+        co-occurrence similarity with the context tags. Tags without evidence keep their input order, last.
+        """
+        candidates = list(dict.fromkeys(candidates))
+        if not candidates:
+            return []
+
+        keyword_share = dict(self.keyword_tags(keyword)) if keyword else {}
+        context = {normalize_tag(c) for c in context}
+        scores = [keyword_share.get(normalize_tag(tag), 0.0) for tag in candidates]
+        if context:
+            with span("tag_index.rank"), self._connect() as conn:
+                found = self._tag_ids(conn, [*candidates, *context])
+                context_ids = {found[t][0] for t in context if t in found}
+                candidate_ids = {found[t][0] for t in map(normalize_tag, candidates) if t in found}
+                similarity = self._pair_similarity(conn, candidate_ids, context_ids, {tid: w for tid, w in found.values()})
+            for i, tag in enumerate(candidates):
+                tid = found.get(normalize_tag(tag), (None,))[0]
+                if tid is not None:
+                    scores[i] += sum(similarity.get((tid, other), 0.0) for other in context_ids) / len(context_ids)
+
+        order = sorted(range(len(candidates)), key=lambda i: -scores[i])
+        return [candidates[i] for i in order]
+
+    def _pair_similarity(self, conn, candidate_ids, context_ids, tag_weight):
+        """{(candidate, context tag): cosine similarity} for the pairs stored between the two sets"""
+        similarity = {}
+        if not candidate_ids or not context_ids:
+            return similarity
+        ids = sorted(candidate_ids | context_ids)
+        marks = ','.join('?' * len(ids))
+        for a, b, weight in conn.execute(f"SELECT a, b, weight FROM pairs WHERE a IN ({marks}) AND b IN ({marks})", ids + ids):
+            cosine = weight / ((tag_weight[a] * tag_weight[b]) ** 0.5 + 1e-9)
+            if a in candidate_ids and b in context_ids:
+                similarity[(a, b)] = cosine
+            if b in candidate_ids and a in context_ids:
+                similarity[(b, a)] = cosine
+        return similarity
+
+    def stats(self):
+        with self._connect() as conn:
+            tags, pairs, videos = (conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("tags", "pairs", "videos"))
+        return {'tags': tags, 'pairs': pairs, 'videos': videos}
+
+_tag_index = None
+_tag_index_lock = threading.Lock()
+_index_pool = None
+
+def get_tag_index():
+    """One index per process, shared by all sessions"""
+    global _tag_index
+    with _tag_index_lock:
+        if _tag_index is None:
+            _tag_index = TagIndex()
+        return _tag_index
+
+def _index_videos(keyword, video_items):
+    from .dedup import get_title_corpus
+
+    get_tag_index().add_videos(keyword, video_items)
+    get_title_corpus().add_videos(video_items)
+
+def index_videos_later(keyword, video_items):
+    """Fold freshly fetched videos into the tag index and the title corpus on a background thread"""
+    global _index_pool
+    with _tag_index_lock:
+        if _index_pool is None:
+            _index_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tag-index")
+    return _index_pool.submit(_index_videos, keyword, list(video_items))
@@ -0,0 +1,227 @@
+"""Title parsing helpers and the compiled power-word matcher"""
+import re
+from collections import Counter
+from functools import lru_cache
+
+from .config import STOP_WORDS, VIRAL_EMOJIS
+
+WORD_RE = re.compile(r'\b\w+\b')
+ASCII_WORD_RE = re.compile(r'[a-z]{3,}')
+NUMBER_RE = re.compile(r'\d+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+LEADING_SYMBOLS_RE = re.compile(r'^[^a-zA-Z0-9]+')
+SPACES_RE = re.compile(r'\s+')
+EDGE_SEPARATORS_RE = re.compile(r'^[:\-\|,\.\s]+|[:\-\|,\.\s]+$')
+
+class TitleTokens:
+    """
+    A title parsed once. The scoring and generation helpers all read the same instance
+    (see tokenize_title), so a title is lowercased and split a single time however many of them run.
+    Each view is computed on first access.
+    """
+    __slots__ = ('title', 'lower', '_words', '_content_words', '_clean_words', '_numbers', '_emojis', '_start', '_keyword_counts')
+
+    def __init__(self, title):
+        self.title = title
+        self.lower = title.lower()
+        self._words = self._content_words = self._clean_words = None
+        self._numbers = self._emojis = self._start = self._keyword_counts = None
+
+    @property
+    def words(self):
+        """Word tokens of the lowercased title"""
+        if self._words is None:
+            self._words = WORD_RE.findall(self.lower)
+        return self._words
+
+    @property
+    def content_words(self):
+        """Word tokens without stop words"""
+        if self._content_words is None:
+            self._content_words = [w for w in self.words if w not in STOP_WORDS]
+        return self._content_words
+
+    @property
+    def clean_words(self):
+        """Whitespace-split lowercased title with punctuation dropped ("don't" -> "dont")"""
+        if self._clean_words is None:
+            self._clean_words = PUNCTUATION_RE.sub('', self.lower).split()
+        return self._clean_words
+
+    @property
+    def numbers(self):
+        if self._numbers is None:
+            self._numbers = NUMBER_RE.findall(self.title)
+        return self._numbers
+
+    @property
+    def emojis(self):
+        """VIRAL_EMOJIS found in the title, in list order"""
+        if self._emojis is None:
+            self._emojis = [e for e in VIRAL_EMOJIS if e in self.title]
+        return self._emojis
+
+    @property
+    def start(self):
+        """Lowercased title from its first letter or digit"""
+        if self._start is None:
+            self._start = LEADING_SYMBOLS_RE.sub('', self.lower).strip()
+        return self._start
+
+    @property
+    def keyword_counts(self):
+        """Counter of content words of 3+ ASCII letters"""
+        if self._keyword_counts is None:
+            self._keyword_counts = Counter(w for w in self.content_words if ASCII_WORD_RE.fullmatch(w))
+        return self._keyword_counts
+
+    def keyword_position(self, keyword):
+        """Index of the keyword in the title (case-insensitive), -1 if absent"""
+        return self.lower.find(keyword.lower())
+
+@lru_cache(maxsize=4096)
+def tokenize_title(title):
+    """Shared TitleTokens for a title (bounded LRU, so repeated titles are parsed once)"""
+    return TitleTokens(title or "")
+
+@lru_cache(maxsize=256)
+def keyword_pattern(keyword):
+    """Compiled case-insensitive literal pattern for a keyword"""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+def extract_core_theme(title, keyword):
+    """
+    Extract the actual theme/context from the title
+    This preserves the original meaning while removing only the keyword
+    """
+    if not title:
+        return ""
+
+    # Remove keyword but keep the rest intact
+    if keyword:
+        core = keyword_pattern(keyword).sub("", title).strip()
+    else:
+        core = title
+
+    core = EDGE_SEPARATORS_RE.sub('', SPACES_RE.sub(' ', core))
+
+    if not core or len(core) < 3:
+        kw_lower = keyword.lower() if keyword else None
+        meaningful = [w for w in tokenize_title(title).content_words if w != kw_lower]
+
+        if meaningful:
+            core = ' '.join(meaningful[:5])
+        else:
+            core = "Guide"
+
+    return core.strip()
+
+def smart_truncate(text, max_length):
+    """Smart text truncation at word boundaries"""
+    if not text or len(text) <= max_length:
+        return text
+
+    truncated = text[:max_length-3]
+    last_space = truncated.rfind(' ')
+    if last_space > 0:
+        truncated = truncated[:last_space]
+    return truncated + "..."
+
+def extract_keywords_from_title(title, top_n=5):
+    """Extract important keywords from title"""
+    if not title:
+        return []
+    return [word for word, _ in tokenize_title(title).keyword_counts.most_common(top_n)]
+
+class PowerWordMatcher:
+    """
+    Aho-Corasick automaton over a power-word list.
+    find_all() returns exactly what `[pw for pw in words if pw.lower() in text.lower()]` would,
+    in a single pass over the text instead of one substring scan per word.
+    """
+    def __init__(self, words):
+        self.words = list(words)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._always = []  # empty strings are substrings of every title
+        self._terminal = set()
+        self._regex = None
+
+        for idx, word in enumerate(self.words):
+            pattern = str(word).lower()
+            if not pattern:
+                self._always.append(idx)
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (idx,)
+            self._terminal.add(node)
+
+        # Breadth-first pass to link each node to its longest proper suffix in the trie
+        frontier = list(self._goto[0].values())
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for ch, child in self._goto[node].items():
+                    fallback = self._fail[node]
+                    while fallback and ch not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    target = self._goto[fallback].get(ch, 0)
+                    self._fail[child] = target if target != child else 0
+                    self._out[child] += self._out[self._fail[child]]
+                    next_frontier.append(child)
+            frontier = next_frontier
+
+    def _scan(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield out[node]
+
+    def find_all(self, text):
+        """All power words contained in text, in list order"""
+        found = set(self._always)
+        for indices in self._scan(text):
+            found.update(indices)
+        return [self.words[i] for i in sorted(found)]
+
+    def search(self, text):
+        """True if any power word occurs in text"""
+        return bool(self._always) or next(self._scan(text), None) is not None
+
+    def _trie_pattern(self, node):
+        # A word ending here already decides "contains a power word", so longer branches can be dropped
+        if node in self._terminal:
+            return ''
+        branches = [re.escape(ch) + self._trie_pattern(child) for ch, child in self._goto[node].items()]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    @property
+    def regex(self):
+        """Trie-shaped regex for lowercased text, for vectorized `.str.contains` checks (None if the list is empty)"""
+        if self._regex is None and self._goto[0]:
+            self._regex = re.compile(self._trie_pattern(0))
+        return self._regex
+
+@lru_cache(maxsize=16)
+def _compile_power_matcher(words):
+    return PowerWordMatcher(words)
+
+def get_power_matcher(power_words_list):
+    """Matcher for a power-word list, built once per distinct list"""
+    return _compile_power_matcher(tuple(power_words_list))
@@ -0,0 +1,379 @@
+"""
+Trend Finder: append-only Parquet snapshots of tracked keywords and velocity/acceleration indexes.
+
+Layout under TRENDS_DIR:
+    tracked.json                          tracked keywords and when each was last snapshotted
+    videos/month=YYYY-MM/<ts>-<id>.parquet   one row per (snapshot, keyword, video): views, likes, comments
+    tags/month=YYYY-MM/<ts>-<id>.parquet     one row per (snapshot, keyword, tag): videos using it, their views
+
+Once a month folder holds TRENDS_COMPACT_FILES files they are merged into one <ts>-compact-<id>.parquet,
+which lists the files it replaces in its metadata, so readers skip any that are not deleted yet.
+"""
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from .config import TRENDS_COMPACT_FILES, TRENDS_DIR, TRENDS_SNAPSHOT_INTERVAL_HOURS
+
+class TrendStore:
+    """Append-only columnar snapshot store, partitioned by month"""
+    def __init__(self, root=TRENDS_DIR, compact_files=TRENDS_COMPACT_FILES):
+        self.root = root
+        self.compact_files = compact_files
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._loaded = {}  # kind -> (file list with mtimes, frame read from it)
+        os.makedirs(root, exist_ok=True)
+
+    # --- tracked keywords ---
+    @property
+    def _tracked_path(self):
+        return os.path.join(self.root, "tracked.json")
+
+    def tracked(self):
+        """List of {'keyword', 'region', 'last_snapshot'} dicts"""
+        try:
+            with open(self._tracked_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_tracked(self, entries):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._tracked_path)
+
+    def track(self, keyword, region="ID"):
+        with self._lock:
+            entries = self.tracked()
+            if not any(e['keyword'].lower() == keyword.lower() and e['region'] == region for e in entries):
+                entries.append({'keyword': keyword, 'region': region, 'last_snapshot': None})
+                self._write_tracked(entries)
+
+    def untrack(self, keyword, region="ID"):
+        with self._lock:
+            entries = [e for e in self.tracked() if not (e['keyword'].lower() == keyword.lower() and e['region'] == region)]
+            self._write_tracked(entries)
+
+    def _mark_snapshot(self, keyword, region, ts):
+        with self._lock:
+            entries = self.tracked()
+            for e in entries:
+                if e['keyword'].lower() == keyword.lower() and e['region'] == region:
+                    e['last_snapshot'] = ts
+            self._write_tracked(entries)
+
+    # --- snapshots ---
+    def append_snapshot(self, keyword, region, video_items, ts=None):
+        """Write one snapshot of a keyword's competitor videos as new Parquet files"""
+        import pandas as pd
+
+        ts = ts or time.time()
+        stamp = pd.Timestamp(ts, unit='s', tz='UTC')
+        rows = []
+        tag_videos = Counter()
+        tag_views = Counter()
+        for item in video_items:
+            stats = item.get('statistics', {})
+            views = int(stats.get('viewCount', 0))
+            rows.append((item['id'], views, int(stats.get('likeCount', 0)), int(stats.get('commentCount', 0))))
+            for tag in set(t.lower() for t in item.get('snippet', {}).get('tags', [])):
+                tag_videos[tag] += 1
+                tag_views[tag] += views
+
+        if not rows:
+            return
+
+        videos = pd.DataFrame(rows, columns=['video_id', 'views', 'likes', 'comments'])
+        videos = videos.astype({'views': 'int64', 'likes': 'int64', 'comments': 'int64'})
+        tags = pd.DataFrame({
+            'tag': list(tag_videos),
+            'videos': [tag_videos[t] for t in tag_videos],
+            'views': [tag_views[t] for t in tag_videos],
+        }).astype({'videos': 'int32', 'views': 'int64'})
+
+        for kind, df in (('videos', videos), ('tags', tags)):
+            df.insert(0, 'ts', stamp)
+            df.insert(1, 'keyword', pd.Categorical([keyword.lower()] * len(df)))
+            df.insert(2, 'region', pd.Categorical([region] * len(df)))
+            folder = os.path.join(self.root, kind, f"month={stamp:%Y-%m}")
+            os.makedirs(folder, exist_ok=True)
+            name = f"{int(ts)}-{uuid.uuid4().hex[:8]}.parquet"
+            tmp = os.path.join(folder, f".{name}.tmp")
+            df.to_parquet(tmp, index=False, compression='zstd')
+            os.replace(tmp, os.path.join(folder, name))
+            if len(glob.glob(os.path.join(folder, "*.parquet"))) >= self.compact_files:
+                self.compact(kind, f"{stamp:%Y-%m}")
+
+        self._mark_snapshot(keyword, region, ts)
+
+    def compact(self, kind, month):
+        """
+        Merge one month's snapshot files into a single file. Returns how many files were merged.
+        Files appended meanwhile are left alone; a lock file keeps two processes from merging at once.
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        folder = os.path.join(self.root, kind, f"month={month}")
+        if not os.path.isdir(folder):
+            return 0
+        lock_path = os.path.join(folder, ".compact.lock")
+        with self._compact_lock:
+            try:
+                # A lock left behind by a crashed process stops blocking after an hour
+                if time.time() - os.path.getmtime(lock_path) > 3600:
+                    os.remove(lock_path)
+            except OSError:
+                pass
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                return 0
+
+            try:
+                files = self._live_files(sorted(glob.glob(os.path.join(folder, "*.parquet"))))
+                if len(files) < 2:
+                    return 0
+                table = pa.Table.from_pandas(pd.concat((pd.read_parquet(f) for f in files), ignore_index=True), preserve_index=False)
+                replaces = json.dumps([os.path.basename(f) for f in files]).encode('utf-8')
+                table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'replaces': replaces})
+                name = f"{int(time.time())}-compact-{uuid.uuid4().hex[:8]}.parquet"
+                tmp = os.path.join(folder, f".{name}.tmp")
+                pq.write_table(table, tmp, compression='zstd')
+                os.replace(tmp, os.path.join(folder, name))
+                for f in files:
+                    try:
+                        os.remove(f)
+                    except FileNotFoundError:
+                        pass
+                return len(files)
+            finally:
+                os.remove(lock_path)
+
+    @staticmethod
+    def _live_files(files):
+        """Files minus those already merged into a compacted file but not deleted yet"""
+        import pyarrow.parquet as pq
+
+        replaced = set()
+        for f in files:
+            if "-compact-" in os.path.basename(f):
+                metadata = pq.read_schema(f).metadata or {}
+                replaced.update(os.path.join(os.path.dirname(f), name) for name in json.loads(metadata.get(b'replaces', b'[]')))
+        return [f for f in files if f not in replaced]
+
+    def load(self, kind, days=None):
+        """
+        Read snapshots of one kind ('videos' or 'tags'), pruning month partitions older than `days`.
+        The frame read is reused until a file in those partitions is added, merged or removed.
+        """
+        import pandas as pd
+
+        files = sorted(glob.glob(os.path.join(self.root, kind, "month=*", "*.parquet")))
+        if days:
+            cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days)
+            oldest_month = f"month={cutoff:%Y-%m}"
+            files = [f for f in files if os.path.basename(os.path.dirname(f)) >= oldest_month]
+        if not files:
+            return pd.DataFrame()
+
+        try:
+            key = tuple((f, os.stat(f).st_mtime_ns) for f in files)
+        except FileNotFoundError:
+            return self.load(kind, days)  # a compaction removed a file just now
+        with self._lock:
+            cached = self._loaded.get(kind)
+        if cached and cached[0] == key:
+            df = cached[1]
+        else:
+            try:
+                df = pd.concat((pd.read_parquet(f) for f in self._live_files(files)), ignore_index=True)
+            except FileNotFoundError:
+                return self.load(kind, days)
+            for col in ('keyword', 'region'):
+                df[col] = df[col].astype('category')
+            with self._lock:
+                self._loaded[kind] = (key, df)
+
+        if days:
+            return df[df['ts'] >= cutoff]
+        return df.copy(deep=False)
+
+_trend_store = None
+_trend_store_lock = threading.Lock()
+
+def get_trend_store():
+    """One trend store per process, shared by all sessions"""
+    global _trend_store
+    with _trend_store_lock:
+        if _trend_store is None:
+            _trend_store = TrendStore()
+        return _trend_store
+
+def snapshot_keyword(api_key, keyword, region="ID", store=None):
+    """Fetch fresh competitor stats for a keyword (bypassing the cache) and append a snapshot"""
+    from .youtube import fetch_video_items, format_api_error, get_youtube_client, search_video_ids
+
+    store = store or get_trend_store()
+    try:
+        youtube = get_youtube_client(api_key)
+        video_ids = search_video_ids(youtube, keyword, region)
+        if not video_ids:
+            return f"❌ No videos found for '{keyword}'"
+        store.append_snapshot(keyword, region, fetch_video_items(youtube, video_ids))
+        return None
+    except Exception as e:
+        return format_api_error(e)
+
+def run_due_snapshots(api_key, store=None, interval_hours=TRENDS_SNAPSHOT_INTERVAL_HOURS):
+    """Snapshot every tracked keyword whose last snapshot is older than the interval. Returns {keyword: error}"""
+    store = store or get_trend_store()
+    due_before = time.time() - interval_hours * 3600
+    errors = {}
+    for entry in store.tracked():
+        if entry.get('last_snapshot') and entry['last_snapshot'] > due_before:
+            continue
+        err = snapshot_keyword(api_key, entry['keyword'], entry['region'], store)
+        if err:
+            errors[entry['keyword']] = err
+    return errors
+
+class TrendScheduler:
+    """Background thread that keeps tracked keywords snapshotted while the app process is alive"""
+    def __init__(self, api_key, store=None, interval_hours=TRENDS_SNAPSHOT_INTERVAL_HOURS, poll_seconds=600):
+        self.api_key = api_key
+        self.store = store or get_trend_store()
+        self.interval_hours = interval_hours
+        self.poll_seconds = poll_seconds
+        self.last_errors = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trend-scheduler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.last_errors = run_due_snapshots(self.api_key, self.store, self.interval_hours)
+            self._stop.wait(self.poll_seconds)
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+def ensure_scheduler(api_key):
+    """Start (once per API key and process) the background snapshot scheduler"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(api_key)
+        if scheduler is None or not scheduler.running:
+            scheduler = TrendScheduler(api_key).start()
+            _schedulers[api_key] = scheduler
+        return scheduler
+
+def scheduler_running(api_key):
+    with _schedulers_lock:
+        scheduler = _schedulers.get(api_key)
+        return scheduler is not None and scheduler.running
+
+def stop_scheduler(api_key):
+    """Stop the background snapshot scheduler of an API key, if one is running"""
+    with _schedulers_lock:
+        scheduler = _schedulers.pop(api_key, None)
+    if scheduler is not None:
+        scheduler.stop()
+
+def _rate(df, group_cols, value_col):
+    """Change of value_col per day between consecutive snapshots within each group (df sorted by ts)"""
+    grouped = df.groupby(group_cols, observed=True)
+    days = grouped['ts'].diff().dt.total_seconds() / 86400
+    return grouped[value_col].diff() / days
+
+def keyword_trend_index(store=None, days=180):
+    """
+    Rank tracked keywords by how fast their competitor videos are gaining views.
+    velocity = views gained per day by videos seen in consecutive snapshots (new entrants don't count);
+    acceleration = change in velocity per day.
+    """
+    import numpy as np
+    import pandas as pd
+
+    store = store or get_trend_store()
+    videos = store.load('videos', days)
+    if videos.empty:
+        return pd.DataFrame()
+
+    keys = ['keyword', 'region']
+    videos = videos.sort_values(keys + ['video_id', 'ts'])
+    videos['rate'] = _rate(videos, keys + ['video_id'], 'views').clip(lower=0)
+    snapshots = videos.groupby(keys, observed=True)['ts'].nunique().rename('snapshots')
+
+    series = videos.dropna(subset=['rate']).groupby(keys + ['ts'], observed=True)['rate'].sum().rename('velocity').reset_index()
+    if series.empty:
+        return pd.DataFrame()
+    series = series.sort_values(keys + ['ts'])
+    series['acceleration'] = _rate(series, keys, 'velocity').fillna(0)
+
+    latest = series.groupby(keys, observed=True).tail(1).join(snapshots, on=keys)
+    # Log-scaled velocity, nudged up or down by the direction of acceleration
+    latest['trend_score'] = np.log1p(latest['velocity']) * (1 + np.tanh(latest['acceleration'] / latest['velocity'].clip(lower=1)))
+    latest = latest.rename(columns={'ts': 'last_snapshot'})
+    return latest[keys + ['velocity', 'acceleration', 'trend_score', 'snapshots', 'last_snapshot']].sort_values('trend_score', ascending=False).reset_index(drop=True)
+
+def tag_trend_index(store=None, days=180, min_videos=2):
+    """
+    Rank tags by how fast their share of tracked competitor videos is rising.
+    Snapshots are pooled per day across all tracked keywords; velocity is share points per day.
+    """
+    import pandas as pd
+
+    store = store or get_trend_store()
+    tags = store.load('tags', days)
+    videos = store.load('videos', days)
+    if tags.empty or videos.empty:
+        return pd.DataFrame()
+
+    sample = videos.groupby(videos['ts'].dt.floor('D')).size()
+    counts = tags.assign(ts=tags['ts'].dt.floor('D')).pivot_table(index='ts', columns='tag', values='videos', aggfunc='sum', fill_value=0)
+    counts = counts.reindex(sample.index, fill_value=0)
+    if len(counts) < 2:
+        return pd.DataFrame()
+
+    # Tags absent from a day count as 0%, so newly emerging tags show up as rising
+    share = counts.div(sample, axis=0) * 100
+    interval = share.index.to_series().diff().dt.total_seconds() / 86400
+    velocity = share.diff().div(interval, axis=0)
+    acceleration = velocity.diff().div(interval, axis=0)
+
+    latest = pd.DataFrame({
+        'share': share.iloc[-1],
+        'velocity': velocity.iloc[-1],
+        'acceleration': acceleration.iloc[-1].fillna(0),
+    })
+    latest = latest[counts.max() >= min_videos]
+    return latest.rename_axis('tag').reset_index().sort_values(['velocity', 'acceleration'], ascending=False).reset_index(drop=True)
+
+def keyword_history(keyword, region="ID", store=None, days=180):
+    """Time series of total and median competitor views for one keyword"""
+    import pandas as pd
+
+    store = store or get_trend_store()
+    videos = store.load('videos', days)
+    if videos.empty:
+        return pd.DataFrame()
+    rows = videos[(videos['keyword'] == keyword.lower()) & (videos['region'] == region)]
+    return rows.groupby('ts')['views'].agg(total_views='sum', median_views='median')
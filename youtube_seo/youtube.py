@@ -0,0 +1,715 @@
+"""YouTube Data API access: pooled clients, keyword metrics and batch research"""
+import datetime
+import math
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+
+from .cache import ResponseCache, SingleFlight, get_response_cache
+from .config import (
+    BATCH_MAX_WORKERS,
+    CACHE_TTL_BY_ORDER,
+    QUOTA_COST,
+    REGION_LANGUAGES,
+    REGION_TIMEZONES,
+    REPLAY_FIXTURES,
+    RESEARCH_REGIONS,
+    SAMPLE_DEPTH_DEFAULT,
+    SAMPLE_DEPTH_MAX,
+    SEARCH_RESULTS_PER_PAGE,
+    VIDEOS_PER_REQUEST,
+    YOUTUBE_ASYNC,
+    YOUTUBE_HTTP_POOL_SIZE,
+    YOUTUBE_HTTP_TIMEOUT,
+)
+from .dedup import cluster_titles
+from .metrics import timed
+from .quota import QuotaExceededError, get_quota_scheduler
+from .tag_index import index_videos_later
+
+def calculate_engagement_rate(stats):
+    """Calculate video engagement rate"""
+    try:
+        views = int(stats.get('viewCount', 0))
+        likes = int(stats.get('likeCount', 0))
+        comments = int(stats.get('commentCount', 0))
+        if views == 0:
+            return 0
+        engagement = ((likes + comments) / views) * 100
+        return round(engagement, 2)
+    except:
+        return 0
+
+class HttpPool:
+    """
+    Thread-safe pool of keep-alive httplib2 connections.
+    httplib2.Http is not thread-safe, so each request checks one out for its duration.
+    """
+    def __init__(self, size=YOUTUBE_HTTP_POOL_SIZE, timeout=YOUTUBE_HTTP_TIMEOUT):
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def connection(self):
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            import httplib2
+            http = httplib2.Http(timeout=self.timeout)
+        try:
+            yield http
+        finally:
+            try:
+                self._idle.put_nowait(http)
+            except queue.Full:
+                http.close()
+
+_http_pool = HttpPool()
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_http_pool():
+    """One connection pool per process, shared by all sessions"""
+    return _http_pool
+
+def get_youtube_client(api_key):
+    """
+    Build the YouTube client once per API key from the bundled discovery document.
+    A comma-separated list of keys builds on the first one; the quota scheduler rotates across the rest.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            if REPLAY_FIXTURES:
+                from .replay import ReplayYouTube
+                client = ReplayYouTube.load(REPLAY_FIXTURES)
+            else:
+                from googleapiclient.discovery import build
+                keys = get_quota_scheduler().register_keys(api_key)
+                client = build('youtube', 'v3', developerKey=keys[0] if keys else api_key, static_discovery=True, cache_discovery=False)
+            _clients[api_key] = client
+        return client
+
+def register_youtube_client(api_key, client):
+    """Use a prebuilt client (e.g. a replay or recording stand-in) for an API key"""
+    with _clients_lock:
+        _clients[api_key] = client
+
+def _send(request):
+    with get_http_pool().connection() as http:
+        return request.execute(http=http)
+
+def execute_request(request):
+    """Run a googleapiclient request through the quota scheduler over a pooled connection"""
+    return get_quota_scheduler().execute(request, _send)
+
+def format_api_error(e):
+    """Turn a YouTube API exception into a user-facing message"""
+    error_msg = str(e)
+    if isinstance(e, QuotaExceededError):
+        return f"❌ Quota API habis! ({error_msg})"
+    elif "API key not valid" in error_msg:
+        return "❌ API Key tidak valid!"
+    elif "quota" in error_msg.lower():
+        return "❌ Quota API habis!"
+    else:
+        return f"❌ Error: {error_msg}"
+
+def clamp_depth(depth):
+    """Keep a requested sampling depth within what the app allows"""
+    return max(1, min(int(depth or SAMPLE_DEPTH_DEFAULT), SAMPLE_DEPTH_MAX))
+
+def estimate_quota(depth=SAMPLE_DEPTH_DEFAULT, keywords=1):
+    """Worst-case quota units to research keywords at a sampling depth (cached keywords cost nothing)"""
+    depth = clamp_depth(depth)
+    search_pages = math.ceil(depth / SEARCH_RESULTS_PER_PAGE)
+    video_batches = math.ceil(depth / VIDEOS_PER_REQUEST)
+    return keywords * (search_pages * QUOTA_COST['search'] + video_batches * QUOTA_COST['videos'])
+
+def iter_search_pages(youtube, keyword, region="ID", order="relevance", depth=20, language=None):
+    """
+    Follow search().list nextPageToken until `depth` unique videos are found.
+    Yields each page's new video hits as it arrives (pages are inherently sequential).
+    """
+    seen = set()
+    page_token = None
+
+    while len(seen) < depth:
+        search_res = execute_request(youtube.search().list(
+            q=keyword,
+            type='video',
+            part='id,snippet',
+            maxResults=min(SEARCH_RESULTS_PER_PAGE, depth - len(seen)),
+            order=order,
+            regionCode=region,
+            relevanceLanguage=language or None,
+            pageToken=page_token
+        ))
+
+        hits = []
+        for item in search_res.get('items', []):
+            vid = item.get('id', {}).get('videoId')
+            if vid and vid not in seen and len(seen) < depth:
+                seen.add(vid)
+                hits.append(item)
+        if hits:
+            yield hits
+
+        page_token = search_res.get('nextPageToken')
+        if not page_token or not search_res.get('items'):
+            break
+
+def search_videos(youtube, keyword, region="ID", order="relevance", depth=20, language=None):
+    """Search until `depth` videos are found and return their hits"""
+    return [hit for page in iter_search_pages(youtube, keyword, region, order, depth, language) for hit in page]
+
+def search_video_ids(youtube, keyword, region="ID", order="relevance", depth=20, language=None):
+    """Search until `depth` videos are found and return their IDs"""
+    return [item['id']['videoId'] for item in search_videos(youtube, keyword, region, order, depth, language)]
+
+def fetch_video_items(youtube, video_ids):
+    """Fetch statistics and snippets for up to 50 video IDs in one videos().list call"""
+    stats_res = execute_request(youtube.videos().list(
+        id=','.join(video_ids),
+        part='statistics,snippet,contentDetails'
+    ))
+    return stats_res.get('items', [])
+
+def _categorical(values):
+    """Categorical with categories in order of first appearance"""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    return pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object), validate=False)
+
+def _utc_datetimes(timestamps):
+    """datetime64[s] (naive UTC) from API timestamps like '2024-05-01T12:00:00Z'; missing ones become NaT"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        return np.array([t[:19] if t else 'NaT' for t in timestamps], dtype='datetime64[s]')
+    except ValueError:
+        return pd.to_datetime(pd.Series(timestamps, dtype=object), utc=True, errors='coerce', format='ISO8601').dt.tz_localize(None).to_numpy()
+
+@timed("keyword.dataframe")
+def competitor_frame(video_items):
+    """
+    Typed columnar view of videos().list items: (videos, tags).
+    videos has one row per video - int64 Views/Likes/Comments, float32 Engagement, categorical Channel,
+    datetime64 publishedAt (naive UTC), and int32 cluster: the row of the first video of the same
+    channel whose title it near-duplicates (its own row if none). tags has one row per (video, tag): int32 video row,
+    categorical tag, with categories in order of first appearance.
+    """
+    import numpy as np
+    import pandas as pd
+
+    snippets = [item.get('snippet', {}) for item in video_items]
+    stats = [item.get('statistics', {}) for item in video_items]
+    n = len(snippets)
+
+    def counts(field):
+        return np.fromiter((int(s.get(field, 0)) for s in stats), dtype='int64', count=n)
+
+    views, likes, comments = counts('viewCount'), counts('likeCount'), counts('commentCount')
+    engagement = np.round((likes + comments) / np.maximum(views, 1) * 100, 2)
+    engagement[views == 0] = 0
+
+    titles = [s.get('title', '') for s in snippets]
+    channels = [s.get('channelTitle', 'Unknown') for s in snippets]
+    videos = pd.DataFrame({
+        'title': np.array(titles, dtype=object),
+        'Views': views,
+        'Likes': likes,
+        'Comments': comments,
+        'Engagement': engagement.astype('float32'),
+        'Channel': _categorical(channels),
+        'publishedAt': _utc_datetimes([s.get('publishedAt', '') for s in snippets]),
+        'cluster': cluster_titles(titles, channels).astype('int32'),
+    })
+
+    tag_lists = [s.get('tags', []) for s in snippets]
+    tags = pd.DataFrame({
+        'video': np.repeat(np.arange(n, dtype='int32'), [len(t) for t in tag_lists]),
+        'tag': _categorical([tag for t in tag_lists for tag in t]),
+    })
+    return videos, tags
+
+def competitor_rows(videos, tags, rows=None):
+    """
+    Competitor frame rows (all, or the given row indices) as the row dicts keyword metrics return:
+    title, Views, Likes, Comments, Engagement, Channel, Date, tags and publishedAt (ISO string).
+    """
+    import numpy as np
+
+    rows = np.arange(len(videos)) if rows is None else np.asarray(rows)
+    tag_lists = [[] for _ in range(len(videos))]
+    for video, tag in zip(tags['video'].to_numpy().tolist(), tags['tag'].to_numpy().tolist()):
+        tag_lists[video].append(tag)
+
+    published = videos['publishedAt'].iloc[rows].dt.strftime('%Y-%m-%dT%H:%M:%SZ').fillna('').tolist()
+    return [
+        {
+            'title': title,
+            'Views': views,
+            'Likes': likes,
+            'Comments': comments,
+            'Engagement': round(engagement, 2),
+            'Channel': channel,
+            'Date': stamp[:10] if stamp else 'N/A',
+            'tags': tag_lists[row],
+            'publishedAt': stamp,
+        }
+        for row, title, views, likes, comments, engagement, channel, stamp in zip(
+            rows.tolist(),
+            videos['title'].to_numpy()[rows].tolist(),
+            videos['Views'].to_numpy()[rows].tolist(),
+            videos['Likes'].to_numpy()[rows].tolist(),
+            videos['Comments'].to_numpy()[rows].tolist(),
+            videos['Engagement'].to_numpy(dtype='float64')[rows].tolist(),
+            videos['Channel'].to_numpy()[rows].tolist(),
+            published,
+        )
+    ]
+
+@lru_cache(maxsize=64)
+def _zone(region):
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(REGION_TIMEZONES.get((region or "").upper(), "UTC"))
+
+def timezone_label(region):
+    """Current short name of a region's timezone, e.g. 'WIB' or 'EDT' ('UTC-03' where it has no letters)"""
+    name = datetime.datetime.now(_zone(region)).tzname()
+    return f"UTC{name}" if name[0] in "+-" else name
+
+def _local_hours(published, region):
+    """Local hour of day (0-23) in a region of naive-UTC datetime64 values; missing ones are dropped"""
+    import numpy as np
+    import pandas as pd
+
+    published = published[~np.isnat(published)]
+    return pd.DatetimeIndex(published).tz_localize('UTC').tz_convert(_zone(region)).hour.to_numpy()
+
+def _most_common(codes, n):
+    """Indices of the n most frequent codes, ties broken by first appearance (like Counter.most_common)"""
+    import numpy as np
+
+    if not len(codes):
+        return []
+    counts = np.bincount(codes)
+    first_seen = np.full(len(counts), len(codes))
+    np.minimum.at(first_seen, codes, np.arange(len(codes)))
+    order = np.lexsort((first_seen, -counts))
+    return [int(i) for i in order[:n] if counts[i]]
+
+def _distinct_rows(clusters, views):
+    """Row of each near-duplicate cluster's most viewed video (first on ties), in list order"""
+    import numpy as np
+
+    order = np.lexsort((-views, clusters))
+    sorted_clusters = clusters[order]
+    return np.sort(order[np.concatenate([[True], sorted_clusters[1:] != sorted_clusters[:-1]])])
+
+def _title_patterns(videos, distinct, n=10):
+    """The largest near-duplicate clusters: their top title, size, channel and total views"""
+    import numpy as np
+
+    clusters = videos['cluster'].to_numpy()
+    sizes = np.bincount(clusters, minlength=len(videos))
+    views = np.bincount(clusters, weights=videos['Views'].to_numpy(), minlength=len(videos))
+
+    rows = distinct[sizes[clusters[distinct]] > 1]
+    patterns = [
+        {'title': title, 'videos': int(sizes[c]), 'channel': channel, 'views': int(views[c])}
+        for title, channel, c in zip(videos['title'].to_numpy()[rows], videos['Channel'].to_numpy()[rows], clusters[rows])
+    ]
+    return sorted(patterns, key=lambda p: (-p['videos'], -p['views']))[:n]
+
+@timed("keyword.statistics")
+def keyword_aggregates(videos, tags, region="ID"):
+    """
+    Vectorized keyword metrics over a competitor_frame.
+    Near-duplicate clusters (re-uploads, template titles) count once, through their most viewed video.
+    Upload hours are in the region's local time. 'top_videos' (a DataFrame) and 'competitor_data' (row dicts, one
+    per cluster) keep their row-dict columns; the typed frames are returned as 'competitor_frame' and 'competitor_tag_frame'.
+    """
+    import numpy as np
+
+    if videos.empty:
+        return None, "❌ No data available"
+
+    clusters = videos['cluster'].to_numpy()
+    distinct = _distinct_rows(clusters, videos['Views'].to_numpy())
+    collapsed = len(distinct) < len(videos)
+
+    views = videos['Views'].to_numpy()[distinct]
+    engagement = videos['Engagement'].to_numpy(dtype='float64')[distinct].round(2)  # undo float32 storage error
+    view_counts = views[views > 0]
+    engagement_rates = engagement[engagement > 0]
+
+    median_views = float(np.median(view_counts)) if len(view_counts) else 0
+    avg_views = float(view_counts.mean()) if len(view_counts) else 0
+    avg_engagement = float(engagement_rates.mean()) if len(engagement_rates) else 0
+
+    tag_codes = tags['tag'].array
+    codes = tag_codes.codes
+    if collapsed and len(codes):
+        # A tag counts once per cluster
+        keys = clusters[tags['video'].to_numpy()].astype('int64') * len(tag_codes.categories) + codes
+        codes = codes[np.sort(np.unique(keys, return_index=True)[1])]
+    trending_tags = [tag_codes.categories[i] for i in _most_common(codes, 15)]
+
+    published = videos['publishedAt'].to_numpy()[distinct]
+    hours = _local_hours(published, region)
+    hour_counts = np.bincount(hours, minlength=24)
+    best_time = "Unknown"
+    if len(hours):
+        most_common_hour = _most_common(hours, 1)[0]
+        best_time = f"{most_common_hour:02d}:00 - {(most_common_hour+1):02d}:00 {timezone_label(region)}"
+
+    if median_views > 500000:
+        difficulty = "🔴 High"
+        diff_score = 30
+    elif median_views > 100000:
+        difficulty = "🟡 Medium"
+        diff_score = 60
+    else:
+        difficulty = "🟢 Low"
+        diff_score = 90
+
+    opportunity_score = diff_score
+
+    import pandas as pd
+
+    rows = competitor_rows(videos, tags)
+    return {
+        'median_views': median_views,
+        'avg_views': avg_views,
+        'avg_engagement': avg_engagement,
+        'score': opportunity_score,
+        'difficulty': difficulty,
+        'difficulty_score': diff_score,
+        'trending_tags': trending_tags,
+        'best_upload_time': best_time,
+        'region': region,
+        'timezone': _zone(region).key,
+        'upload_hour_counts': hour_counts.tolist(),
+        'total_videos': len(videos),
+        'distinct_videos': len(distinct),
+        'title_patterns': _title_patterns(videos, distinct) if collapsed else [],
+        'top_videos': pd.DataFrame(rows),
+        'competitor_data': [rows[i] for i in distinct.tolist()] if collapsed else rows,
+        'competitor_frame': videos,
+        'competitor_tag_frame': tags
+    }, None
+
+def build_keyword_metrics(video_items, region="ID"):
+    """Aggregate videos().list items into keyword metrics (upload hours in the region's timezone)"""
+    videos, tags = competitor_frame(video_items)
+    return keyword_aggregates(videos, tags, region)
+
+class _Abandoned(Exception):
+    """The session leading a coalesced fetch stopped before finishing it"""
+
+_keyword_flights = SingleFlight()
+_refresh_pool = None
+_refresh_pool_lock = threading.Lock()
+
+def iter_keyword_items(youtube, keyword, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None):
+    """
+    Search up to `depth` videos and fetch their statistics.
+    Yields ('search', hits so far) after each search page, then ('items', videos().list items).
+    Each page's videos().list batch is sent while the next page is being searched.
+    """
+    hits = []
+    batches = []
+
+    with ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as pool:
+        for page in iter_search_pages(youtube, keyword, region, order, depth, language):
+            hits.extend(page)
+            page_ids = [hit['id']['videoId'] for hit in page]
+            for start in range(0, len(page_ids), VIDEOS_PER_REQUEST):
+                batches.append(pool.submit(fetch_video_items, youtube, page_ids[start:start + VIDEOS_PER_REQUEST]))
+            yield 'search', list(hits)
+
+        yield 'items', [item for batch in batches for item in batch.result()]
+
+def _fetch_and_cache(api_key, keyword, region, order, depth, language, cache):
+    youtube = get_youtube_client(api_key)
+    video_items = []
+    for stage, payload in iter_keyword_items(youtube, keyword, region, order, depth, language):
+        if stage == 'items':
+            video_items = payload
+    if video_items:
+        index_videos_later(keyword, video_items)
+    if cache and video_items:
+        cache.set(ResponseCache.make_key(keyword, region, order, depth, language), video_items, ttl=CACHE_TTL_BY_ORDER.get(order))
+    return video_items
+
+def refresh_keyword_metrics(api_key, keyword, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None):
+    """Re-fetch a keyword into the cache on a background thread, unless a fetch for it is already running"""
+    global _refresh_pool
+    depth = clamp_depth(depth)
+    cache_key = ResponseCache.make_key(keyword, region, order, depth, language)
+    if _keyword_flights.in_flight(cache_key):
+        return None
+
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="keyword-refresh")
+    return _refresh_pool.submit(
+        _keyword_flights.run, cache_key,
+        lambda: _fetch_and_cache(api_key, keyword, region, order, depth, language, get_response_cache())
+    )
+
+def iter_keyword_metrics(api_key, keyword, region="ID", order="relevance", use_cache=True, depth=SAMPLE_DEPTH_DEFAULT, language=None, stale_ok=False):
+    """
+    Keyword research as a stream of (stage, payload) pairs so the UI can render each part as it lands:
+      ('search', search hits)     after each search().list page - titles and channels so far, no stats yet
+      ('stale', None)             the stats below are an expired cache entry; a background refresh is running
+      ('stats', competitor frame) after videos().list - per-video views and engagement
+      ('aggregates', metrics)     the full get_keyword_metrics result
+      ('error', message)          terminal
+    Cache hits skip straight to 'stats'.
+
+    Concurrent callers for the same (keyword, region, order, depth, language) share one fetch:
+    the first streams it, the others wait for its result like a cache hit.
+    With stale_ok, an expired entry is served at once while the refresh runs in the background.
+    """
+    if not api_key or len(api_key) < 30:
+        yield 'error', "❌ Invalid API Key"
+        return
+
+    if not keyword:
+        yield 'error', "❌ Keyword required"
+        return
+
+    depth = clamp_depth(depth)
+    cache = get_response_cache() if use_cache else None
+    cache_key = ResponseCache.make_key(keyword, region, order, depth, language)
+
+    try:
+        video_items, stale = cache.lookup(cache_key, allow_stale=stale_ok) if cache else (None, False)
+        if stale and not stale_ok:
+            video_items = None
+
+        if video_items is not None and stale:
+            refresh_keyword_metrics(api_key, keyword, region, order, depth, language)
+            yield 'stale', None
+
+        while video_items is None:
+            future, leader = _keyword_flights.claim(cache_key)
+            if not leader:
+                try:
+                    video_items = future.result()
+                except _Abandoned:
+                    continue
+                break
+
+            try:
+                youtube = get_youtube_client(api_key)
+                for stage, payload in iter_keyword_items(youtube, keyword, region, order, depth, language):
+                    if stage == 'search':
+                        yield stage, payload
+                    else:
+                        video_items = payload
+                if video_items:
+                    index_videos_later(keyword, video_items)
+                if cache and video_items:
+                    cache.set(cache_key, video_items, ttl=CACHE_TTL_BY_ORDER.get(order))
+                future.set_result(video_items)
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                if not future.done():
+                    future.set_exception(_Abandoned())
+                _keyword_flights.release(cache_key, future)
+
+        if not video_items:
+            yield 'error', f"❌ No videos found for '{keyword}'"
+            return
+
+        videos, tags = competitor_frame(video_items)
+        yield 'stats', videos
+
+        data, err = keyword_aggregates(videos, tags, region)
+        if err:
+            yield 'error', err
+        else:
+            yield 'aggregates', data
+
+    except Exception as e:
+        yield 'error', format_api_error(e)
+
+def get_keyword_metrics(api_key, keyword, region="ID", order="relevance", use_cache=True, depth=SAMPLE_DEPTH_DEFAULT, language=None, stale_ok=False):
+    """Get comprehensive keyword metrics from YouTube"""
+    for stage, payload in iter_keyword_metrics(api_key, keyword, region, order, use_cache, depth, language, stale_ok):
+        if stage == 'error':
+            return None, payload
+        if stage == 'aggregates':
+            return payload, None
+    return None, "❌ No data available"
+
+def parse_keyword_list(text="", csv_file=None):
+    """Collect unique keywords from pasted lines and/or an uploaded CSV"""
+    raw = (text or "").splitlines()
+
+    if csv_file is not None:
+        import pandas as pd
+        csv_df = pd.read_csv(csv_file)
+        column = next((c for c in csv_df.columns if str(c).strip().lower() in ("keyword", "keywords")), csv_df.columns[0])
+        raw.extend(csv_df[column].dropna().astype(str).tolist())
+
+    keywords = []
+    seen = set()
+    for kw in raw:
+        kw = kw.strip()
+        if kw and kw.lower() not in seen:
+            seen.add(kw.lower())
+            keywords.append(kw)
+    return keywords
+
+def research_queries(api_key, queries, order="relevance", depth=SAMPLE_DEPTH_DEFAULT, max_workers=BATCH_MAX_WORKERS):
+    """
+    Research (keyword, region, language) queries with bounded concurrency.
+    Yields (query, data, error) as soon as each query is complete.
+    Video IDs shared between queries are fetched once, packed into full videos().list batches.
+    With YT_SEO_ASYNC=1 the queries are researched by the asyncio HTTP/2 client instead.
+    """
+    queries = list(dict.fromkeys(queries))
+    if YOUTUBE_ASYNC and not REPLAY_FIXTURES:
+        from .youtube_async import research_queries_async
+        yield from research_queries_async(api_key, queries, order, depth, max_workers)
+        return
+
+    depth = clamp_depth(depth)
+    cache = get_response_cache()
+    youtube = get_youtube_client(api_key)
+
+    to_search = []
+    for query in queries:
+        kw, region, language = query
+        video_items = cache.get(ResponseCache.make_key(kw, region, order, depth, language))
+        if video_items is None:
+            to_search.append(query)
+        else:
+            data, err = build_keyword_metrics(video_items, region)
+            yield query, data, err
+
+    if not to_search:
+        return
+
+    waiting = {}        # query -> its video IDs, until all of them are resolved
+    queued = []         # IDs not yet sent to videos().list
+    requested = set()
+    resolved = set()
+    failed = {}         # video ID -> error message of the batch that carried it
+    items_by_id = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {pool.submit(search_video_ids, youtube, kw, region, order, depth, language): ('search', (kw, region, language))
+                   for kw, region, language in to_search}
+        searches_left = len(to_search)
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                kind, payload = running.pop(future)
+
+                if kind == 'search':
+                    searches_left -= 1
+                    try:
+                        video_ids = future.result()
+                    except Exception as e:
+                        yield payload, None, format_api_error(e)
+                        continue
+                    if not video_ids:
+                        yield payload, None, f"❌ No videos found for '{payload[0]}'"
+                        continue
+                    waiting[payload] = video_ids
+                    for vid in video_ids:
+                        if vid not in requested:
+                            requested.add(vid)
+                            queued.append(vid)
+                else:
+                    try:
+                        for item in future.result():
+                            items_by_id[item['id']] = item
+                    except Exception as e:
+                        failed.update(dict.fromkeys(payload, format_api_error(e)))
+                    resolved.update(payload)
+
+            # Only send partial batches once no more searches can top them up
+            while len(queued) >= VIDEOS_PER_REQUEST or (queued and searches_left == 0):
+                chunk, queued = queued[:VIDEOS_PER_REQUEST], queued[VIDEOS_PER_REQUEST:]
+                running[pool.submit(fetch_video_items, youtube, chunk)] = ('videos', chunk)
+
+            for query, video_ids in list(waiting.items()):
+                if not resolved.issuperset(video_ids):
+                    continue
+                del waiting[query]
+                errors = [failed[vid] for vid in video_ids if vid in failed]
+                if errors:
+                    yield query, None, errors[0]
+                    continue
+                kw, region, language = query
+                video_items = [items_by_id[vid] for vid in video_ids if vid in items_by_id]
+                if video_items:
+                    index_videos_later(kw, video_items)
+                    cache.set(ResponseCache.make_key(kw, region, order, depth, language), video_items, ttl=CACHE_TTL_BY_ORDER.get(order))
+                data, err = build_keyword_metrics(video_items, region)
+                yield query, data, err
+
+def research_keywords(api_key, keywords, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None, max_workers=BATCH_MAX_WORKERS):
+    """
+    Research many keywords with bounded concurrency.
+    Yields (keyword, data, error) as soon as each keyword is complete.
+    Video IDs shared between keywords are fetched once, packed into full videos().list batches.
+    With YT_SEO_ASYNC=1 the keywords are researched by the asyncio HTTP/2 client instead.
+    """
+    queries = [(kw, region, language) for kw in keywords]
+    for (kw, _, _), data, err in research_queries(api_key, queries, order, depth, max_workers):
+        yield kw, data, err
+
+def research_regions(api_key, keyword, regions=RESEARCH_REGIONS, order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None,
+                     max_workers=BATCH_MAX_WORKERS):
+    """
+    Research one keyword in several markets at once.
+    Yields (region, data, error) as soon as each region is complete; upload hours are in each region's
+    local time. Without a language each region searches in its own (REGION_LANGUAGES).
+    Videos found in several regions are looked up once.
+    """
+    queries = [(keyword, region.upper(), language or REGION_LANGUAGES.get(region.upper())) for region in dict.fromkeys(regions)]
+    for (_, region, _), data, err in research_queries(api_key, queries, order, depth, max_workers):
+        yield region, data, err
+
+def region_comparison(results):
+    """Comparison table (DataFrame, one row per region) of research_regions results"""
+    import pandas as pd
+
+    rows = []
+    for region, data, err in results:
+        if not data:
+            rows.append({'Region': region, 'Timezone': _zone(region).key, 'Error': err})
+            continue
+        rows.append({
+            'Region': region,
+            'Timezone': data['timezone'],
+            'Opportunity': data['score'],
+            'Competition': data['difficulty'],
+            'Median Views': int(data['median_views']),
+            'Avg Views': int(data['avg_views']),
+            'Avg Engagement': round(data['avg_engagement'], 2),
+            'Videos': data['total_videos'],
+            'Distinct': data['distinct_videos'],
+            'Best Upload Time': data['best_upload_time'],
+            'Top Tags': ', '.join(data['trending_tags'][:5]),
+            'Error': ''
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,316 @@
+"""
+Asyncio YouTube Data API client over pooled HTTP/2 connections (httpx).
+
+    async with AsyncYouTube(api_key) as yt:
+        data, err = await yt.keyword_metrics("lofi beats", depth=200)
+        async for keyword, data, err in yt.research(["lofi beats", "rain sounds"]):
+            ...
+        async for (keyword, region, language), data, err in yt.research_queries([("lofi beats", "US", "en"), ("lofi beats", "JP", "ja")]):
+            ...
+
+Talks to the REST endpoints directly, so many requests can be in flight at once on one connection
+pool. Calls are charged to the same quota ledger as the googleapiclient path and results have the
+same shape as get_keyword_metrics(). Point base_url (or YT_SEO_YOUTUBE_BASE_URL) at a local mock
+server to test it offline.
+"""
+import asyncio
+import queue
+import random
+import threading
+import time
+
+from .cache import ResponseCache, get_response_cache
+from .config import (
+    CACHE_TTL_BY_ORDER,
+    QUOTA_COST,
+    SAMPLE_DEPTH_DEFAULT,
+    SEARCH_RESULTS_PER_PAGE,
+    VIDEOS_PER_REQUEST,
+    YOUTUBE_API_BASE_URL,
+    YOUTUBE_ASYNC_CONCURRENCY,
+    YOUTUBE_ASYNC_MAX_CONNECTIONS,
+    YOUTUBE_HTTP_TIMEOUT,
+)
+from .metrics import get_metrics
+from .quota import EXHAUSTED_REASONS, RETRY_REASONS, RETRY_STATUSES, get_quota_scheduler
+from .tag_index import index_videos_later
+from .youtube import build_keyword_metrics, clamp_depth, format_api_error
+
+class YouTubeApiError(Exception):
+    """Error response from the Data API (the message matches googleapiclient's HttpError text)"""
+    def __init__(self, status, reason, message):
+        super().__init__(f"<HttpError {status} \"{message}\">")
+        self.status = status
+        self.reason = reason
+
+def _error_details(response):
+    """Status code, first error reason and message of an error response"""
+    try:
+        error = response.json().get('error', {})
+    except ValueError:
+        error = {}
+    errors = error.get('errors') or [{}]
+    return response.status_code, errors[0].get('reason', ''), error.get('message') or response.reason_phrase
+
+class AsyncYouTube:
+    """
+    Asyncio client for search/videos list calls.
+    A comma-separated key string rotates across its keys through the process-wide quota scheduler.
+    `client` can be a prebuilt httpx.AsyncClient (e.g. with a MockTransport).
+    """
+    def __init__(self, api_key, base_url=YOUTUBE_API_BASE_URL, max_connections=YOUTUBE_ASYNC_MAX_CONNECTIONS,
+                 http2=True, client=None, scheduler=None):
+        self.scheduler = scheduler or get_quota_scheduler()
+        keys = self.scheduler.register_keys(api_key)
+        self.key = keys[0] if keys else api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.http2 = http2
+        self._http = client
+        self._videos = {}   # video ID -> task of the videos().list batch that carries it
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def _client(self):
+        if self._http is None:
+            import httpx
+
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            try:
+                self._http = httpx.AsyncClient(base_url=self.base_url, http2=self.http2, limits=limits, timeout=YOUTUBE_HTTP_TIMEOUT)
+            except ImportError:
+                # http2=True needs the h2 package; HTTP/1.1 keep-alive still pools connections
+                self._http = httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=YOUTUBE_HTTP_TIMEOUT)
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def get(self, endpoint, **params):
+        """GET one list endpoint: charge, pace, send and retry like QuotaScheduler.execute"""
+        import httpx
+
+        http = self._client()
+        metrics = get_metrics()
+        params = {name: value for name, value in params.items() if value is not None}
+        retries = self.scheduler.max_retries
+
+        attempt = 0
+        while True:
+            key = await asyncio.to_thread(self.scheduler.reserve, self.key, endpoint)
+            await self.scheduler.bucket.acquire_async()
+            metrics.inc("api_calls", endpoint=endpoint)
+            metrics.inc("quota_units", QUOTA_COST.get(endpoint, 1), endpoint=endpoint)
+
+            start = time.perf_counter()
+            try:
+                response = await http.get(endpoint, params={**params, 'key': key})
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code == 200:
+                    metrics.observe(f"api.{endpoint}", time.perf_counter() - start)
+                    return response.json()
+                status, reason, message = _error_details(response)
+                if reason in EXHAUSTED_REASONS:
+                    # Not a retry: reserve() raises QuotaExceededError once every key is spent
+                    await asyncio.to_thread(self.scheduler.exhaust, key)
+                    continue
+                if attempt == retries or (status not in RETRY_STATUSES and reason not in RETRY_REASONS):
+                    raise YouTubeApiError(status, reason, message)
+            metrics.inc("api_retries", endpoint=endpoint)
+            await asyncio.sleep(self.scheduler.backoff * 2 ** attempt * (1 + random.random()))
+            attempt += 1
+
+    async def _fetch_batch(self, video_ids):
+        res = await self.get('videos', id=','.join(video_ids), part='statistics,snippet,contentDetails')
+        return {item['id']: item for item in res.get('items', [])}
+
+    def _forget_failed(self, task, video_ids):
+        """Drop a failed batch so the next call for its IDs requests them again"""
+        if task.cancelled() or task.exception() is not None:
+            for vid in video_ids:
+                if self._videos.get(vid) is task:
+                    del self._videos[vid]
+
+    async def video_items(self, video_ids):
+        """
+        videos().list items for IDs, in order, fetched in concurrent batches of 50.
+        IDs already requested by this client (e.g. for another keyword) are not requested again.
+        """
+        new_ids = [vid for vid in dict.fromkeys(video_ids) if vid not in self._videos]
+        for start in range(0, len(new_ids), VIDEOS_PER_REQUEST):
+            chunk = new_ids[start:start + VIDEOS_PER_REQUEST]
+            task = asyncio.ensure_future(self._fetch_batch(chunk))
+            task.add_done_callback(lambda done, chunk=chunk: self._forget_failed(done, chunk))
+            self._videos.update(dict.fromkeys(chunk, task))
+
+        tasks = list({id(self._videos[vid]): self._videos[vid] for vid in video_ids}.values())
+        await asyncio.gather(*tasks)
+        return [self._videos[vid].result()[vid] for vid in video_ids if vid in self._videos[vid].result()]
+
+    async def keyword_items(self, keyword, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None):
+        """
+        Search up to `depth` videos and fetch their statistics.
+        Each page's videos().list batches are sent while the next page is being searched.
+        """
+        seen = set()
+        batches = []
+        page_token = None
+
+        try:
+            while len(seen) < depth:
+                search_res = await self.get(
+                    'search',
+                    q=keyword,
+                    type='video',
+                    part='id,snippet',
+                    maxResults=min(SEARCH_RESULTS_PER_PAGE, depth - len(seen)),
+                    order=order,
+                    regionCode=region,
+                    relevanceLanguage=language or None,
+                    pageToken=page_token
+                )
+
+                page_ids = []
+                for item in search_res.get('items', []):
+                    vid = item.get('id', {}).get('videoId')
+                    if vid and vid not in seen and len(seen) < depth:
+                        seen.add(vid)
+                        page_ids.append(vid)
+                if page_ids:
+                    batches.append(asyncio.ensure_future(self.video_items(page_ids)))
+
+                page_token = search_res.get('nextPageToken')
+                if not page_token or not search_res.get('items'):
+                    break
+        except asyncio.CancelledError:
+            for batch in batches:
+                batch.cancel()
+            raise
+        except Exception:
+            # Let batches already sent finish (other keywords may be waiting on the same videos) rather than orphan them
+            await asyncio.gather(*batches, return_exceptions=True)
+            raise
+
+        return [item for batch in await asyncio.gather(*batches) for item in batch]
+
+    async def keyword_metrics(self, keyword, region="ID", order="relevance", use_cache=True, depth=SAMPLE_DEPTH_DEFAULT, language=None):
+        """Same (data, error) result as youtube.get_keyword_metrics"""
+        if not keyword:
+            return None, "❌ Keyword required"
+
+        depth = clamp_depth(depth)
+        cache = get_response_cache() if use_cache else None
+        cache_key = ResponseCache.make_key(keyword, region, order, depth, language)
+
+        try:
+            video_items = await asyncio.to_thread(cache.get, cache_key) if cache else None
+            if video_items is None:
+                video_items = await self.keyword_items(keyword, region, order, depth, language)
+                if video_items:
+                    index_videos_later(keyword, video_items)
+                if cache and video_items:
+                    await asyncio.to_thread(cache.set, cache_key, video_items, CACHE_TTL_BY_ORDER.get(order))
+        except Exception as e:
+            return None, format_api_error(e)
+
+        if not video_items:
+            return None, f"❌ No videos found for '{keyword}'"
+        return build_keyword_metrics(video_items, region)
+
+    async def research_queries(self, queries, order="relevance", depth=SAMPLE_DEPTH_DEFAULT, concurrency=YOUTUBE_ASYNC_CONCURRENCY):
+        """
+        Research many (keyword, region, language) queries at once. Yields (query, data, error) as each one completes.
+        Videos found by several queries (e.g. one keyword in several regions) are fetched once.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(query):
+            kw, region, language = query
+            async with semaphore:
+                data, err = await self.keyword_metrics(kw, region, order, True, depth, language)
+                return query, data, err
+
+        tasks = [asyncio.ensure_future(one(query)) for query in dict.fromkeys(queries)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def research(self, keywords, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None,
+                       concurrency=YOUTUBE_ASYNC_CONCURRENCY):
+        """Research many keywords at once. Yields (keyword, data, error) as each one completes"""
+        async for (kw, _, _), data, err in self.research_queries([(kw, region, language) for kw in keywords], order, depth, concurrency):
+            yield kw, data, err
+
+def research_queries_async(api_key, queries, order="relevance", depth=SAMPLE_DEPTH_DEFAULT, concurrency=YOUTUBE_ASYNC_CONCURRENCY):
+    """
+    Synchronous generator over AsyncYouTube.research_queries, for callers without an event loop (Streamlit, the CLI).
+    The loop runs on its own thread; results are handed over as they complete. Closing the generator early
+    (the caller stops iterating) cancels the queries still in flight and waits for the loop thread to exit.
+    """
+    queries = list(dict.fromkeys(queries))
+    results = queue.Queue()
+    done = object()
+    stop = threading.Event()
+    cancel = []
+
+    async def main():
+        loop, task = asyncio.get_running_loop(), asyncio.current_task()
+        cancel.append(lambda: loop.call_soon_threadsafe(task.cancel))
+        if stop.is_set():
+            return
+        async with AsyncYouTube(api_key) as yt:
+            async for row in yt.research_queries(queries, order, depth, concurrency):
+                results.put(row)
+
+    def run():
+        try:
+            asyncio.run(main())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=run, name="youtube-async", daemon=True)
+    thread.start()
+
+    pending = list(queries)
+    try:
+        while True:
+            row = results.get()
+            if row is done:
+                return
+            if isinstance(row, Exception):
+                for query in pending:
+                    yield query, None, format_api_error(row)
+                return
+            pending.remove(row[0])
+            yield row
+    finally:
+        stop.set()
+        if thread.is_alive():
+            for cancel_main in cancel:
+                try:
+                    cancel_main()
+                except RuntimeError:
+                    pass  # loop already closed
+            thread.join(YOUTUBE_HTTP_TIMEOUT)
+
+def research_keywords_async(api_key, keywords, region="ID", order="relevance", depth=SAMPLE_DEPTH_DEFAULT, language=None,
+                            concurrency=YOUTUBE_ASYNC_CONCURRENCY):
+    """research_queries_async for keywords in one region, yielding (keyword, data, error)"""
+    for (kw, _, _), data, err in research_queries_async(api_key, [(kw, region, language) for kw in keywords], order, depth, concurrency):
+        yield kw, data, err